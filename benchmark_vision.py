@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+from food_app.categories import FoodCategories
+from food_app.image_prep import prepare_image
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.heic')
+
+def find_images(image_dir: str):
+    """List the image files in a directory."""
+    return sorted(
+        os.path.join(image_dir, name) for name in os.listdir(image_dir)
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+def benchmark_sizes(images):
+    """Print how much preprocessing shrinks each image and what it costs."""
+    total_before = total_after = 0
+    print(f"\n{'Image':<32} {'Before':>10} {'After':>10} {'Size':>11} {'Detail':>7} {'Time':>8}")
+    print("-" * 83)
+    for path in images:
+        before = os.path.getsize(path)
+        start = time.perf_counter()
+        image = prepare_image(path)
+        elapsed = time.perf_counter() - start
+        total_before += before
+        total_after += image.size
+        size = f"{image.width}x{image.height}" if image.width else "unknown"
+        print(f"{os.path.basename(path)[:32]:<32} {before // 1024:>8} KB {image.size // 1024:>7} KB "
+              f"{size:>11} {image.detail:>7} {elapsed * 1000:>6.0f}ms")
+    print("-" * 83)
+    if total_before:
+        print(f"Total: {total_before // 1024} KB -> {total_after // 1024} KB "
+              f"({100 * total_after / total_before:.0f}%)")
+
+def compare_items(images):
+    """Analyze every image as it is and preprocessed, and compare the items found."""
+    from food_app.grok_api import GrokAPI
+    
+    grok = GrokAPI(cache_path=None)
+    matching = 0
+    timings = {False: 0.0, True: 0.0}
+    for path in images:
+        found = {}
+        for prepared in (False, True):
+            grok.PREPARE_IMAGES = prepared
+            start = time.perf_counter()
+            _, items, _ = grok.analyze_food_image(path)
+            timings[prepared] += time.perf_counter() - start
+            found[prepared] = {FoodCategories.normalize_item_name(item['name']) for item in items}
+        
+        if found[False] == found[True]:
+            matching += 1
+        else:
+            print(f"\n{os.path.basename(path)}: items differ")
+            print(f"  only unprepared: {sorted(found[False] - found[True])}")
+            print(f"  only prepared:   {sorted(found[True] - found[False])}")
+    
+    print(f"\nSame items for {matching} of {len(images)} images")
+    print(f"Vision time: {timings[False]:.1f}s unprepared, {timings[True]:.1f}s prepared")
+
+def main():
+    """Benchmark image preprocessing on a directory of photos."""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(args) != 1:
+        print("Usage: python benchmark_vision.py <image directory> [--compare]")
+        print("  --compare  also run the vision API on each image with and without")
+        print("             preprocessing and check the same items are found")
+        sys.exit(1)
+    
+    images = find_images(args[0])
+    if not images:
+        print(f"No images found in {args[0]}")
+        sys.exit(1)
+    
+    benchmark_sizes(images)
+    if '--compare' in sys.argv:
+        compare_items(images)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import asyncio
+from openai import AsyncOpenAI
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .grok_api import GrokAPI
+from .completion_cache import has_json_object
+from .recipe_assistant import RecipeAssistant
+
+class AsyncGrokAPI:
+    # Grok requests, ImgBB uploads and share link lookups in flight at once
+    MAX_CONCURRENCY = 8
+
+    def __init__(self, grok: Optional[GrokAPI] = None, max_concurrency: int = MAX_CONCURRENCY):
+        """
+        Grok API client for asyncio, so one event loop can run many scans and chats.
+        
+        Wraps a GrokAPI, sharing its keys, caches and ImgBB session. Model
+        calls go through the async OpenAI client; blocking steps (ImgBB
+        requests, reading and shrinking photos, cache I/O) run in worker
+        threads. A semaphore caps how many network steps are in flight, so
+        callers beyond it wait their turn instead of piling onto the API's
+        rate limit. Concurrent scans of the same image share one request.
+        
+        Cancelling a call releases its slot at once. A blocking step that
+        was already running in a thread finishes there and its result is
+        dropped.
+        
+        Args:
+            grok: Client to wrap, defaults to GrokAPI() with a connection
+                pool sized for max_concurrency
+            max_concurrency: Network steps allowed in flight at once
+        """
+        self.grok = grok or GrokAPI(pool_size=max_concurrency)
+        self.async_client = AsyncOpenAI(
+            api_key=self.grok.api_key,
+            base_url=self.grok.base_url,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Vision requests in flight by cache key, and how many callers await each
+        self._vision_tasks: Dict[str, asyncio.Task] = {}
+        self._vision_waiters: Dict[asyncio.Task, int] = {}
+
+    async def complete(self, messages: List[Dict], model: str = GrokAPI.CHAT_MODEL,
+                       temperature: float = 0.7, cache: Optional[bool] = None,
+                       validate: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Get a chat completion, served from the cache when possible.
+        
+        Args:
+            messages: Chat messages
+            model: Model name
+            temperature: Sampling temperature
+            cache: True to cache this call, False to always ask the model,
+                None to cache only low-temperature calls
+            validate: Check a new completion is worth caching, e.g. that it parses
+        
+        Returns:
+            str: The completion text
+        """
+        async def create():
+            async with self._semaphore:
+                response = await self.async_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    stream=False
+                )
+            return response.choices[0].message.content
+        
+        if self.grok.completion_cache is None:
+            return await create()
+        return await self.grok.completion_cache.complete_async(
+            create, model, messages, temperature, cache, validate
+        )
+
+    async def chat(self, prompt: str, temperature: float = 0.7) -> str:
+        """
+        Get a reply to a chat prompt that asks for a JSON answer.
+        
+        Like InventoryChat, replies are cached when they contain the JSON
+        object, so repeating a message doesn't ask the model again.
+        """
+        return await self.complete(
+            [{"role": "user", "content": prompt}], temperature=temperature, cache=True,
+            validate=has_json_object
+        )
+
+    async def suggest_recipes(self, assistant: RecipeAssistant, inventory: List[Dict],
+                              cache: bool = True) -> Dict:
+        """
+        Ask for recipe suggestions for an inventory.
+        
+        Args:
+            assistant: Builds the prompt and parses the reply
+            inventory: Inventory items to cook with
+            cache: False to get a fresh suggestion for an inventory seen before
+        
+        Returns:
+            Dict: Parsed recipes, or an "error" entry
+        """
+        prompt = assistant.generate_recipe_prompt(inventory)
+        try:
+            response_text = await self.complete(
+                [{"role": "user", "content": prompt}], temperature=0.7, cache=cache,
+                validate=lambda text: "error" not in assistant.suggest_recipes(text)
+            )
+        except Exception as e:
+            print(f"Error getting recipe suggestions: {str(e)}")
+            return {"error": str(e)}
+        return assistant.suggest_recipes(response_text)
+
+    async def analyze_food_image(self, image_source: str) -> Tuple[bool, List[Dict], str]:
+        """
+        Analyze an image for food content and extract details.
+        
+        Cached analyses are returned without waiting for a free slot, and
+        callers scanning an image that is already being analyzed wait for
+        that request instead of sending another.
+        """
+        try:
+            async with self._semaphore:
+                image_url, cache_key = await asyncio.to_thread(self.grok._resolve_image, image_source)
+            cached = await asyncio.to_thread(self.grok._cached_analysis, cache_key)
+            if cached is not None:
+                return cached
+            
+            task = self._vision_tasks.get(cache_key)
+            if task is None:
+                task = asyncio.ensure_future(self._analyze(image_source, image_url, cache_key))
+                self._vision_tasks[cache_key] = task
+                task.add_done_callback(lambda _: self._forget_vision_task(cache_key, task))
+            
+            self._vision_waiters[task] = self._vision_waiters.get(task, 0) + 1
+            try:
+                # Shielded so one caller giving up doesn't cancel the others' request
+                return await asyncio.shield(task)
+            finally:
+                self._vision_waiters[task] -= 1
+                if not self._vision_waiters[task]:
+                    del self._vision_waiters[task]
+                    if not task.done():
+                        # Nobody is waiting any more; free the slot, and let
+                        # the next scan of this image start a new request
+                        self._forget_vision_task(cache_key, task)
+                        task.cancel()
+        
+        except Exception as e:
+            print(f"Error occurred: {str(e)}")
+            return False, [], str(e)
+
+    async def _analyze(self, image_source: str, image_url: Optional[str],
+                       cache_key: str) -> Tuple[bool, List[Dict], str]:
+        """Send an image that has no cached analysis to the vision model."""
+        async with self._semaphore:
+            detail = "high"
+            if image_url is None:
+                image_url, detail = await asyncio.to_thread(self.grok.local_image_url, image_source)
+            response = await self.async_client.chat.completions.create(
+                model=self.grok.VISION_MODEL,
+                messages=self.grok._vision_messages(image_url, detail),
+                temperature=0.01,
+                stream=False
+            )
+        return await asyncio.to_thread(
+            self.grok._parse_analysis, response.choices[0].message.content, cache_key
+        )
+
+    def _forget_vision_task(self, cache_key: str, task: asyncio.Task):
+        """Drop a finished vision request so later scans check the cache again."""
+        if self._vision_tasks.get(cache_key) is task:
+            del self._vision_tasks[cache_key]
+
+    async def analyze_many(self, image_sources: Iterable[str]) -> List[Tuple[bool, List[Dict], str]]:
+        """Analyze several images concurrently, returning results in the same order."""
+        return await asyncio.gather(*(self.analyze_food_image(source) for source in image_sources))
+
+    async def aclose(self):
+        """Close the async client and the wrapped GrokAPI."""
+        await self.async_client.close()
+        await asyncio.to_thread(self.grok.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
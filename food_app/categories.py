@@ -1,200 +1,322 @@
-from typing import Dict, List, Optional
+import asyncio
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Iterable, Sequence
+from .lru_cache import LRUCache
+from .fuzzy_index import FuzzyIndex
+from .ngram_classifier import NgramClassifier
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation that shares common prefixes between words."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict) -> str:
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional: prefer the longer keyword, fall back to this one
+        if ends_here:
+            pattern = ('(?:' + pattern + ')?') if len(branches) == 1 else pattern + '?'
+        return pattern
+    
+    return build(trie)
+
+class RuleClassifier:
+    def __init__(self, rules: Sequence[Tuple], items: Dict[str, str], exact_confidence: float,
+                 partial_confidence: float, late_rules: Sequence[Tuple]):
+        """
+        Compile keyword rules into a single-pass classifier.
+        
+        Rules are (keyword groups, excluded keywords, category, confidence)
+        and are tried in order: rules, then an exact lookup in items, then
+        the first listed item contained in the name, then late_rules. The
+        first rule that matches wins.
+        
+        Items are matched with dictionary lookups rather than the keyword
+        regex, so the classifier stays cheap to build and unpickle however
+        many items the taxonomy lists.
+        
+        Args:
+            rules: Rules tried before the item lookups
+            items: Category of item names, in priority order
+            exact_confidence: Confidence of an exact item match
+            partial_confidence: Confidence of a name containing an item
+            late_rules: Rules tried after the item lookups
+        """
+        self.rules = list(rules) + list(late_rules)
+        self.late_index = len(rules)
+        self.items = dict(items)
+        self.item_order = {item: order for order, item in enumerate(self.items)}
+        self.item_categories = list(self.items.values())
+        # Lengths of the items starting with each pair of letters
+        heads = {}
+        for item in self.items:
+            if len(item) > 1:
+                heads.setdefault(item[:2], set()).add(len(item))
+        self.item_heads = {head: sorted(lengths) for head, lengths in heads.items()}
+        self.single_letter_items = any(len(item) == 1 for item in self.items)
+        self.exact_confidence = exact_confidence
+        self.partial_confidence = partial_confidence
+        
+        keywords = set()
+        for groups, excluded, _, _ in self.rules:
+            keywords.update(excluded)
+            for group in groups:
+                keywords.update(group)
+        
+        # At each position the regex reports only the longest keyword found
+        # there; every shorter keyword starting at the same position is a
+        # prefix of it, so it is added back through this map.
+        self.prefixes = {
+            keyword: frozenset(keyword[:end] for end in range(1, len(keyword) + 1)) & keywords
+            for keyword in keywords
+        }
+        self.pattern = re.compile('(?=(' + _trie_pattern(keywords) + '))')
+        
+        # Rules can only match when a keyword from their first group is present
+        triggers = {}
+        for index, (groups, _, _, _) in enumerate(self.rules):
+            for keyword in groups[0]:
+                triggers.setdefault(keyword, set()).add(index)
+        self.triggers = {keyword: frozenset(triggers.get(keyword, ())) for keyword in keywords}
+        
+        self.rules = [
+            (tuple(frozenset(group) for group in groups), frozenset(excluded), category, confidence)
+            for groups, excluded, category, confidence in self.rules
+        ]
+
+    def find_keywords(self, text: str) -> set:
+        """Get every keyword that occurs anywhere in the text."""
+        found = set()
+        prefixes = self.prefixes
+        for keyword in self.pattern.findall(text):
+            found |= prefixes[keyword]
+        return found
+
+    def match_items(self, text: str) -> Optional[Tuple[str, float]]:
+        """Match the text against the items, exactly or as a substring."""
+        category = self.items.get(text)
+        if category is not None:
+            return category, self.exact_confidence
+        
+        # Look up the substrings that start like an item; the earliest listed wins
+        item_order = self.item_order
+        item_heads = self.item_heads
+        size = len(text)
+        best = None
+        for start in range(size):
+            if self.single_letter_items:
+                order = item_order.get(text[start])
+                if order is not None and (best is None or order < best):
+                    best = order
+            lengths = item_heads.get(text[start:start + 2])
+            if lengths is None:
+                continue
+            for length in lengths:
+                if start + length > size:
+                    break
+                order = item_order.get(text[start:start + length])
+                if order is not None and (best is None or order < best):
+                    best = order
+        
+        if best is None:
+            return None
+        return self.item_categories[best], self.partial_confidence
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        """
+        Classify a lowercase name.
+        
+        Args:
+            text: Normalized item name
+            
+        Returns:
+            Tuple[str, float]: (category, confidence), ('other', 0.0) if no rule matches
+        """
+        found = self.find_keywords(text)
+        triggers = self.triggers
+        candidates = set()
+        for keyword in found:
+            candidates |= triggers[keyword]
+        
+        items_checked = False
+        for index in sorted(candidates):
+            if index >= self.late_index and not items_checked:
+                items_checked = True
+                match = self.match_items(text)
+                if match:
+                    return match
+            
+            groups, excluded, category, confidence = self.rules[index]
+            if excluded & found:
+                continue
+            if all(group & found for group in groups):
+                return category, confidence
+        
+        if not items_checked:
+            return self.match_items(text) or ('other', 0.0)
+        return 'other', 0.0
+
+def _exact_name(item_lower: str, canonical_names: Dict[str, str], common_items: Dict[str, str]) -> Optional[str]:
+    """Resolve a lowercase name through the variation table and plural forms."""
+    base_item = canonical_names.get(item_lower)
+    if base_item is not None:
+        return base_item
+    if item_lower.endswith('s') and item_lower[:-1] in common_items:
+        return item_lower[:-1]
+    return None
+
+# Lookups of a categorize_many worker process, set by _init_classify_worker
+_worker_classifier = None
+_worker_canonical_names = None
+_worker_common_items = None
+
+def _init_classify_worker(classifier: RuleClassifier, canonical_names: Dict[str, str],
+                          common_items: Dict[str, str]):
+    """Install the classifier and name tables shipped to a worker process."""
+    global _worker_classifier, _worker_canonical_names, _worker_common_items
+    _worker_classifier = classifier
+    _worker_canonical_names = canonical_names
+    _worker_common_items = common_items
+
+def _classify_chunk(names: List[str]) -> List[Tuple[str, Tuple[str, float]]]:
+    """Normalize and classify a chunk of raw names in a worker process."""
+    classify = _worker_classifier.classify
+    classified = []
+    for name in names:
+        item_lower = name.lower().strip()
+        normalized = _exact_name(item_lower, _worker_canonical_names, _worker_common_items) or item_lower
+        classified.append((normalized, classify(normalized)))
+    return classified
+
+def _user_cache_dir() -> str:
+    """Get this app's per-user cache directory, which stays writable on read-only installs."""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'food_app')
 
 class FoodCategories:
-    # Main categories with descriptions
-    CATEGORIES = {
-        # Fresh produce and ingredients
-        'fresh_fruits': 'Fresh fruits and berries',
-        'fresh_vegetables': 'Fresh vegetables and greens',
-        'fresh_herbs': 'Fresh herbs and aromatics',
-        'fresh_meat': 'Fresh uncooked meat and poultry',
-        'fresh_seafood': 'Fresh fish and seafood',
-        'fresh_dairy': 'Fresh milk, cheese, and dairy products',
-        
-        # Frozen foods
-        'frozen_produce': 'Frozen fruits and vegetables',
-        'frozen_meat': 'Frozen meat and poultry',
-        'frozen_seafood': 'Frozen fish and seafood',
-        'frozen_meals': 'Frozen ready-to-eat meals',
-        'frozen_dessert': 'Ice cream and frozen desserts',
-        
-        # Pantry items
-        'canned': 'Canned and preserved foods',
-        'condiment': 'Sauces, oils, spices, and seasonings',
-        'dried_herbs': 'Dried herbs and spices',
-        'grain': 'Rice, pasta, cereals, and grains',
-        'baking': 'Baking ingredients and supplies',
-        
-        # Prepared foods
-        'deli': 'Deli meats, cheeses, and prepared salads',
-        'prepared': 'Ready-to-eat dishes and meals',
-        'bakery': 'Bread, pastries, and baked goods',
-        
-        # Snacks and sweets
-        'snack': 'Chips, crackers, and savory snacks',
-        'sweets': 'Desserts, candies, and sweet treats',
-        'nuts': 'Nuts, seeds, and dried fruits',
-        
-        # Beverages
-        'beverage': 'Drinks and beverages',
-        'alcohol': 'Alcoholic beverages',
-        
-        # Special categories
-        'organic': 'Certified organic products',
-        'gluten_free': 'Gluten-free products',
-        'vegan': 'Vegan and plant-based products',
-        'international': 'International and ethnic food items',
-        'breakfast': 'Breakfast cereals, spreads, and items',
-        'baby': 'Baby food and formula',
-        'pet': 'Pet food and treats',
-        'health': 'Health foods and supplements',
-        
-        # Other
-        'other': 'Miscellaneous food items'
-    }
-
-    # Common items and their default categories
-    COMMON_ITEMS = {
-        # Fresh fruits
-        'apple': 'fresh_fruits',
-        'banana': 'fresh_fruits',
-        'orange': 'fresh_fruits',
-        'lemon': 'fresh_fruits',
-        'lime': 'fresh_fruits',
-        'grape': 'fresh_fruits',
-        'strawberry': 'fresh_fruits',
-        'blueberry': 'fresh_fruits',
-        'raspberry': 'fresh_fruits',
-        'blackberry': 'fresh_fruits',
-        'pear': 'fresh_fruits',
-        'peach': 'fresh_fruits',
-        'plum': 'fresh_fruits',
-        'mango': 'fresh_fruits',
-        'pineapple': 'fresh_fruits',
-        'kiwi': 'fresh_fruits',
-        'melon': 'fresh_fruits',
-        'watermelon': 'fresh_fruits',
-        
-        # Fresh vegetables
-        'lettuce': 'fresh_vegetables',
-        'spinach': 'fresh_vegetables',
-        'kale': 'fresh_vegetables',
-        'carrot': 'fresh_vegetables',
-        'potato': 'fresh_vegetables',
-        'onion': 'fresh_vegetables',
-        'garlic': 'fresh_vegetables',
-        'tomato': 'fresh_vegetables',
-        'cucumber': 'fresh_vegetables',
-        'pepper': 'fresh_vegetables',
-        'broccoli': 'fresh_vegetables',
-        'cauliflower': 'fresh_vegetables',
-        'celery': 'fresh_vegetables',
-        'asparagus': 'fresh_vegetables',
-        'zucchini': 'fresh_vegetables',
-        'eggplant': 'fresh_vegetables',
-        'mushroom': 'fresh_vegetables',
-        'corn': 'fresh_vegetables',
-        'peas': 'fresh_vegetables',
-        'green beans': 'fresh_vegetables',
-        
-        # Fresh meat and seafood
-        'chicken': 'fresh_meat',
-        'beef': 'fresh_meat',
-        'pork': 'fresh_meat',
-        'fish': 'fresh_seafood',
-        'salmon': 'fresh_seafood',
-        'shrimp': 'fresh_seafood',
-        
-        # Frozen items
-        'frozen vegetables': 'frozen_produce',
-        'frozen fruit': 'frozen_produce',
-        'frozen chicken': 'frozen_meat',
-        'frozen fish': 'frozen_seafood',
-        'frozen pizza': 'frozen_meals',
-        'ice cream': 'frozen_dessert',
-        
-        # Dairy
-        'milk': 'fresh_dairy',
-        'cheese': 'fresh_dairy',
-        'yogurt': 'fresh_dairy',
-        'butter': 'fresh_dairy',
-        'eggs': 'fresh_dairy',
-        
-        # Pantry
-        'pasta': 'grain',
-        'rice': 'grain',
-        'cereal': 'breakfast',
-        'bread': 'bakery',
-        'flour': 'baking',
-        'sugar': 'baking',
-        'olive oil': 'condiment',
-        'sauce': 'condiment',
-        'spices': 'condiment',
-        'canned soup': 'canned',
-        'canned beans': 'canned',
-        'canned tomatoes': 'canned',
-        
-        # Snacks and sweets
-        'chips': 'snack',
-        'crackers': 'snack',
-        'cookies': 'sweets',
-        'candy': 'sweets',
-        'chocolate': 'sweets',
-        'nuts': 'nuts',
-        'dried fruit': 'nuts',
-        
-        # Beverages
-        'juice': 'beverage',
-        'soda': 'beverage',
-        'water': 'beverage',
-        'coffee': 'beverage',
-        'tea': 'beverage',
-        'wine': 'alcohol',
-        'beer': 'alcohol',
-        
-        # Deli
-        'ham': 'deli',
-        'turkey': 'deli',
-        'deli meat': 'deli',
-        'deli cheese': 'deli',
-        'potato salad': 'deli',
-        
-        # International
-        'sushi': 'international',
-        'kimchi': 'international',
-        'curry': 'international',
-        'salsa': 'international',
-        'hummus': 'international'
-    }
-
-    # Add common item variations mapping
-    ITEM_VARIATIONS = {
-        'salt': ['sea salt', 'table salt', 'kosher salt', 'himalayan salt'],
-        'sugar': ['white sugar', 'granulated sugar', 'caster sugar'],
-        'olive oil': ['extra virgin olive oil', 'evoo'],
-        'onion': ['yellow onion', 'white onion', 'red onion'],
-        'garlic': ['fresh garlic', 'garlic cloves'],
-        'tomato': ['tomatoes', 'cherry tomatoes', 'roma tomatoes'],
-        'potato': ['potatoes', 'russet potato', 'sweet potato'],
-        'carrot': ['carrots', 'baby carrots'],
-        'chicken': ['chicken breast', 'chicken thigh', 'chicken wings'],
-        'beef': ['ground beef', 'beef steak', 'beef roast'],
-        'rice': ['white rice', 'brown rice', 'jasmine rice', 'basmati rice'],
-        'basil': ['fresh basil', 'sweet basil', 'thai basil'],
-        'oregano': ['fresh oregano', 'dried oregano'],
-        'thyme': ['fresh thyme', 'dried thyme'],
-        'rosemary': ['fresh rosemary', 'dried rosemary'],
-        'mint': ['fresh mint', 'peppermint', 'spearmint'],
-        'cilantro': ['fresh cilantro', 'coriander'],
-        'parsley': ['fresh parsley', 'italian parsley', 'flat-leaf parsley'],
-        'sage': ['fresh sage', 'dried sage'],
-        'dill': ['fresh dill', 'dried dill'],
-        'chives': ['fresh chives']
-    }
+    # Taxonomy tables, loaded from TAXONOMY_FILE by load_taxonomy():
+    # CATEGORIES maps categories to descriptions, COMMON_ITEMS maps item
+    # names to categories and ITEM_VARIATIONS maps base items to variations
+    CATEGORIES = {}
+    COMMON_ITEMS = {}
+    ITEM_VARIATIONS = {}
+
+    TAXONOMY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'taxonomy.json')
+    # Compiled lookups are pickled here, keyed by a hash of the data file;
+    # None compiles the taxonomy on every load instead
+    TAXONOMY_CACHE_DIR = _user_cache_dir()
+    # Seconds between checks of the data file for changes
+    TAXONOMY_CHECK_INTERVAL = 2.0
+    _taxonomy_path = None
+    _taxonomy_stamp = None
+    _taxonomy_checked = 0.0
+
+    # Names seen outside the taxonomy, e.g. existing inventory items,
+    # that typo-tolerant matching should resolve to. See add_known_items.
+    KNOWN_ITEMS = set()
 
     # Category learning data
     CATEGORY_LEARNING = {}  # Will store {item_name: {category: count}}
 
+    # Updates to CATEGORY_LEARNING hold the lock of the item's stripe and
+    # replace its counts instead of mutating them, so reads need no lock
+    LEARNING_LOCK_STRIPES = 16
+    _learning_locks = [threading.Lock() for _ in range(LEARNING_LOCK_STRIPES)]
+
+    # Optional persistent store for CATEGORY_LEARNING, see attach_learning_store
+    _learning_store = None
+    _learning_loaded = True
+    _learning_load_lock = threading.Lock()
+
+    # Keyword rules in priority order, as (keyword groups, excluded keywords,
+    # category). A rule matches when the name contains a keyword from every
+    # group and none of the excluded keywords.
+    HERB_KEYWORDS = ('basil', 'oregano', 'thyme', 'rosemary', 'mint', 'cilantro',
+                     'parsley', 'sage', 'dill', 'chives', 'herb', 'herbs')
+    FRUIT_KEYWORDS = ('apple', 'banana', 'orange', 'berry', 'berries', 'melon', 'fruit',
+                      'grape', 'citrus', 'pear', 'peach', 'plum', 'mango', 'pineapple')
+    VEGETABLE_KEYWORDS = ('lettuce', 'spinach', 'kale', 'carrot', 'potato', 'onion',
+                          'garlic', 'tomato', 'cucumber', 'pepper', 'broccoli', 'vegetable',
+                          'cauliflower', 'celery', 'asparagus', 'zucchini', 'eggplant',
+                          'mushroom', 'corn', 'peas', 'beans', 'greens')
+    KEYWORD_RULES = [
+        ((HERB_KEYWORDS, ('dried', 'ground')), (), 'dried_herbs'),
+        ((HERB_KEYWORDS, ('fresh',)), (), 'fresh_herbs'),
+        ((HERB_KEYWORDS,), ('powdered',), 'fresh_herbs'),
+        ((HERB_KEYWORDS,), (), 'dried_herbs'),
+        ((FRUIT_KEYWORDS, ('frozen',)), (), 'frozen_produce'),
+        ((FRUIT_KEYWORDS,), (), 'fresh_fruits'),
+        ((VEGETABLE_KEYWORDS, ('frozen',)), (), 'frozen_produce'),
+        ((VEGETABLE_KEYWORDS,), (), 'fresh_vegetables'),
+        ((('frozen',), ('chicken', 'beef', 'pork', 'meat')), (), 'frozen_meat'),
+        ((('frozen',), ('fish', 'seafood', 'shrimp')), (), 'frozen_seafood'),
+        ((('frozen',), ('pizza', 'dinner', 'meal')), (), 'frozen_meals'),
+        ((('frozen',), ('ice cream', 'dessert')), (), 'frozen_dessert'),
+        ((('frozen',),), (), 'frozen_meals'),
+        ((('fresh',), ('meat', 'chicken', 'beef', 'pork', 'lamb')), (), 'fresh_meat'),
+        ((('fresh',), ('fish', 'seafood', 'shrimp', 'salmon')), (), 'fresh_seafood'),
+        ((('fresh',), ('milk', 'cheese', 'dairy')), (), 'fresh_dairy'),
+    ]
+
+    # Checked after exact and partial COMMON_ITEMS matches
+    FALLBACK_RULES = [
+        ((('meat', 'chicken', 'beef', 'pork', 'lamb', 'steak', 'roast', 'chop', 'ground'),), (), 'fresh_meat'),
+    ]
+
+    # Lookups derived from the tables above, kept current by _ensure_indexes.
+    # They are rebuilt under _index_lock and published by reassignment, so
+    # readers never need the lock.
+    _index_lock = threading.RLock()
+    _index_signature = None
+    _tables_version = 0
+    _canonical_names = {}
+    _similar_names = {}
+    _classifier = None
+    _fuzzy_index = FuzzyIndex()
+
+    # Memoized suggestions keyed on the normalized name. Entries are dropped
+    # by learn_category and when the tables or CATEGORY_LEARNING are replaced.
+    SUGGESTION_CACHE_SIZE = 4096
+    _suggestion_cache = LRUCache(SUGGESTION_CACHE_SIZE)
+    _cached_learning = None
+
+    # Unique names per worker task when categorize_many uses processes
+    CATEGORIZE_CHUNK_SIZE = 20000
+
+    # Confidence of rule-based suggestions, by how specific the rule is
+    EXACT_MATCH_CONFIDENCE = 0.95
+    KEYWORD_CONFIDENCE = 0.8
+    PARTIAL_MATCH_CONFIDENCE = 0.6
+    FALLBACK_CONFIDENCE = 0.4
+
+    # Local model consulted when no rule matches, trained on learned
+    # categories and train_model(); weaker predictions are left as 'other'
+    _model = NgramClassifier()
+    MODEL_MIN_CONFIDENCE = 0.6
+    # Names no rule matches are classified as their closest taxonomy name
+    # one typo away, at this fraction of that name's confidence
+    FUZZY_CONFIDENCE_FACTOR = 0.6
+
     @classmethod
     def get_categories(cls) -> List[str]:
         """Get list of all valid categories."""
@@ -211,111 +333,529 @@ class FoodCategories:
         return category.lower() in cls.CATEGORIES
 
     @classmethod
-    def normalize_item_name(cls, item_name: str) -> str:
-        """Normalize item name to prevent duplicates."""
+    def normalize_item_name(cls, item_name: str, fuzzy: bool = False) -> str:
+        """
+        Normalize item name to prevent duplicates.
+        
+        Args:
+            item_name: Name of the item
+            fuzzy: Resolve misspelled names, such as "brocoli", to the closest
+                common item, variation or known item. This also merges real
+                words that are one edit apart ("paste" and "pasta"), so only
+                use it to offer a correction, never as a lookup or storage key
+            
+        Returns:
+            str: Canonical lowercase name
+        """
         item_lower = item_name.lower().strip()
         
-        # Check direct variations
-        for base_item, variations in cls.ITEM_VARIATIONS.items():
-            if item_lower == base_item or item_lower in variations:
-                return base_item
+        cls._ensure_indexes()
         
-        # Check if it's a plural form
-        if item_lower.endswith('s') and item_lower[:-1] in cls.COMMON_ITEMS:
-            return item_lower[:-1]
+        # Check direct variations and plural forms
+        base_item = _exact_name(item_lower, cls._canonical_names, cls.COMMON_ITEMS)
+        if base_item is not None:
+            return base_item
+        
+        # Check for typos of a known name
+        if fuzzy:
+            match = cls._fuzzy_index.lookup(item_lower)
+            if match is not None:
+                return match
         
         return item_lower
 
+    @classmethod
+    def add_known_items(cls, item_names: Iterable[str]):
+        """
+        Let typo-tolerant matching resolve to these names, e.g. the names
+        already in the inventory.
+        
+        Args:
+            item_names: Item names to add
+        """
+        cls._ensure_indexes()
+        for item_name in item_names:
+            name = cls.normalize_item_name(item_name, fuzzy=False)
+            if name and name not in cls._fuzzy_index:
+                with cls._index_lock:
+                    cls.KNOWN_ITEMS.add(name)
+                    cls._fuzzy_index.add(name, name)
+
+    @classmethod
+    def attach_learning_store(cls, store):
+        """
+        Persist learned categories through a store.
+        
+        Stored counts are merged into CATEGORY_LEARNING the first time they
+        are needed, and every learn_category call is recorded in the store.
+        
+        Args:
+            store: A CategoryLearningStore, or None to detach
+        """
+        cls._learning_store = store
+        cls._learning_loaded = store is None
+
+    @classmethod
+    def _ensure_learning_loaded(cls):
+        """Merge the stored counts into CATEGORY_LEARNING on first use."""
+        if cls._learning_loaded:
+            return
+        with cls._learning_load_lock:
+            if cls._learning_loaded:
+                return
+            
+            for item_name, categories in cls._learning_store.load().items():
+                with cls._learning_lock(item_name):
+                    learned = dict(cls.CATEGORY_LEARNING.get(item_name, ()))
+                    for category, count in categories.items():
+                        learned[category] = learned.get(category, 0) + count
+                        cls._model.partial_fit(item_name, category, count)
+                    cls.CATEGORY_LEARNING[item_name] = learned
+            cls._suggestion_cache.clear()
+            cls._learning_loaded = True
+
+    @classmethod
+    def _learning_lock(cls, normalized_name: str) -> threading.Lock:
+        """Get the lock guarding the learned counts of an item."""
+        return cls._learning_locks[hash(normalized_name) % len(cls._learning_locks)]
+
     @classmethod
     def learn_category(cls, item_name: str, category: str):
         """Learn category association for an item."""
+        cls._ensure_learning_loaded()
         normalized_name = cls.normalize_item_name(item_name)
-        if normalized_name not in cls.CATEGORY_LEARNING:
-            cls.CATEGORY_LEARNING[normalized_name] = {}
-        
-        if category not in cls.CATEGORY_LEARNING[normalized_name]:
-            cls.CATEGORY_LEARNING[normalized_name][category] = 0
-        
-        cls.CATEGORY_LEARNING[normalized_name][category] += 1
+        with cls._learning_lock(normalized_name):
+            learned = dict(cls.CATEGORY_LEARNING.get(normalized_name, ()))
+            learned[category] = learned.get(category, 0) + 1
+            cls.CATEGORY_LEARNING[normalized_name] = learned
+            cls._suggestion_cache.pop(normalized_name)
+        cls._model.partial_fit(normalized_name, category)
+        
+        if cls._learning_store is not None:
+            cls._learning_store.record(normalized_name, category)
 
     @classmethod
     def suggest_category(cls, item_name: str) -> str:
         """Suggest a category for an item based on its name and learning history."""
+        return cls.suggest_category_with_confidence(item_name)[0]
+
+    @classmethod
+    def suggest_category_with_confidence(cls, item_name: str) -> Tuple[str, float]:
+        """
+        Suggest a category for an item together with a confidence score.
+        
+        Learned categories score their share of the recorded choices; keyword
+        rules score by how specific the matching rule is. Names no rule
+        matches are classified as a known name one typo away, at reduced
+        confidence, or else get the local model's prediction and its
+        probability.
+        
+        Args:
+            item_name: Name of the item
+            
+        Returns:
+            Tuple[str, float]: (category, confidence between 0 and 1)
+        """
+        cls._ensure_learning_loaded()
         normalized_name = cls.normalize_item_name(item_name)
-        item_lower = normalized_name
-        
-        # Check learning history first
-        if normalized_name in cls.CATEGORY_LEARNING:
-            categories = cls.CATEGORY_LEARNING[normalized_name]
-            if categories:
-                # Return most commonly used category
-                return max(categories.items(), key=lambda x: x[1])[0]
-        
-        # Check for herbs
-        herb_keywords = ['basil', 'oregano', 'thyme', 'rosemary', 'mint', 'cilantro', 
-                        'parsley', 'sage', 'dill', 'chives', 'herb', 'herbs']
-        if any(keyword in item_lower for keyword in herb_keywords):
-            if 'dried' in item_lower or 'ground' in item_lower:
-                return 'dried_herbs'
-            if 'fresh' in item_lower or not any(word in item_lower for word in ['dried', 'ground', 'powdered']):
-                return 'fresh_herbs'
-            return 'dried_herbs'
-        
-        # Check for fruits
-        fruit_keywords = ['apple', 'banana', 'orange', 'berry', 'berries', 'melon', 'fruit',
-                         'grape', 'citrus', 'pear', 'peach', 'plum', 'mango', 'pineapple']
-        if any(keyword in item_lower for keyword in fruit_keywords):
-            if 'frozen' in item_lower:
-                return 'frozen_produce'
-            return 'fresh_fruits'
-        
-        # Check for vegetables
-        vegetable_keywords = ['lettuce', 'spinach', 'kale', 'carrot', 'potato', 'onion',
-                            'garlic', 'tomato', 'cucumber', 'pepper', 'broccoli', 'vegetable',
-                            'cauliflower', 'celery', 'asparagus', 'zucchini', 'eggplant',
-                            'mushroom', 'corn', 'peas', 'beans', 'greens']
-        if any(keyword in item_lower for keyword in vegetable_keywords):
-            if 'frozen' in item_lower:
-                return 'frozen_produce'
-            return 'fresh_vegetables'
-        
-        # Check for frozen items
-        if 'frozen' in item_lower:
-            if any(word in item_lower for word in ['chicken', 'beef', 'pork', 'meat']):
-                return 'frozen_meat'
-            if any(word in item_lower for word in ['fish', 'seafood', 'shrimp']):
-                return 'frozen_seafood'
-            if 'pizza' in item_lower or 'dinner' in item_lower or 'meal' in item_lower:
-                return 'frozen_meals'
-            if any(word in item_lower for word in ['ice cream', 'dessert']):
-                return 'frozen_dessert'
-            return 'frozen_meals'
-        
-        # Check for fresh items
-        if 'fresh' in item_lower:
-            if any(word in item_lower for word in ['meat', 'chicken', 'beef', 'pork', 'lamb']):
-                return 'fresh_meat'
-            if any(word in item_lower for word in ['fish', 'seafood', 'shrimp', 'salmon']):
-                return 'fresh_seafood'
-            if any(word in item_lower for word in ['milk', 'cheese', 'dairy']):
-                return 'fresh_dairy'
-        
-        # Check exact matches
-        if item_lower in cls.COMMON_ITEMS:
-            return cls.COMMON_ITEMS[item_lower]
-        
-        # Check if item name contains any common item keywords
-        for common_item, category in cls.COMMON_ITEMS.items():
-            if common_item in item_lower:
-                return category
-        
-        # Additional meat keywords
-        meat_keywords = ['meat', 'chicken', 'beef', 'pork', 'lamb', 'steak', 'roast', 'chop', 'ground']
-        if any(keyword in item_lower for keyword in meat_keywords):
-            return 'fresh_meat'
-        
-        # Default to 'other' if no match found
-        return 'other'
+        
+        if cls._cached_learning is not cls.CATEGORY_LEARNING:
+            cls._suggestion_cache.clear()
+            cls._cached_learning = cls.CATEGORY_LEARNING
+        
+        suggestion = cls._suggestion_cache.get(normalized_name)
+        if suggestion is None:
+            classifier = cls._classifier
+            learned = cls.CATEGORY_LEARNING.get(normalized_name)
+            # Check learning history first
+            suggestion = cls._learned_suggestion(learned)
+            if suggestion is None:
+                suggestion = classifier.classify(normalized_name)
+            with cls._learning_lock(normalized_name):
+                # Don't cache a suggestion that a concurrent update made stale
+                if (cls.CATEGORY_LEARNING.get(normalized_name) is learned
+                        and cls._classifier is classifier):
+                    cls._suggestion_cache.put(normalized_name, suggestion)
+        
+        # The model keeps learning and known names are added, so fallbacks
+        # are not cached
+        if suggestion == ('other', 0.0):
+            return cls._fallback_suggestion(normalized_name)
+        return suggestion
+
+    @classmethod
+    def _fallback_suggestion(cls, normalized_name: str) -> Tuple[str, float]:
+        """Classify a name no rule matches by a close spelling, or else by the model."""
+        match = cls._fuzzy_index.lookup(normalized_name)
+        if match is not None and match != normalized_name:
+            category, confidence = cls._classifier.classify(match)
+            if confidence > 0:
+                return category, confidence * cls.FUZZY_CONFIDENCE_FACTOR
+        return cls._model_suggestion(normalized_name)
+
+    @classmethod
+    def _model_suggestion(cls, normalized_name: str) -> Tuple[str, float]:
+        """Get the local model's prediction if it is confident enough."""
+        prediction = cls._model.predict(normalized_name)
+        if prediction is None or prediction[1] < cls.MODEL_MIN_CONFIDENCE:
+            return 'other', 0.0
+        return prediction
+
+    @classmethod
+    def train_model(cls, examples: Iterable[Tuple[str, str]]) -> int:
+        """
+        Teach the local model categories without recording them as learned.
+        
+        Args:
+            examples: (item name, category) pairs, e.g. from the inventory
+            
+        Returns:
+            int: Number of examples used; unknown and 'other' categories are skipped
+        """
+        used = 0
+        for item_name, category in examples:
+            if category and category != 'other' and cls.is_valid_category(category):
+                cls._model.partial_fit(cls.normalize_item_name(item_name), category.lower())
+                used += 1
+        return used
+
+    @classmethod
+    def _learned_suggestion(cls, categories: Optional[Dict[str, int]]) -> Optional[Tuple[str, float]]:
+        """Get the most commonly learned category and its share of the votes."""
+        if not categories:
+            return None
+        category, count = max(categories.items(), key=lambda x: x[1])
+        return category, count / sum(categories.values())
+
+    @classmethod
+    def categorize_many(cls, names: Iterable[str], with_confidence: bool = False,
+                        processes: int = 1) -> List:
+        """
+        Suggest categories for many items at once.
+        
+        Every distinct name is normalized and classified only once, so large
+        imports full of repeated names cost about as much as their unique
+        names. With processes > 1, large sets of unique names are normalized
+        and classified in chunks by a process pool of spawned workers, so
+        scripts using it need an `if __name__ == '__main__'` guard.
+        
+        Args:
+            names: Item names
+            with_confidence: Return (category, confidence) tuples instead of categories
+            processes: Number of worker processes for normalization and classification
+            
+        Returns:
+            List: One suggestion per name, in input order
+        """
+        names = list(names)
+        cls._ensure_learning_loaded()
+        cls._ensure_indexes()
+        
+        unique_names = list(dict.fromkeys(names))
+        
+        suggestions = {}
+        chunk_size = cls.CATEGORIZE_CHUNK_SIZE
+        if processes > 1 and len(unique_names) > chunk_size:
+            # Workers normalize too, as that costs as much as classifying.
+            # They are spawned rather than forked so they don't inherit the
+            # learning store's write-behind thread and its locks.
+            normalized = {}
+            chunks = [unique_names[i:i + chunk_size] for i in range(0, len(unique_names), chunk_size)]
+            with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_classify_worker,
+                                     initargs=(cls._classifier, cls._canonical_names, cls.COMMON_ITEMS)) as pool:
+                for chunk, results in zip(chunks, pool.map(_classify_chunk, chunks)):
+                    for name, (key, suggestion) in zip(chunk, results):
+                        normalized[name] = key
+                        suggestions[key] = suggestion
+        else:
+            normalized = {name: cls.normalize_item_name(name) for name in unique_names}
+        
+        classify = cls._classifier.classify
+        for key in dict.fromkeys(normalized.values()):
+            suggestion = cls._learned_suggestion(cls.CATEGORY_LEARNING.get(key))
+            if suggestion is None:
+                suggestion = suggestions.get(key) or classify(key)
+                if suggestion == ('other', 0.0):
+                    suggestion = cls._fallback_suggestion(key)
+            suggestions[key] = suggestion
+        
+        if with_confidence:
+            by_name = {name: suggestions[key] for name, key in normalized.items()}
+        else:
+            by_name = {name: suggestions[key][0] for name, key in normalized.items()}
+        return list(map(by_name.__getitem__, names))
+
+    @classmethod
+    async def suggest_category_async(cls, item_name: str) -> Tuple[str, float]:
+        """Like suggest_category_with_confidence, run in a worker thread."""
+        return await asyncio.to_thread(cls.suggest_category_with_confidence, item_name)
+
+    @classmethod
+    async def learn_category_async(cls, item_name: str, category: str):
+        """Like learn_category, run in a worker thread."""
+        await asyncio.to_thread(cls.learn_category, item_name, category)
+
+    @classmethod
+    async def categorize_many_async(cls, names: Iterable[str], with_confidence: bool = False) -> List:
+        """Like categorize_many, run in a worker thread."""
+        return await asyncio.to_thread(cls.categorize_many, list(names), with_confidence)
+
+    @classmethod
+    def suggestion_cache_stats(cls) -> Dict:
+        """Get hit/miss statistics of the suggestion cache, for sizing it."""
+        return cls._suggestion_cache.stats()
+
+    @classmethod
+    def add_common_item(cls, item_name: str, category: str):
+        """Add or recategorize a common item and rebuild the lookups."""
+        with cls._index_lock:
+            cls.COMMON_ITEMS[item_name.lower().strip()] = category
+            cls._tables_version += 1
+
+    @classmethod
+    def add_item_variations(cls, base_item: str, variations: List[str]):
+        """Add variations of a base item and rebuild the lookups."""
+        base_item = base_item.lower().strip()
+        with cls._index_lock:
+            known = cls.ITEM_VARIATIONS.setdefault(base_item, [])
+            known.extend(v.lower().strip() for v in variations if v.lower().strip() not in known)
+            cls._tables_version += 1
+
+    @classmethod
+    def load_taxonomy(cls, path: Optional[str] = None) -> bool:
+        """
+        Load the taxonomy tables from a JSON data file.
+        
+        The compiled lookups are cached on disk keyed by a hash of the file,
+        so an unchanged taxonomy is unpickled instead of rebuilt. The file is
+        watched afterwards and reloaded when it changes, which replaces any
+        items added at runtime.
+        
+        Args:
+            path: Data file with "categories", "common_items" and
+                "item_variations" objects; defaults to TAXONOMY_FILE
+            
+        Returns:
+            bool: Success status
+        """
+        path = path or cls.TAXONOMY_FILE
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+                stat = os.fstat(f.fileno())
+        except OSError as e:
+            print(f"Error reading taxonomy: {e}")
+            return False
+        
+        # Reloads must not interleave with index rebuilds or runtime additions
+        with cls._index_lock:
+            cache_path = None
+            compiled = None
+            if cls.TAXONOMY_CACHE_DIR is not None:
+                cache_path = os.path.join(cls.TAXONOMY_CACHE_DIR, f'taxonomy-{cls._taxonomy_key(raw)}.pickle')
+                compiled = cls._read_compiled_taxonomy(cache_path)
+            if compiled is None:
+                try:
+                    data = json.loads(raw)
+                except ValueError as e:
+                    print(f"Error parsing taxonomy {path}: {e}")
+                    return False
+                
+                cls.CATEGORIES = data.get('categories', {})
+                cls.COMMON_ITEMS = data.get('common_items', {})
+                cls.ITEM_VARIATIONS = data.get('item_variations', {})
+                cls._build_variation_index()
+                cls._build_fuzzy_index()
+                cls._compile_classifier()
+                if cache_path is not None:
+                    cls._write_compiled_taxonomy(cache_path)
+            else:
+                cls.CATEGORIES = compiled['categories']
+                cls.COMMON_ITEMS = compiled['common_items']
+                cls.ITEM_VARIATIONS = compiled['item_variations']
+                cls._canonical_names = compiled['canonical_names']
+                cls._similar_names = compiled['similar_names']
+                cls._fuzzy_index = compiled['fuzzy_index']
+                cls._classifier = compiled['classifier']
+            
+            cls._index_known_items()
+            cls._suggestion_cache.clear()
+            cls._index_signature = cls._tables_signature()
+            cls._taxonomy_path = path
+            cls._taxonomy_stamp = (stat.st_mtime_ns, stat.st_size)
+            cls._taxonomy_checked = time.monotonic()
+            return True
+
+    @classmethod
+    def _taxonomy_key(cls, raw: bytes) -> str:
+        """Hash the data file together with the code it is compiled by."""
+        digest = hashlib.sha256(raw)
+        # A cache pickled by other versions of the classes is not reused
+        for module_file in (__file__, inspect.getfile(FuzzyIndex)):
+            try:
+                with open(module_file, 'rb') as f:
+                    digest.update(f.read())
+            except OSError:
+                pass
+        digest.update(repr((
+            cls.KEYWORD_RULES, cls.FALLBACK_RULES,
+            cls.EXACT_MATCH_CONFIDENCE, cls.KEYWORD_CONFIDENCE,
+            cls.PARTIAL_MATCH_CONFIDENCE, cls.FALLBACK_CONFIDENCE
+        )).encode())
+        return digest.hexdigest()[:32]
+
+    @classmethod
+    def _read_compiled_taxonomy(cls, cache_path: str) -> Optional[Dict]:
+        """Unpickle compiled lookups, or None if there is no usable cache."""
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring taxonomy cache {cache_path}: {e}")
+            return None
+
+    @classmethod
+    def _write_compiled_taxonomy(cls, cache_path: str):
+        """Pickle the compiled lookups and drop caches of older taxonomies."""
+        compiled = {
+            'categories': cls.CATEGORIES,
+            'common_items': cls.COMMON_ITEMS,
+            'item_variations': cls.ITEM_VARIATIONS,
+            'canonical_names': cls._canonical_names,
+            'similar_names': cls._similar_names,
+            'fuzzy_index': cls._fuzzy_index,
+            'classifier': cls._classifier
+        }
+        cache_dir = os.path.dirname(cache_path)
+        tmp_path = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temporary file first so readers never see half a cache
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            tmp_path = None
+            
+            for name in os.listdir(cache_dir):
+                if name.startswith('taxonomy-') and name != os.path.basename(cache_path):
+                    os.remove(os.path.join(cache_dir, name))
+        except Exception as e:
+            print(f"Could not cache compiled taxonomy: {e}")
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    @classmethod
+    def _check_taxonomy(cls):
+        """Reload the taxonomy if its data file changed since it was loaded."""
+        if cls._taxonomy_path is None:
+            return
+        now = time.monotonic()
+        if now - cls._taxonomy_checked < cls.TAXONOMY_CHECK_INTERVAL:
+            return
+        cls._taxonomy_checked = now
+        
+        try:
+            stat = os.stat(cls._taxonomy_path)
+        except OSError:
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != cls._taxonomy_stamp:
+            with cls._index_lock:
+                if stamp == cls._taxonomy_stamp:
+                    return
+                # Remember the stamp even if loading fails, to report it only once
+                cls._taxonomy_stamp = stamp
+                cls.load_taxonomy(cls._taxonomy_path)
+
+    @classmethod
+    def _tables_signature(cls) -> Tuple:
+        """Cheap O(1) fingerprint of the tables the derived lookups are built from."""
+        # Catches reassigned tables, added or removed keys, and anything that
+        # goes through add_common_item and add_item_variations. Editing a
+        # variation list in place needs one of those methods.
+        return (
+            id(cls.ITEM_VARIATIONS), len(cls.ITEM_VARIATIONS),
+            id(cls.COMMON_ITEMS), len(cls.COMMON_ITEMS),
+            id(cls.KEYWORD_RULES), len(cls.KEYWORD_RULES),
+            id(cls.FALLBACK_RULES), len(cls.FALLBACK_RULES),
+            cls._tables_version
+        )
+
+    @classmethod
+    def _ensure_indexes(cls):
+        """Rebuild the derived lookups if the item tables have changed."""
+        cls._check_taxonomy()
+        if cls._tables_signature() == cls._index_signature:
+            return
+        
+        with cls._index_lock:
+            signature = cls._tables_signature()
+            if signature == cls._index_signature:
+                return
+            cls._build_variation_index()
+            cls._build_fuzzy_index()
+            cls._compile_classifier()
+            cls._index_known_items()
+            cls._suggestion_cache.clear()
+            cls._index_signature = signature
+
+    @classmethod
+    def _build_variation_index(cls):
+        """Map every variation to its base item and to its equivalence class."""
+        canonical_names = {}
+        similar_names = {}
+        for base_item, variations in cls.ITEM_VARIATIONS.items():
+            group = [base_item] + list(variations)
+            for name in group:
+                # The first base item listing a name wins, as in a linear scan
+                canonical_names.setdefault(name, base_item)
+                similar_names.setdefault(name, set()).update(group)
+        
+        cls._canonical_names = canonical_names
+        cls._similar_names = {name: frozenset(group) for name, group in similar_names.items()}
+
+    @classmethod
+    def _build_fuzzy_index(cls):
+        """Index every taxonomy name that misspellings may resolve to."""
+        fuzzy_index = FuzzyIndex()
+        for name, base_item in cls._canonical_names.items():
+            fuzzy_index.add(name, base_item)
+        for name in cls.COMMON_ITEMS:
+            if name not in fuzzy_index:
+                fuzzy_index.add(name, name)
+        
+        cls._fuzzy_index = fuzzy_index
+
+    @classmethod
+    def _index_known_items(cls):
+        """Add the known items to a freshly built fuzzy index."""
+        for name in cls.KNOWN_ITEMS:
+            if name not in cls._fuzzy_index:
+                cls._fuzzy_index.add(name, name)
+
+    @classmethod
+    def _compile_classifier(cls):
+        """Compile the keyword rules and common items into one classifier."""
+        rules = [
+            (groups, excluded, category, cls.KEYWORD_CONFIDENCE)
+            for groups, excluded, category in cls.KEYWORD_RULES
+        ]
+        fallback_rules = [
+            (groups, excluded, category, cls.FALLBACK_CONFIDENCE)
+            for groups, excluded, category in cls.FALLBACK_RULES
+        ]
+        cls._classifier = RuleClassifier(
+            rules, cls.COMMON_ITEMS, cls.EXACT_MATCH_CONFIDENCE,
+            cls.PARTIAL_MATCH_CONFIDENCE, fallback_rules
+        )
 
     @classmethod
     def format_category(cls, category: str) -> str:
@@ -333,16 +873,15 @@ class FoodCategories:
         """Get list of similar items to prevent duplicates."""
         normalized_name = cls.normalize_item_name(item_name)
         
-        similar_items = []
         # Check variations
-        for base_item, variations in cls.ITEM_VARIATIONS.items():
-            if normalized_name == base_item or normalized_name in variations:
-                similar_items.extend([base_item] + variations)
+        similar_items = set(cls._similar_names.get(normalized_name, ()))
         
         # Check plurals
         if normalized_name.endswith('s'):
-            similar_items.append(normalized_name[:-1])
+            similar_items.add(normalized_name[:-1])
         else:
-            similar_items.append(normalized_name + 's')
+            similar_items.add(normalized_name + 's')
         
-        return list(set(similar_items))
\ No newline at end of file
+        return list(similar_items)
+
+FoodCategories.load_taxonomy()
@@ -0,0 +1,94 @@
+import atexit
+import threading
+from typing import Dict
+from .database import FoodDatabase
+
+class CategoryLearningStore:
+    def __init__(self, db: FoodDatabase, flush_interval: float = 2.0, max_pending: int = 500):
+        """
+        Persist learned categories with write-behind batching.
+        
+        record() only updates an in-memory buffer; a background thread adds
+        the buffered counts to the database every flush_interval seconds,
+        or sooner once max_pending distinct entries are waiting.
+        
+        Args:
+            db: Database holding the category_learning table
+            flush_interval: Seconds between background flushes
+            max_pending: Buffered entries that trigger an early flush
+        """
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        
+        self._thread = threading.Thread(
+            target=self._run, name="category-learning-flush", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def load(self) -> Dict[str, Dict[str, int]]:
+        """Get the stored counts, including ones not flushed yet."""
+        self.flush()
+        return self.db.get_category_learning()
+
+    def record(self, item_name: str, category: str, count: int = 1):
+        """Buffer a learned category without touching the database."""
+        key = (item_name, category)
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + count
+            pending = len(self._pending)
+        
+        if pending >= self.max_pending:
+            self._wake.set()
+
+    def pending_count(self) -> int:
+        """Get the number of buffered entries."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> bool:
+        """
+        Write buffered counts to the database.
+        
+        Returns:
+            bool: Success status; failed counts stay buffered for a retry
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            
+            if not pending:
+                return True
+            
+            if self.db.add_category_counts(pending):
+                return True
+            
+            # Put the counts back so the next flush retries them
+            with self._lock:
+                for key, count in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + count
+            return False
+
+    def close(self):
+        """Stop the background thread and flush what is left."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self):
+        """Flush periodically until closed."""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
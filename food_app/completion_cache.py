@@ -0,0 +1,106 @@
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Awaitable, Callable, Dict, List, Optional
+from .disk_cache import DiskCache
+
+def has_json_object(text: str) -> bool:
+    """Check that a completion contains a JSON object, e.g. inside a code block."""
+    try:
+        json.loads(text[text.find('{'):text.rfind('}') + 1])
+        return True
+    except ValueError:
+        return False
+
+class CompletionCache:
+    def __init__(self, cache: DiskCache, max_temperature: float = 0.3):
+        """
+        Memoize chat completions on their model, messages and temperature.
+        
+        Sampling at a high temperature is meant to give a different answer
+        each time, so by default only calls at or below max_temperature are
+        cached. Call sites can opt in or out per call.
+        
+        Args:
+            cache: Store for the completion texts
+            max_temperature: Highest temperature cached without an explicit opt-in
+        """
+        self.cache = cache
+        self.max_temperature = max_temperature
+        self._lock = threading.Lock()
+        self._bypassed = 0
+
+    @staticmethod
+    def key(model: str, messages: List[Dict], temperature: float) -> str:
+        """Get the cache key of a completion request."""
+        request = json.dumps(
+            {'model': model, 'messages': messages, 'temperature': temperature},
+            sort_keys=True, separators=(',', ':')
+        )
+        return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+    def complete(self, create: Callable[[], str], model: str, messages: List[Dict],
+                 temperature: float, cache: Optional[bool] = None,
+                 validate: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Get a completion from the cache, or create and cache it.
+        
+        Args:
+            create: Makes the API call and returns the completion text
+            model: Model name
+            messages: Chat messages
+            temperature: Sampling temperature
+            cache: True to cache regardless of temperature, False to always
+                call the API, None to decide by max_temperature
+            validate: Check a new completion is worth caching, e.g. that it parses
+        
+        Returns:
+            str: The completion text
+        """
+        if not self._use_cache(temperature, cache):
+            return create()
+        
+        key = self.key(model, messages, temperature)
+        text = self.cache.get(key)
+        if text is None:
+            text = create()
+            if text is not None and (validate is None or validate(text)):
+                self.cache.put(key, text)
+        return text
+
+    async def complete_async(self, create: Callable[[], Awaitable[str]], model: str,
+                             messages: List[Dict], temperature: float, cache: Optional[bool] = None,
+                             validate: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Like complete(), for a coroutine making the API call.
+        
+        Cache lookups and writes run in a worker thread so the event loop
+        keeps serving other requests while SQLite does its I/O.
+        """
+        if not self._use_cache(temperature, cache):
+            return await create()
+        
+        key = self.key(model, messages, temperature)
+        text = await asyncio.to_thread(self.cache.get, key)
+        if text is None:
+            text = await create()
+            if text is not None and (validate is None or validate(text)):
+                await asyncio.to_thread(self.cache.put, key, text)
+        return text
+
+    def _use_cache(self, temperature: float, cache: Optional[bool]) -> bool:
+        """Decide whether a call goes through the cache, counting those that don't."""
+        if cache is None:
+            cache = temperature <= self.max_temperature
+        if not cache:
+            with self._lock:
+                self._bypassed += 1
+        return cache
+
+    def stats(self) -> Dict:
+        """Get hit/miss statistics, including calls that skipped the cache."""
+        stats = self.cache.stats()
+        with self._lock:
+            stats['bypassed'] = self._bypassed
+        return stats
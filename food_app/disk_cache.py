@@ -0,0 +1,215 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from .database import ConnectionPool
+
+_MISSING = object()
+
+class DiskCache:
+    def __init__(self, db_path: str = "food_app_cache.db", namespace: str = "default",
+                 ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        """
+        Persistent key/value cache in SQLite with expiry and LRU eviction.
+        
+        Values are stored as JSON. Several caches can share one database
+        file under different namespaces; TTL and size limits apply per
+        namespace.
+        
+        Args:
+            db_path: Path to the SQLite cache file
+            namespace: Name separating this cache's keys from others in the file
+            ttl: Default seconds an entry stays valid, None to keep it until evicted
+            max_bytes: Size of stored values above which the least recently
+                used entries are evicted, None for no limit
+        """
+        self.db_path = db_path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.pool = ConnectionPool(db_path)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._init_table()
+
+    def _init_table(self):
+        """Create the cache table if needed."""
+        try:
+            conn = self.pool.get_connection()
+            with conn:
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS cache_entries (
+                        namespace TEXT NOT NULL,
+                        key TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        expires_at REAL,
+                        accessed_at REAL NOT NULL,
+                        PRIMARY KEY (namespace, key)
+                    )
+                ''')
+                conn.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed
+                    ON cache_entries (namespace, accessed_at)
+                ''')
+        except sqlite3.Error as e:
+            print(f"Error initializing cache {self.db_path}: {e}")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a cached value and mark it as recently used."""
+        now = time.time()
+        try:
+            conn = self.pool.get_connection()
+            row = conn.execute(
+                'SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            ).fetchone()
+            if row is not None and row['expires_at'] is not None and row['expires_at'] <= now:
+                with conn:
+                    conn.execute('DELETE FROM cache_entries WHERE namespace = ? AND key = ?',
+                                 (self.namespace, key))
+                with self._lock:
+                    self._expirations += 1
+                row = None
+            
+            if row is None:
+                with self._lock:
+                    self._misses += 1
+                return default
+            
+            with conn:
+                conn.execute(
+                    'UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?',
+                    (now, self.namespace, key)
+                )
+            value = json.loads(row['value'])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error reading cache entry: {e}")
+            with self._lock:
+                self._misses += 1
+            return default
+        
+        with self._lock:
+            self._hits += 1
+        return value
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = _MISSING) -> bool:
+        """
+        Cache a JSON-serializable value, evicting old entries if the cache is full.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds the entry stays valid; defaults to the cache's ttl
+        
+        Returns:
+            bool: Success status
+        """
+        if ttl is _MISSING:
+            ttl = self.ttl
+        now = time.time()
+        try:
+            data = json.dumps(value)
+            size = len(data.encode('utf-8'))
+            if self.max_bytes is not None and size > self.max_bytes:
+                return False
+            
+            conn = self.pool.get_connection()
+            with conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO cache_entries
+                    (namespace, key, value, size, expires_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (self.namespace, key, data, size,
+                      None if ttl is None else now + ttl, now))
+                if self.max_bytes is not None:
+                    self._evict(conn, now)
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"Error writing cache entry: {e}")
+            return False
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then the least recently used ones over max_bytes."""
+        cursor = conn.execute(
+            'DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?',
+            (self.namespace, now)
+        )
+        expired = cursor.rowcount
+        
+        # Keep the most recently used entries that fit in max_bytes
+        cursor = conn.execute('''
+            DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (
+                        ORDER BY accessed_at DESC, key
+                    ) AS running_size
+                    FROM cache_entries WHERE namespace = ?
+                ) WHERE running_size > ?
+            )
+        ''', (self.namespace, self.namespace, self.max_bytes))
+        
+        with self._lock:
+            self._expirations += expired
+            self._evictions += cursor.rowcount
+
+    def pop(self, key: str) -> bool:
+        """
+        Drop a single entry.
+        
+        Returns:
+            bool: Whether the key was cached
+        """
+        try:
+            conn = self.pool.get_connection()
+            with conn:
+                cursor = conn.execute(
+                    'DELETE FROM cache_entries WHERE namespace = ? AND key = ?',
+                    (self.namespace, key)
+                )
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"Error removing cache entry: {e}")
+            return False
+
+    def clear(self):
+        """Drop every entry in this namespace; statistics are kept."""
+        try:
+            conn = self.pool.get_connection()
+            with conn:
+                conn.execute('DELETE FROM cache_entries WHERE namespace = ?', (self.namespace,))
+        except sqlite3.Error as e:
+            print(f"Error clearing cache: {e}")
+
+    def stats(self) -> Dict:
+        """Get hit/miss statistics and the current size."""
+        try:
+            row = self.pool.get_connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?',
+                (self.namespace,)
+            ).fetchone()
+            entries, size_bytes = row[0], row[1]
+        except sqlite3.Error as e:
+            print(f"Error reading cache size: {e}")
+            entries, size_bytes = 0, 0
+        
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'size': entries,
+                'size_bytes': size_bytes,
+                'max_bytes': self.max_bytes,
+                'hit_rate': self._hits / total if total else 0.0
+            }
+
+    def close(self):
+        """Close the cache's database connections."""
+        self.pool.close_all()
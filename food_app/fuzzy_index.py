@@ -0,0 +1,171 @@
+import zlib
+from typing import Dict, Optional
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Edit distance between two strings, counting an adjacent swap as one edit.
+    
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Largest distance of interest
+        
+    Returns:
+        int: The distance, or max_distance + 1 if it is larger than max_distance
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    
+    # Typos are usually local; only the differing middle needs the table
+    start = 0
+    stop = min(len(a), len(b))
+    while start < stop and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return min(max(len(a), len(b)), max_distance + 1)
+    
+    # Only cells within max_distance of the diagonal can stay in range
+    too_far = max_distance + 1
+    before = None
+    previous = [j if j <= max_distance else too_far for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [too_far] * (len(b) + 1)
+        if i <= max_distance:
+            current[0] = i
+        for j in range(low, high + 1):
+            char_b = b[j - 1]
+            cost = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            if (before is not None and j > 1 and char_a == b[j - 2]
+                    and a[i - 2] == char_b):
+                cost = min(cost, before[j - 2] + 1)
+            current[j] = min(cost, too_far)
+        if min(current[low - 1:high + 1]) > max_distance:
+            return too_far
+        before, previous = previous, current
+    
+    return previous[-1]
+
+class FuzzyIndex:
+    # Shortest name allowed a typo; shorter names differ too easily
+    MIN_LENGTH = 5
+
+    def __init__(self):
+        """
+        Lookup of terms allowing one typo, by symmetric deletion.
+        
+        Every term is indexed under itself and each way of deleting one of
+        its letters. A query within one edit of a term (insertion, deletion,
+        substitution or swap of neighbours) shares one of those keys with
+        it, so a lookup costs one dictionary probe per letter of the query.
+        Candidates are then verified with a bounded edit distance.
+        
+        Keys are stored as CRC32 checksums, holding a single term id where
+        possible, which keeps the index small enough to pickle and load
+        quickly. Checksum collisions only add candidates.
+        """
+        self._terms = []
+        self._values = []
+        self._ids = {}
+        self._deletions = {}
+
+    @staticmethod
+    def deletions(term: str) -> set:
+        """Get the term itself and every string one deletion away from it."""
+        keys = {term[:i] + term[i + 1:] for i in range(len(term))}
+        keys.add(term)
+        return {zlib.crc32(key.encode()) for key in keys}
+
+    def __getstate__(self) -> Dict:
+        # The id lookup is rebuilt from the term list on load
+        return {'terms': self._terms, 'values': self._values, 'deletions': self._deletions}
+
+    def __setstate__(self, state: Dict):
+        self._terms = state['terms']
+        self._values = state['values']
+        self._deletions = state['deletions']
+        self._ids = {term: term_id for term_id, term in enumerate(self._terms)}
+
+    def add(self, term: str, value: str):
+        """
+        Index a term; looking it up (or a near miss) returns value.
+        
+        Args:
+            term: Name to match against
+            value: Canonical name the term resolves to
+        """
+        term_id = self._ids.get(term)
+        if term_id is not None:
+            self._values[term_id] = value
+            return
+        
+        term_id = len(self._terms)
+        self._ids[term] = term_id
+        self._terms.append(term)
+        self._values.append(value)
+        if len(term) + 1 >= self.MIN_LENGTH:
+            deletions = self._deletions
+            for key in self.deletions(term):
+                existing = deletions.get(key)
+                if existing is None:
+                    deletions[key] = term_id
+                elif isinstance(existing, int):
+                    deletions[key] = [existing, term_id]
+                else:
+                    existing.append(term_id)
+
+    def get(self, term: str) -> Optional[str]:
+        """Get the value of an exactly matching term."""
+        term_id = self._ids.get(term)
+        return None if term_id is None else self._values[term_id]
+
+    def lookup(self, query: str) -> Optional[str]:
+        """
+        Find the value of the closest term at most one typo away.
+        
+        Args:
+            query: Lowercased name to resolve
+            
+        Returns:
+            Optional[str]: Value of the best match, None if nothing is close
+        """
+        term_id = self._ids.get(query)
+        if term_id is not None:
+            return self._values[term_id]
+        if len(query) < self.MIN_LENGTH:
+            return None
+        
+        candidates = set()
+        for key in self.deletions(query):
+            term_ids = self._deletions.get(key)
+            if term_ids is None:
+                continue
+            if isinstance(term_ids, int):
+                candidates.add(term_ids)
+            else:
+                candidates.update(term_ids)
+        
+        # Keys shared through two different deletions can be two edits apart
+        best = None
+        for term_id in candidates:
+            if edit_distance(query, self._terms[term_id], 1) <= 1:
+                if best is None or term_id < best:
+                    best = term_id
+        
+        return None if best is None else self._values[best]
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._ids
@@ -1,26 +1,104 @@
 import os
 import base64
-import requests # type: ignore
+import hashlib
 import json
 from openai import OpenAI
 from dotenv import load_dotenv
-from typing import Union, List, Dict, Optional, Tuple
+from typing import Callable, Union, List, Dict, Optional, Tuple
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup # type: ignore
+from .disk_cache import DiskCache
+from .completion_cache import CompletionCache
+from . import image_prep
+from .multipart import MultipartBody
+from .http_session import PooledSession
+from .page_meta import find_meta_content, read_head
 
 # Load environment variables from .env file
 load_dotenv()
 
 class GrokAPI:
-    def __init__(self, api_key: Optional[str] = None, imgbb_api_key: Optional[str] = None):
-        """Initialize the Grok API client."""
+    VISION_MODEL = "grok-vision-beta"
+
+    # Prompt for analyze_food_image; changing it invalidates cached analyses
+    VISION_PROMPT = """Analyze this image for ANY food or beverage items, including:
+1. Fresh food and prepared dishes
+2. Packaged foods and snacks
+3. Canned goods and preserved foods
+4. Beverages (both alcoholic and non-alcoholic)
+5. Condiments and sauces
+6. Ingredients and raw food items
+
+For each item found:
+- List the specific item name
+- Include brand names if visible
+- Specify if it's packaged/canned/fresh
+- Note the quantity if obvious
+
+If there is no food or beverage items in the image, state "No food or beverage items detected."
+
+Format your response as JSON with the following structure:
+{
+    "contains_food": true/false,
+    "food_items": [
+        {
+            "name": "item name",
+            "type": "packaged/canned/fresh/beverage",
+            "brand": "brand name if visible",
+            "quantity": "quantity if visible"
+        }
+    ],
+    "description": "detailed description of all items and their arrangement"
+}"""
+
+    # Local images up to this size are sent inline as data URLs; larger
+    # ones are uploaded to ImgBB first, which needs an IMGBB_API_KEY
+    INLINE_IMAGE_MAX_BYTES = 5 * 1024 * 1024
+
+    # Local photos are downscaled and recompressed before sending, see
+    # image_prep.prepare_image
+    PREPARE_IMAGES = True
+    IMAGE_MAX_EDGE = image_prep.DEFAULT_MAX_EDGE
+    IMAGE_QUALITY = image_prep.DEFAULT_QUALITY
+
+    # Analyses are cached by image content for a month, up to 20 MB
+    CACHE_PATH = "food_app_cache.db"
+    VISION_CACHE_TTL = 30 * 24 * 3600
+    VISION_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+    # Direct image URLs behind ibb.co share links are cached for a week
+    IMAGE_URL_CACHE_TTL = 7 * 24 * 3600
+    IMAGE_URL_CACHE_MAX_BYTES = 1024 * 1024
+
+    # Chat completions are cached for a week, up to 10 MB; see complete()
+    CHAT_MODEL = "grok-beta"
+    COMPLETION_CACHE_TTL = 7 * 24 * 3600
+    COMPLETION_CACHE_MAX_BYTES = 10 * 1024 * 1024
+    COMPLETION_CACHE_MAX_TEMPERATURE = 0.3
+
+    # Kept-alive connections per host and (connect, read) timeouts in
+    # seconds for ImgBB requests
+    HTTP_POOL_SIZE = 10
+    HTTP_TIMEOUT = (5, 30)
+
+    def __init__(self, api_key: Optional[str] = None, imgbb_api_key: Optional[str] = None,
+                 cache_path: Optional[str] = CACHE_PATH, pool_size: int = HTTP_POOL_SIZE,
+                 timeout: Union[float, Tuple[float, float]] = HTTP_TIMEOUT):
+        """
+        Initialize the Grok API client.
+        
+        Args:
+            api_key: XAI API key, defaults to XAI_API_KEY
+            imgbb_api_key: Optional ImgBB API key for large images, defaults to IMGBB_API_KEY
+            cache_path: SQLite file caching image analyses and completions,
+                None to disable caching
+            pool_size: Connections kept open per host for ImgBB requests
+            timeout: Seconds to wait on ImgBB, or a (connect, read) pair
+        """
         self.api_key = api_key or os.getenv("XAI_API_KEY")
         self.imgbb_api_key = imgbb_api_key or os.getenv("IMGBB_API_KEY")
         
         if not self.api_key:
             raise ValueError("XAI_API_KEY not provided and not found in environment variables")
-        if not self.imgbb_api_key:
-            raise ValueError("IMGBB_API_KEY not provided and not found in environment variables")
         
         self.base_url = "https://api.x.ai/v1"
         self.headers = {
@@ -33,6 +111,80 @@ class GrokAPI:
             api_key=self.api_key,
             base_url=self.base_url,
         )
+        
+        # Shared by ImgBB uploads and share link lookups so they reuse connections
+        self.session = PooledSession(pool_size=pool_size, timeout=timeout)
+        
+        self.vision_cache = None
+        self.completion_cache = None
+        self.image_url_cache = None
+        if cache_path:
+            self.image_url_cache = DiskCache(
+                cache_path, namespace="image_urls",
+                ttl=self.IMAGE_URL_CACHE_TTL, max_bytes=self.IMAGE_URL_CACHE_MAX_BYTES
+            )
+            self.vision_cache = DiskCache(
+                cache_path, namespace="vision",
+                ttl=self.VISION_CACHE_TTL, max_bytes=self.VISION_CACHE_MAX_BYTES
+            )
+            self.completion_cache = CompletionCache(
+                DiskCache(
+                    cache_path, namespace="completions",
+                    ttl=self.COMPLETION_CACHE_TTL, max_bytes=self.COMPLETION_CACHE_MAX_BYTES
+                ),
+                max_temperature=self.COMPLETION_CACHE_MAX_TEMPERATURE
+            )
+
+    def complete(self, messages: List[Dict], model: str = CHAT_MODEL, temperature: float = 0.7,
+                 cache: Optional[bool] = None, validate: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Get a chat completion, served from the cache when possible.
+        
+        Args:
+            messages: Chat messages
+            model: Model name
+            temperature: Sampling temperature
+            cache: True to cache this call, False to always ask the model,
+                None to cache only low-temperature calls
+            validate: Check a new completion is worth caching, e.g. that it parses
+        
+        Returns:
+            str: The completion text
+        """
+        def create():
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=False
+            )
+            return response.choices[0].message.content
+        
+        if self.completion_cache is None:
+            return create()
+        return self.completion_cache.complete(create, model, messages, temperature, cache, validate)
+
+    def http_stats(self) -> Dict:
+        """Get how many ImgBB requests were sent and how many connections they took."""
+        return self.session.stats()
+
+    def close(self):
+        """Close pooled connections and cache files."""
+        self.session.close()
+        if self.vision_cache is not None:
+            self.vision_cache.close()
+            self.completion_cache.cache.close()
+            self.image_url_cache.close()
+
+    def cache_stats(self) -> Dict:
+        """Get hit/miss statistics of the vision and completion caches."""
+        if self.vision_cache is None:
+            return {}
+        return {
+            'vision': self.vision_cache.stats(),
+            'completions': self.completion_cache.stats(),
+            'image_urls': self.image_url_cache.stats()
+        }
 
     def is_url(self, string: str) -> bool:
         """Check if a string is a valid URL."""
@@ -43,38 +195,49 @@ class GrokAPI:
             return False
 
     def get_direct_image_url(self, url: str) -> str:
-        """Convert various image sharing URLs to direct image URLs."""
+        """
+        Convert various image sharing URLs to direct image URLs.
+        
+        ImgBB share pages are only read up to the end of their <head>, where
+        the og:image tag is, and resolved URLs are cached.
+        """
         # Handle ImgBB sharing URLs
         if "ibb.co" in url:
+            if self.image_url_cache is not None:
+                image_url = self.image_url_cache.get(url)
+                if image_url is not None:
+                    return image_url
             try:
-                response = requests.get(url)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                meta_tag = soup.find('meta', property='og:image')
+                with self.session.get(url, stream=True) as response:
+                    response.raise_for_status()
+                    image_url = find_meta_content(read_head(response), "og:image")
                 
-                if meta_tag and meta_tag.get('content'):
-                    return meta_tag['content']
+                if image_url:
+                    if self.image_url_cache is not None:
+                        self.image_url_cache.put(url, image_url)
+                    return image_url
             except Exception as e:
                 print(f"Warning: Could not convert ImgBB URL: {str(e)}")
         
         return url
 
-    def upload_image(self, image_path: str) -> str:
-        """Upload an image to ImgBB and return the URL."""
+    def upload_image(self, image_path: str, image_bytes: Optional[bytes] = None) -> str:
+        """
+        Upload an image, or the given encoding of it, to ImgBB and return the URL.
+        
+        The image goes out as a streamed multipart file instead of a base64
+        form field, so a file on disk is read one block at a time.
+        """
         imgbb_url = "https://api.imgbb.com/1/upload"
+        if not self.imgbb_api_key:
+            raise ValueError("IMGBB_API_KEY not provided and not found in environment variables")
         
         try:
-            with open(image_path, "rb") as file:
-                image_data = base64.b64encode(file.read()).decode('utf-8')
-                
-                payload = {
-                    "key": self.imgbb_api_key,
-                    "image": image_data,
-                    "name": os.path.basename(image_path)
-                }
-                
-                response = requests.post(imgbb_url, data=payload)
+            fields = {"key": self.imgbb_api_key, "name": os.path.basename(image_path)}
+            with MultipartBody(fields, "image", image_path, image_bytes) as body:
+                response = self.session.post(
+                    imgbb_url, data=body, headers={"Content-Type": body.content_type}
+                )
                 
                 if response.status_code != 200:
                     print(f"Error response from ImgBB: {response.text}")
@@ -92,138 +255,204 @@ class GrokAPI:
             print(f"Failed to upload image: {str(e)}")
             raise
 
-    def analyze_food_image(self, image_source: str) -> Tuple[bool, List[Dict], str]:
-        """Analyze an image for food content and extract details."""
-        try:
-            # Check if the source is a URL or local file
-            if self.is_url(image_source):
-                image_url = self.get_direct_image_url(image_source)
-                print(f"Using image URL: {image_url}")
-            else:
-                image_url = self.upload_image(image_source)
-            
-            # Prepare the specific prompt for food detection
-            prompt = """Analyze this image for ANY food or beverage items, including:
-1. Fresh food and prepared dishes
-2. Packaged foods and snacks
-3. Canned goods and preserved foods
-4. Beverages (both alcoholic and non-alcoholic)
-5. Condiments and sauces
-6. Ingredients and raw food items
-
-For each item found:
-- List the specific item name
-- Include brand names if visible
-- Specify if it's packaged/canned/fresh
-- Note the quantity if obvious
+    def local_image_url(self, image_path: str) -> Tuple[str, str]:
+        """
+        Get a URL the vision API can read a local image from.
+        
+        The photo is downscaled and recompressed first. Images up to
+        INLINE_IMAGE_MAX_BYTES are sent inline; this saves uploading the
+        image to ImgBB and the API fetching it back. Larger ones are
+        uploaded, streamed from disk when they were not re-encoded, and
+        need an ImgBB key.
+        
+        Returns:
+            Tuple[str, str]: (image URL, vision detail level)
+        """
+        if self.PREPARE_IMAGES and image_prep.Image is not None:
+            image = image_prep.prepare_image(image_path, self.IMAGE_MAX_EDGE, self.IMAGE_QUALITY)
+        else:
+            image = image_prep.file_image(image_path)
+        
+        if image.size <= self.INLINE_IMAGE_MAX_BYTES:
+            print(f"Sending image inline ({image.size // 1024} KB, detail {image.detail})")
+            image_bytes = image.data
+            if image_bytes is None:
+                with open(image_path, "rb") as file:
+                    image_bytes = file.read()
+            image_data = base64.b64encode(image_bytes).decode('ascii')
+            return f"data:{image.mime_type};base64,{image_data}", image.detail
+        
+        if not self.imgbb_api_key:
+            raise ValueError(
+                f"Image is {image.size // 1024} KB, over the "
+                f"{self.INLINE_IMAGE_MAX_BYTES // 1024} KB that can be sent inline; "
+                "set IMGBB_API_KEY to upload it instead"
+            )
+        return self.upload_image(image_path, image.data), image.detail
 
-If there is no food or beverage items in the image, state "No food or beverage items detected."
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        """Get the SHA-256 of a file's contents."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 16), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
 
-Format your response as JSON with the following structure:
-{
-    "contains_food": true/false,
-    "food_items": [
-        {
-            "name": "item name",
-            "type": "packaged/canned/fresh/beverage",
-            "brand": "brand name if visible",
-            "quantity": "quantity if visible"
-        }
-    ],
-    "description": "detailed description of all items and their arrangement"
-}"""
-
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": image_url,
-                                "detail": "high",
-                            },
-                        },
-                        {
-                            "type": "text",
-                            "text": prompt,
-                        },
-                    ],
-                },
-            ]
+    def _vision_cache_key(self, image_digest: str) -> str:
+        """Key an analysis on the image, how it is prepared, the model and the prompt."""
+        preparation = "unchanged"
+        if self.PREPARE_IMAGES and image_prep.Image is not None:
+            preparation = f"{self.IMAGE_MAX_EDGE}/{self.IMAGE_QUALITY}"
+        key = f"{self.VISION_MODEL}\0{self.VISION_PROMPT}\0{preparation}\0{image_digest}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
 
+    def analyze_food_image(self, image_source: str) -> Tuple[bool, List[Dict], str]:
+        """
+        Analyze an image for food content and extract details.
+        
+        Successful analyses are cached by the SHA-256 of the image file, or
+        of the resolved URL, so scanning the same photo again needs neither
+        an upload nor an API call.
+        """
+        try:
+            image_url, cache_key = self._resolve_image(image_source)
+            cached = self._cached_analysis(cache_key)
+            if cached is not None:
+                return cached
+            
+            detail = "high"
+            if image_url is None:
+                image_url, detail = self.local_image_url(image_source)
+            
             # Get the response
             response = self.client.chat.completions.create(
-                model="grok-vision-beta",
-                messages=messages,
+                model=self.VISION_MODEL,
+                messages=self._vision_messages(image_url, detail),
                 temperature=0.01,
                 stream=False
             )
+            return self._parse_analysis(response.choices[0].message.content, cache_key)
+        
+        except Exception as e:
+            print(f"Error occurred: {str(e)}")
+            return False, [], str(e)
 
-            # Extract and parse the response
-            response_text = response.choices[0].message.content
-            try:
-                # Check if the response contains JSON (even within markdown code blocks)
-                if '{' in response_text and '}' in response_text:
-                    # Extract JSON part
-                    start = response_text.find('{')
-                    end = response_text.rfind('}') + 1
-                    json_text = response_text[start:end]
-                    
-                    # Parse JSON
-                    result = json.loads(json_text)
-                else:
-                    print("No valid JSON found in response")
-                    return False, [], response_text
-
-                contains_food = result.get("contains_food", False)
-                food_items = result.get("food_items", [])
-                description = result.get("description", "")
-
-                # Clean up food items
-                cleaned_items = []
-                for item in food_items:
-                    if isinstance(item, dict) and 'name' in item:
-                        # Ensure all required fields exist
-                        cleaned_item = {
-                            'name': item.get('name', '').strip(),
-                            'type': item.get('type', 'uncategorized').strip(),
-                            'brand': item.get('brand', '').strip(),
-                            'quantity': item.get('quantity', '').strip()
-                        }
-                        cleaned_items.append(cleaned_item)
-
-                # Print the results
-                print("\nFood Analysis Results:")
-                print("-" * 50)
-                print(f"Contains food items: {'Yes' if contains_food else 'No'}")
-                
-                if contains_food and cleaned_items:
-                    print(f"\nFound {len(cleaned_items)} items:")
-                    print("-" * 50)
-                    for item in cleaned_items:
-                        print(f"\nItem: {item['name']}")
-                        print(f"Type: {item['type']}")
-                        if item['brand'] and item['brand'].lower() != 'unknown':
-                            print(f"Brand: {item['brand']}")
-                        if item['quantity']:
-                            print(f"Quantity: {item['quantity']}")
-                
-                print("\nDetailed description:")
-                print("-" * 50)
-                print(description)
-                print("-" * 50)
+    def _resolve_image(self, image_source: str) -> Tuple[Optional[str], str]:
+        """
+        Resolve a URL to the image behind it and get the analysis cache key.
+        
+        Returns:
+            Tuple[Optional[str], str]: (image URL, None for a local file; cache key)
+        """
+        # Check if the source is a URL or local file
+        if self.is_url(image_source):
+            image_url = self.get_direct_image_url(image_source)
+            print(f"Using image URL: {image_url}")
+            image_digest = hashlib.sha256(image_url.encode("utf-8")).hexdigest()
+        else:
+            image_url = None
+            image_digest = self._file_digest(image_source)
+        return image_url, self._vision_cache_key(image_digest)
 
-                return contains_food, cleaned_items, description
+    def _cached_analysis(self, cache_key: str) -> Optional[Tuple[bool, List[Dict], str]]:
+        """Get and print a cached analysis, None if there is none."""
+        if self.vision_cache is None:
+            return None
+        cached = self.vision_cache.get(cache_key)
+        if cached is None:
+            return None
+        print("Using cached analysis of this image")
+        contains_food, cleaned_items, description = cached
+        self._print_analysis(contains_food, cleaned_items, description)
+        return contains_food, cleaned_items, description
 
-            except json.JSONDecodeError as e:
-                print(f"Error parsing JSON: {str(e)}")
-                print("Raw response:", response_text)
-                return False, [], response_text
-            except Exception as e:
-                print(f"Unexpected error: {str(e)}")
-                return False, [], str(e)
+    def _vision_messages(self, image_url: str, detail: str) -> List[Dict]:
+        """Build the vision request for an image."""
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": image_url,
+                            "detail": detail,
+                        },
+                    },
+                    {
+                        "type": "text",
+                        "text": self.VISION_PROMPT,
+                    },
+                ],
+            },
+        ]
 
+    def _parse_analysis(self, response_text: str, cache_key: str) -> Tuple[bool, List[Dict], str]:
+        """Parse, cache and print the vision model's reply."""
+        try:
+            # Check if the response contains JSON (even within markdown code blocks)
+            if '{' in response_text and '}' in response_text:
+                # Extract JSON part
+                start = response_text.find('{')
+                end = response_text.rfind('}') + 1
+                json_text = response_text[start:end]
+                
+                # Parse JSON
+                result = json.loads(json_text)
+            else:
+                print("No valid JSON found in response")
+                return False, [], response_text
+            
+            contains_food = result.get("contains_food", False)
+            food_items = result.get("food_items", [])
+            description = result.get("description", "")
+            
+            # Clean up food items
+            cleaned_items = []
+            for item in food_items:
+                if isinstance(item, dict) and 'name' in item:
+                    # Ensure all required fields exist
+                    cleaned_item = {
+                        'name': item.get('name', '').strip(),
+                        'type': item.get('type', 'uncategorized').strip(),
+                        'brand': item.get('brand', '').strip(),
+                        'quantity': item.get('quantity', '').strip()
+                    }
+                    cleaned_items.append(cleaned_item)
+            
+            if self.vision_cache is not None:
+                self.vision_cache.put(cache_key, [contains_food, cleaned_items, description])
+            
+            self._print_analysis(contains_food, cleaned_items, description)
+            return contains_food, cleaned_items, description
+        
+        except json.JSONDecodeError as e:
+            print(f"Error parsing JSON: {str(e)}")
+            print("Raw response:", response_text)
+            return False, [], response_text
         except Exception as e:
-            print(f"Error occurred: {str(e)}")
-            return False, [], str(e) 
\ No newline at end of file
+            print(f"Unexpected error: {str(e)}")
+            return False, [], str(e)
+
+    def _print_analysis(self, contains_food: bool, cleaned_items: List[Dict], description: str):
+        """Print the results of an image analysis."""
+        print("\nFood Analysis Results:")
+        print("-" * 50)
+        print(f"Contains food items: {'Yes' if contains_food else 'No'}")
+        
+        if contains_food and cleaned_items:
+            print(f"\nFound {len(cleaned_items)} items:")
+            print("-" * 50)
+            for item in cleaned_items:
+                print(f"\nItem: {item['name']}")
+                print(f"Type: {item['type']}")
+                if item['brand'] and item['brand'].lower() != 'unknown':
+                    print(f"Brand: {item['brand']}")
+                if item['quantity']:
+                    print(f"Quantity: {item['quantity']}")
+        
+        print("\nDetailed description:")
+        print("-" * 50)
+        print(description)
+        print("-" * 50)
@@ -0,0 +1,67 @@
+from typing import Dict, Tuple, Union
+import requests # type: ignore
+from requests.adapters import HTTPAdapter # type: ignore
+from urllib3.util.retry import Retry # type: ignore
+
+class _UploadSafeRetry(Retry):
+    """Retry that re-sends a POST only when it never reached the server or was refused with 429."""
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == "POST":
+            return status_code == 429 and status_code in (self.status_forcelist or ())
+        return super().is_retry(method, status_code, has_retry_after)
+
+class PooledSession(requests.Session):
+    # Responses worth retrying: rate limiting and overloaded or restarting servers
+    RETRY_STATUSES = (429, 502, 503, 504)
+
+    def __init__(self, pool_size: int = 10, timeout: Union[float, Tuple[float, float]] = (5, 30),
+                 retries: int = 3, backoff_factor: float = 0.5):
+        """
+        HTTP session that keeps connections alive and retries transient failures.
+        
+        Requests to the same host reuse pooled connections instead of
+        opening a new TCP and TLS connection each time. Every request gets
+        the default timeout unless it passes its own. Uploads are not
+        idempotent, so a POST is only retried after a connection error or
+        a 429; after a read timeout or a 5xx the server may already have
+        stored it.
+        
+        Args:
+            pool_size: Connections kept open per host
+            timeout: Seconds to wait, or a (connect, read) pair
+            retries: Attempts after a connection error or retryable status
+            backoff_factor: Base of the exponential delay between attempts
+        """
+        super().__init__()
+        self.timeout = timeout
+        retry = _UploadSafeRetry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+    def stats(self) -> Dict:
+        """Get how many requests were sent and how many connections that took."""
+        requests_sent = connections = 0
+        for adapter in set(self.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    requests_sent += pool.num_requests
+                    connections += pool.num_connections
+        return {
+            'requests': requests_sent,
+            'connections': connections,
+            'reuse_rate': 1 - connections / requests_sent if requests_sent else 0.0
+        }
@@ -0,0 +1,104 @@
+import io
+import mimetypes
+import os
+from typing import NamedTuple, Optional
+
+try:
+    from PIL import Image, ImageOps # type: ignore
+except ImportError:
+    Image = None
+
+# Longest edge and JPEG quality photos are re-encoded to before sending
+DEFAULT_MAX_EDGE = 1536
+DEFAULT_QUALITY = 85
+
+# Images that fit in one low-detail tile lose nothing at detail "low"
+LOW_DETAIL_MAX_EDGE = 512
+
+class PreparedImage(NamedTuple):
+    # Encoded bytes, or None when the file is to be sent as it is
+    data: Optional[bytes]
+    mime_type: str
+    width: Optional[int]
+    height: Optional[int]
+    detail: str
+    # Bytes that will be sent
+    size: int
+
+def choose_detail(width: Optional[int], height: Optional[int]) -> str:
+    """
+    Pick the vision detail level for an image of the given size.
+    
+    Args:
+        width: Width in pixels, None if unknown
+        height: Height in pixels, None if unknown
+    
+    Returns:
+        str: "low" for images small enough to be seen whole, otherwise "high"
+    """
+    if width is None or height is None:
+        return "high"
+    return "low" if max(width, height) <= LOW_DETAIL_MAX_EDGE else "high"
+
+def file_image(image_path: str, width: Optional[int] = None,
+               height: Optional[int] = None) -> PreparedImage:
+    """Describe an image file to be sent as it is, without reading it."""
+    mime_type = mimetypes.guess_type(image_path)[0]
+    if not mime_type or not mime_type.startswith("image/"):
+        mime_type = "image/jpeg"
+    return PreparedImage(None, mime_type, width, height, choose_detail(width, height),
+                         os.path.getsize(image_path))
+
+def prepare_image(image_path: str, max_edge: int = DEFAULT_MAX_EDGE,
+                  quality: int = DEFAULT_QUALITY) -> PreparedImage:
+    """
+    Shrink a photo for the vision API.
+    
+    The image is rotated upright, scaled down so its longest edge is at
+    most max_edge, and re-encoded as a JPEG without EXIF metadata. JPEGs
+    are decoded at reduced size where possible and the original file is
+    never read into memory, so memory use is bounded by max_edge rather
+    than by the photo. Files Pillow cannot decode, such as HEIC photos,
+    are sent as they are, as is every file when Pillow is not installed.
+    
+    Args:
+        image_path: Path to the image file
+        max_edge: Longest edge in pixels after scaling
+        quality: JPEG quality of the re-encoded image
+    
+    Returns:
+        PreparedImage: Encoded bytes, or None to send the file, MIME type,
+            size and detail level
+    """
+    if Image is None:
+        return file_image(image_path)
+    
+    try:
+        with Image.open(image_path) as image:
+            has_metadata = bool(image.info.get("exif")) or bool(image.getexif())
+            resized = max(image.size) > max_edge
+            if resized:
+                # Decode JPEGs at the smallest scale that still covers the
+                # target size; shrinking before rotating is the same, as
+                # the bounding box is square
+                scale = max_edge / max(image.size)
+                image.draft("RGB", (int(image.width * scale), int(image.height * scale)))
+                image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+            image = ImageOps.exif_transpose(image)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            width, height = image.size
+            
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=quality, optimize=True)
+            data = buffer.getvalue()
+    except OSError as e:
+        # UnidentifiedImageError and truncated files; the API may still read them
+        print(f"Warning: Could not shrink {image_path}, sending it unchanged: {str(e)}")
+        return file_image(image_path)
+    
+    # Re-encoding a small, clean image can only make it bigger
+    if not resized and not has_metadata and len(data) >= os.path.getsize(image_path):
+        return file_image(image_path, width, height)
+    
+    return PreparedImage(data, "image/jpeg", width, height, choose_detail(width, height), len(data))
@@ -1,7 +1,8 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable
 from .database import FoodDatabase
 from .categories import FoodCategories
 from .grok_api import GrokAPI
+from .completion_cache import has_json_object
 from .recipe_assistant import RecipeAssistant
 import json
 
@@ -11,6 +12,9 @@ class InventoryChat:
         self.db = db
         self.grok = grok
         self.recipe_assistant = recipe_assistant or RecipeAssistant(db)
+        # Inventory spelling by normalized name, loaded on the first add and
+        # kept up to date by this chat's adds; removals reload it
+        self._existing_names: Optional[Dict[str, str]] = None
         self.chat_prompt = """You are Gordon Ramsay managing a kitchen and helping with cooking.
 Be helpful while maintaining your signature style - passionate, direct, and encouraging.
 
@@ -60,6 +64,8 @@ Format your responses as JSON:
         """Handle adding items to inventory."""
         if not items:
             return False
+        
+        self._match_existing_names(items)
             
         # Validate categories
         valid_items = []
@@ -90,6 +96,7 @@ Format your responses as JSON:
         if valid_items:
             success = self.db.add_inventory_items(valid_items)
             if success:
+                self._remember_names(item['name'] for item in valid_items)
                 print("\nGordon: Beautiful! Added to inventory:")
                 for item in valid_items:
                     quantity = f" - {item['quantity']}" if item.get('quantity') else ""
@@ -101,6 +108,30 @@ Format your responses as JSON:
         
         return False
 
+    def _match_existing_names(self, items: List[Dict]):
+        """Offer the inventory's spelling for misspelled items it already has."""
+        if self._existing_names is None:
+            self._existing_names = {}
+            self._remember_names(existing['name'] for existing in self.db.get_inventory())
+        
+        for item in items:
+            existing = self._existing_names.get(FoodCategories.normalize_item_name(item['name'], fuzzy=True))
+            if existing and existing.lower() != item['name'].lower().strip():
+                print(f"\nGordon: '{item['name']}'? You've already got '{existing}' in there.")
+                if input(f"Add it as '{existing}'? (y/n): ").lower() == 'y':
+                    item['name'] = existing
+
+    def _remember_names(self, names: Iterable[str]):
+        """Add inventory names to the spellings offered for typos."""
+        if self._existing_names is None:
+            return
+        added = {}
+        for name in names:
+            normalized = FoodCategories.normalize_item_name(name)
+            if normalized not in self._existing_names:
+                self._existing_names[normalized] = added[normalized] = name
+        FoodCategories.add_known_items(added)
+
     def _handle_remove_items(self, items: List[Dict]) -> bool:
         """Handle removing items from inventory."""
         if not items:
@@ -151,6 +182,7 @@ Format your responses as JSON:
                 except ValueError:
                     print("Gordon: That's not a valid number!")
         
+        self._existing_names = None
         return True
 
     def _handle_recipe_request(self) -> bool:
@@ -162,23 +194,21 @@ Format your responses as JSON:
         
         print("\nGordon: Right then, let me see what we can make with what you've got...")
         
+        first_suggestion = True
         while True:
             # Generate the prompt for a single recipe
             prompt = self.recipe_assistant.generate_recipe_prompt(inventory)
             prompt = prompt.replace("suggest 3 different dishes", "suggest 1 dish")  # Modify for single recipe
             
             try:
-                # Get suggestion from Grok
+                # Get suggestion from Grok; the same inventory gets the same
+                # first suggestion, and asking for the next one gets a new one
                 messages = [{"role": "user", "content": prompt}]
-                response = self.grok.client.chat.completions.create(
-                    model="grok-beta",
-                    messages=messages,
-                    temperature=0.7,
-                    stream=False
+                response_text = self.grok.complete(
+                    messages, temperature=0.7, cache=first_suggestion,
+                    validate=lambda text: "error" not in self.recipe_assistant.suggest_recipes(text)
                 )
-                
-                # Parse the response
-                response_text = response.choices[0].message.content
+                first_suggestion = False
                 recipes_data = self.recipe_assistant.suggest_recipes(response_text)
                 
                 if "error" in recipes_data:
@@ -262,16 +292,12 @@ Format your responses as JSON:
                 # Process the input with Grok
                 prompt = f"{self.chat_prompt}\n\nUser message: {user_input}\n\nRespond as Gordon Ramsay."
                 
-                response = self.grok.client.chat.completions.create(
-                    model="grok-beta",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.7,
-                    stream=False
+                # Replies only interpret the message, so repeats can be cached
+                response_text = self.grok.complete(
+                    [{"role": "user", "content": prompt}], temperature=0.7, cache=True,
+                    validate=has_json_object
                 )
                 
-                # Parse the response
-                response_text = response.choices[0].message.content
-                
                 try:
                     # Extract JSON from response
                     start = response_text.find('{')
@@ -19,8 +19,7 @@ class InventoryManager:
             bool: Success status
         """
         # Get current item
-        inventory = self.db.get_inventory()
-        current_item = next((item for item in inventory if item['id'] == item_id), None)
+        current_item = self.db.get_inventory_item(item_id)
         
         if not current_item:
             print(f"Error: Item with ID {item_id} not found.")
@@ -86,8 +85,7 @@ class InventoryManager:
             bool: Success status
         """
         # Get current item
-        inventory = self.db.get_inventory()
-        item = next((item for item in inventory if item['id'] == item_id), None)
+        item = self.db.get_inventory_item(item_id)
         
         if not item:
             print(f"Error: Item with ID {item_id} not found.")
@@ -119,8 +117,7 @@ class InventoryManager:
 
     def print_item(self, item_id: int):
         """Print details of a specific item."""
-        inventory = self.db.get_inventory()
-        item = next((item for item in inventory if item['id'] == item_id), None)
+        item = self.db.get_inventory_item(item_id)
         
         if not item:
             print(f"Error: Item with ID {item_id} not found.")
@@ -151,21 +148,98 @@ class InventoryManager:
         Returns:
             List[Tuple[int, str, str]]: List of (item_id, current_category, suggested_category)
         """
-        inventory = self.db.get_inventory()
+        return [
+            (suggestion['id'], suggestion['current'], suggestion['suggested'])
+            for suggestion in self.get_category_suggestions()
+        ]
+
+    def get_category_suggestions(self, min_confidence: float = 0.0) -> List[Dict]:
+        """
+        Compute category suggestions for the whole inventory in one pass.
+        
+        Names nothing recognises come back as ('other', 0.0); those are left
+        out whatever min_confidence is, so categories set by hand are never
+        overwritten by a guess.
+        
+        Args:
+            min_confidence: Leave out suggestions scoring below this
+            
+        Returns:
+            List[Dict]: Suggestions with id, name, current, suggested and confidence
+        """
         suggestions = []
+        inventory = self.db.get_inventory()
+        suggested_categories = FoodCategories.categorize_many(
+            [item['name'] for item in inventory], with_confidence=True
+        )
         
-        for item in inventory:
-            suggested = FoodCategories.suggest_category(item['name'])
+        for item, (suggested, confidence) in zip(inventory, suggested_categories):
             current = item['type'] or 'uncategorized'
             
-            if suggested != current:
-                suggestions.append((item['id'], current, suggested))
+            if suggested != current and confidence > 0 and confidence >= min_confidence:
+                suggestions.append({
+                    'id': item['id'],
+                    'name': item['name'],
+                    'current': current,
+                    'suggested': suggested,
+                    'confidence': confidence
+                })
         
         return suggestions
 
-    def print_category_suggestions(self):
-        """Print suggested category changes for items."""
-        suggestions = self.suggest_category_changes()
+    def apply_category_changes(self, changes: Dict[int, str]) -> int:
+        """
+        Apply category changes in a single transaction.
+        
+        Changes to categories outside the taxonomy are skipped and listed.
+        
+        Args:
+            changes: New category keyed by item ID
+            
+        Returns:
+            int: Number of items updated
+        """
+        valid_changes = {}
+        rejected = {}
+        for item_id, category in changes.items():
+            if FoodCategories.is_valid_category(category):
+                valid_changes[item_id] = category
+            else:
+                rejected[item_id] = category
+        
+        if rejected:
+            items = self.db.get_inventory_items(rejected)
+            print(f"\nSkipped {len(rejected)} changes to unknown categories:")
+            for item_id, category in rejected.items():
+                name = items[item_id]['name'] if item_id in items else "unknown item"
+                print(f"- {name} (ID: {item_id}): '{category}'")
+        
+        return self.db.update_inventory_categories(valid_changes)
+
+    def recategorize_inventory(self, min_confidence: float = 0.0) -> int:
+        """
+        Apply every suggested category change without prompting.
+        
+        Args:
+            min_confidence: Only apply suggestions scoring at least this
+            
+        Returns:
+            int: Number of items updated
+        """
+        suggestions = self.get_category_suggestions(min_confidence)
+        return self.apply_category_changes({s['id']: s['suggested'] for s in suggestions})
+
+    def print_category_suggestions(self, accept_all: bool = False,
+                                   min_confidence: Optional[float] = None):
+        """
+        Print suggested category changes for items and apply the accepted ones.
+        
+        Args:
+            accept_all: Accept every suggestion without prompting
+            min_confidence: Accept suggestions scoring at least this without
+                            prompting and skip the rest
+        """
+        suggestions = self.get_category_suggestions()
         
         if not suggestions:
             print("\nNo category changes suggested.")
@@ -174,17 +248,30 @@ class InventoryManager:
         print("\nSuggested Category Changes:")
         print("-" * 50)
         
-        for item_id, current, suggested in suggestions:
-            inventory = self.db.get_inventory()
-            item = next((item for item in inventory if item['id'] == item_id), None)
-            if item:
-                print(f"\nItem: {item['name']}")
-                print(f"Current category: {current}")
-                print(f"Suggested category: {suggested}")
-                
-                if input("Apply this change? (y/n): ").lower() == 'y':
-                    success = self.edit_item(item_id, {'type': suggested})
-                    if success:
-                        print("Category updated.")
-                    else:
-                        print("Failed to update category.") 
\ No newline at end of file
+        accepted = {}
+        for suggestion in suggestions:
+            print(f"\nItem: {suggestion['name']}")
+            print(f"Current category: {suggestion['current']}")
+            print(f"Suggested category: {suggestion['suggested']} "
+                  f"(confidence {suggestion['confidence']:.0%})")
+            
+            if accept_all:
+                accept = True
+            elif min_confidence is not None:
+                accept = suggestion['confidence'] >= min_confidence
+                print("Accepted." if accept else "Skipped (low confidence).")
+            else:
+                accept = input("Apply this change? (y/n): ").lower() == 'y'
+            
+            if accept:
+                accepted[suggestion['id']] = suggestion['suggested']
+        
+        if not accepted:
+            print("\nNo changes applied.")
+            return
+        
+        updated = self.apply_category_changes(accepted)
+        if updated:
+            print(f"\nUpdated categories for {updated} items.")
+        elif any(FoodCategories.is_valid_category(category) for category in accepted.values()):
+            print("\nFailed to update categories.")
@@ -0,0 +1,98 @@
+import io
+import os
+import uuid
+from typing import Dict, Optional
+
+class MultipartBody:
+    def __init__(self, fields: Dict[str, str], file_field: str, file_path: str,
+                 file_data: Optional[bytes] = None,
+                 file_type: str = "application/octet-stream"):
+        """
+        multipart/form-data request body that streams its file part.
+        
+        The body is a read-only file object with a known length, so
+        requests sends it with a Content-Length header and reads the file
+        in small blocks while writing to the socket. Only the headers and
+        one block are in memory at a time, however large the file.
+        
+        Args:
+            fields: Form fields sent before the file
+            file_field: Form field name of the file
+            file_path: File to send; its name is used as the file name
+            file_data: Bytes to send instead of reading file_path, e.g. a
+                recompressed image
+            file_type: MIME type of the file
+        """
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        
+        head = io.BytesIO()
+        for name, value in fields.items():
+            head.write(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'
+                f'{value}\r\n'.encode('utf-8')
+            )
+        head.write(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+            f'filename="{os.path.basename(file_path)}"\r\nContent-Type: {file_type}\r\n\r\n'
+            .encode('utf-8')
+        )
+        tail = f'\r\n--{boundary}--\r\n'.encode('utf-8')
+        
+        if file_data is None:
+            file = open(file_path, 'rb')
+            file_size = os.fstat(file.fileno()).st_size
+        else:
+            file = io.BytesIO(file_data)
+            file_size = len(file_data)
+        
+        self._parts = [io.BytesIO(head.getvalue()), file, io.BytesIO(tail)]
+        self._sizes = [len(head.getvalue()), file_size, len(tail)]
+        self._index = 0
+        self._position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes of the body, or all that is left."""
+        chunks = []
+        while self._index < len(self._parts) and size != 0:
+            chunk = self._parts[self._index].read(size)
+            if not chunk:
+                self._index += 1
+                continue
+            chunks.append(chunk)
+            self._position += len(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b''.join(chunks)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to an offset from the start, e.g. to resend the body on a retry."""
+        if whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("can only seek from the start")
+        
+        self._position = offset
+        self._index = len(self._parts)
+        for index, (part, size) in enumerate(zip(self._parts, self._sizes)):
+            part.seek(min(max(offset, 0), size))
+            if 0 <= offset < size and self._index == len(self._parts):
+                self._index = index
+            offset -= size
+        return self._position
+
+    def __len__(self) -> int:
+        return sum(self._sizes)
+
+    def close(self):
+        """Close the file being sent."""
+        for part in self._parts:
+            part.close()
+        self._index = len(self._parts)
+
+    def __enter__(self) -> 'MultipartBody':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,120 @@
+import math
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+WORD_PATTERN = re.compile(r'\w+')
+
+class NgramClassifier:
+    def __init__(self, alpha: float = 1.0):
+        """
+        Multinomial naive Bayes over character trigrams and words.
+        
+        Training is incremental: partial_fit only touches the counts of the
+        features in the examples it is given. Per-feature log weights are
+        kept sparse, so a prediction costs one dictionary lookup per feature
+        plus one term per category. Training and prediction are thread-safe.
+        
+        Args:
+            alpha: Additive smoothing of feature counts
+        """
+        self.alpha = alpha
+        self.class_counts = {}
+        self.feature_totals = {}
+        # feature -> {category: count}
+        self.feature_counts = {}
+        # feature -> {category: log((count + alpha) / alpha)}
+        self.feature_weights = {}
+        self.examples = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def features(name: str) -> List[str]:
+        """Get the trigrams of the padded name and its words."""
+        padded = f' {name} '
+        features = [padded[i:i + 3] for i in range(len(padded) - 2)]
+        features.extend('w:' + word for word in WORD_PATTERN.findall(name))
+        return features
+
+    def partial_fit(self, name: str, category: str, count: int = 1):
+        """
+        Learn that a name belongs to a category.
+        
+        Args:
+            name: Normalized item name
+            category: Its category
+            count: Number of times the example was seen
+        """
+        if count <= 0:
+            return
+        
+        alpha = self.alpha
+        features = self.features(name)
+        with self._lock:
+            self.class_counts[category] = self.class_counts.get(category, 0) + count
+            self.feature_totals[category] = self.feature_totals.get(category, 0) + count * len(features)
+            self.examples += count
+            
+            for feature in features:
+                counts = self.feature_counts.setdefault(feature, {})
+                counts[category] = counts.get(category, 0) + count
+                self.feature_weights.setdefault(feature, {})[category] = math.log(
+                    (counts[category] + alpha) / alpha
+                )
+
+    def fit(self, examples: Iterable[Tuple[str, str]]):
+        """Learn from (name, category) pairs on top of what is already known."""
+        for name, category in examples:
+            self.partial_fit(name, category)
+
+    def predict(self, name: str) -> Optional[Tuple[str, float]]:
+        """
+        Predict the category of a name.
+        
+        Args:
+            name: Normalized item name
+        
+        Returns:
+            Optional[Tuple[str, float]]: (category, posterior probability), or
+            None until at least two categories have been seen
+        """
+        features = self.features(name)
+        with self._lock:
+            if len(self.class_counts) < 2:
+                return None
+            return self._score(features)
+
+    def _score(self, features: List[str]) -> Tuple[str, float]:
+        """Get the most probable category of the features and its posterior."""
+        alpha = self.alpha
+        vocabulary = len(self.feature_counts)
+        log_examples = math.log(self.examples)
+        
+        # Every feature scores log(alpha / (total + alpha * V)) in every
+        # category; seen features add their sparse weight on top of that
+        scores = {
+            category: math.log(count) - log_examples + len(features) * math.log(
+                alpha / (self.feature_totals[category] + alpha * vocabulary)
+            )
+            for category, count in self.class_counts.items()
+        }
+        feature_weights = self.feature_weights
+        for feature in features:
+            weights = feature_weights.get(feature)
+            if weights:
+                for category, weight in weights.items():
+                    scores[category] += weight
+        
+        best = max(scores, key=scores.get)
+        top = scores[best]
+        total = sum(math.exp(score - top) for score in scores.values())
+        return best, 1.0 / total
+
+    def stats(self) -> Dict:
+        """Get the size of the model."""
+        with self._lock:
+            return {
+                'examples': self.examples,
+                'categories': len(self.class_counts),
+                'features': len(self.feature_counts)
+            }
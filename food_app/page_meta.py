@@ -0,0 +1,52 @@
+import html
+import re
+from typing import Dict, Optional
+
+META_TAG_PATTERN = re.compile(r'<meta\b[^>]*>', re.IGNORECASE)
+ATTRIBUTE_PATTERN = re.compile(r'''([\w:.-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''')
+HEAD_END_PATTERN = re.compile(rb'</head\s*>|<body[\s>]', re.IGNORECASE)
+
+def read_head(response, max_bytes: int = 256 * 1024, chunk_size: int = 8192) -> str:
+    """
+    Read a streamed HTML response up to the end of its <head>.
+    
+    Args:
+        response: requests response opened with stream=True
+        max_bytes: Stop reading after this many bytes even without a </head>
+        chunk_size: Bytes read at a time
+    
+    Returns:
+        str: The start of the page, decoded
+    """
+    data = bytearray()
+    for chunk in response.iter_content(chunk_size):
+        # Look a little before the new chunk in case the tag spans two chunks
+        start = max(0, len(data) - 16)
+        data.extend(chunk)
+        if HEAD_END_PATTERN.search(data, start) or len(data) >= max_bytes:
+            break
+    return data.decode(response.encoding or 'utf-8', errors='replace')
+
+def find_meta_content(page: str, name: str) -> Optional[str]:
+    """
+    Find the content of a <meta> tag by its property or name attribute.
+    
+    Args:
+        page: HTML to search
+        name: Property to look for, e.g. "og:image"
+    
+    Returns:
+        Optional[str]: The unescaped content, None if no tag has it
+    """
+    for tag in META_TAG_PATTERN.finditer(page):
+        attributes = _attributes(tag.group())
+        if name in (attributes.get('property'), attributes.get('name')) and attributes.get('content'):
+            return html.unescape(attributes['content'])
+    return None
+
+def _attributes(tag: str) -> Dict[str, str]:
+    """Get the attributes of a tag, keyed by lowercase name."""
+    return {
+        match.group(1).lower(): next(value for value in match.groups()[1:] if value is not None)
+        for match in ATTRIBUTE_PATTERN.finditer(tag)
+    }
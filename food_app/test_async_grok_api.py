@@ -0,0 +1,129 @@
+import unittest
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from types import SimpleNamespace
+from food_app.grok_api import GrokAPI
+from food_app.async_grok_api import AsyncGrokAPI
+
+ANALYSIS = json.dumps({
+    "contains_food": True,
+    "food_items": [{"name": "milk", "type": "beverage", "brand": "", "quantity": "1 l"}],
+    "description": "A carton of milk"
+})
+
+class FakeAsyncOpenAI:
+    """Stands in for AsyncOpenAI, recording how many calls overlap."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.cancelled = 0
+        self.hold = None
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.hold is not None:
+                await self.hold.wait()
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        message = SimpleNamespace(content=ANALYSIS)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def close(self):
+        pass
+
+class TestAsyncGrokAPI(unittest.TestCase):
+    def setUp(self):
+        """Set up a client with its caches in a temporary file."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.grok = GrokAPI(api_key="test", cache_path=os.path.join(self.tmp_dir, "cache.db"))
+        self.fake = FakeAsyncOpenAI()
+
+    def tearDown(self):
+        """Remove the cache file."""
+        shutil.rmtree(self.tmp_dir)
+
+    def run_with(self, max_concurrency: int, scenario):
+        """Run scenario(api) on a fresh event loop, quietly."""
+        async def run():
+            api = AsyncGrokAPI(self.grok, max_concurrency=max_concurrency)
+            api.async_client = self.fake
+            try:
+                return await scenario(api)
+            finally:
+                await api.aclose()
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            return asyncio.run(run())
+
+    def test_semaphore_limits_requests_in_flight(self):
+        """Test that no more than max_concurrency calls overlap."""
+        urls = [f"https://example.com/photo{i}.jpg" for i in range(12)]
+        
+        async def scenario(api):
+            return await asyncio.gather(
+                api.analyze_many(urls), *(api.chat(f"message {i}") for i in range(6))
+            )
+        
+        results = self.run_with(3, scenario)
+        self.assertEqual(len(results[0]), 12)
+        self.assertTrue(all(result[0] for result in results[0]))
+        self.assertEqual((self.fake.calls, self.fake.peak), (18, 3))
+
+    def test_cancelling_releases_the_slot(self):
+        """Test that a cancelled call stops its request and frees its slot."""
+        self.fake.hold = asyncio.Event()
+        
+        async def scenario(api):
+            scan = asyncio.ensure_future(api.analyze_food_image("https://example.com/stuck.jpg"))
+            while not self.fake.in_flight:
+                await asyncio.sleep(0)
+            scan.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await scan
+            
+            self.fake.hold = None
+            return await asyncio.wait_for(api.chat("Still there?"), timeout=1)
+        
+        self.assertEqual(self.run_with(1, scenario), ANALYSIS)
+        self.assertEqual((self.fake.cancelled, self.fake.in_flight), (1, 0))
+
+    def test_identical_images_share_one_request(self):
+        """Test that concurrent scans of one image send one request."""
+        url = "https://example.com/fridge.jpg"
+        
+        async def scenario(api):
+            # One impatient caller leaving must not cancel the request for the rest
+            impatient = asyncio.ensure_future(api.analyze_food_image(url))
+            results = asyncio.ensure_future(api.analyze_many([url] * 5))
+            while not self.fake.in_flight:
+                await asyncio.sleep(0)
+            impatient.cancel()
+            results = await results
+            again = await api.analyze_food_image(url)
+            return results, again
+        
+        results, again = self.run_with(4, scenario)
+        self.assertEqual(self.fake.calls, 1)
+        self.assertEqual(self.fake.cancelled, 0)
+        self.assertEqual(results, [results[0]] * 5)
+        self.assertEqual(results[0][1][0]['name'], "milk")
+        self.assertEqual(again, results[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,456 @@
+import unittest
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+from unittest import mock
+from food_app.categories import FoodCategories, _user_cache_dir
+from food_app.ngram_classifier import NgramClassifier
+
+def legacy_suggest_category(item_name: str) -> str:
+    """The keyword classifier as it was before rules were compiled."""
+    normalized_name = FoodCategories.normalize_item_name(item_name)
+    item_lower = normalized_name
+    
+    # Check learning history first
+    if normalized_name in FoodCategories.CATEGORY_LEARNING:
+        categories = FoodCategories.CATEGORY_LEARNING[normalized_name]
+        if categories:
+            # Return most commonly used category
+            return max(categories.items(), key=lambda x: x[1])[0]
+    
+    # Check for herbs
+    herb_keywords = ['basil', 'oregano', 'thyme', 'rosemary', 'mint', 'cilantro', 
+                    'parsley', 'sage', 'dill', 'chives', 'herb', 'herbs']
+    if any(keyword in item_lower for keyword in herb_keywords):
+        if 'dried' in item_lower or 'ground' in item_lower:
+            return 'dried_herbs'
+        if 'fresh' in item_lower or not any(word in item_lower for word in ['dried', 'ground', 'powdered']):
+            return 'fresh_herbs'
+        return 'dried_herbs'
+    
+    # Check for fruits
+    fruit_keywords = ['apple', 'banana', 'orange', 'berry', 'berries', 'melon', 'fruit',
+                     'grape', 'citrus', 'pear', 'peach', 'plum', 'mango', 'pineapple']
+    if any(keyword in item_lower for keyword in fruit_keywords):
+        if 'frozen' in item_lower:
+            return 'frozen_produce'
+        return 'fresh_fruits'
+    
+    # Check for vegetables
+    vegetable_keywords = ['lettuce', 'spinach', 'kale', 'carrot', 'potato', 'onion',
+                        'garlic', 'tomato', 'cucumber', 'pepper', 'broccoli', 'vegetable',
+                        'cauliflower', 'celery', 'asparagus', 'zucchini', 'eggplant',
+                        'mushroom', 'corn', 'peas', 'beans', 'greens']
+    if any(keyword in item_lower for keyword in vegetable_keywords):
+        if 'frozen' in item_lower:
+            return 'frozen_produce'
+        return 'fresh_vegetables'
+    
+    # Check for frozen items
+    if 'frozen' in item_lower:
+        if any(word in item_lower for word in ['chicken', 'beef', 'pork', 'meat']):
+            return 'frozen_meat'
+        if any(word in item_lower for word in ['fish', 'seafood', 'shrimp']):
+            return 'frozen_seafood'
+        if 'pizza' in item_lower or 'dinner' in item_lower or 'meal' in item_lower:
+            return 'frozen_meals'
+        if any(word in item_lower for word in ['ice cream', 'dessert']):
+            return 'frozen_dessert'
+        return 'frozen_meals'
+    
+    # Check for fresh items
+    if 'fresh' in item_lower:
+        if any(word in item_lower for word in ['meat', 'chicken', 'beef', 'pork', 'lamb']):
+            return 'fresh_meat'
+        if any(word in item_lower for word in ['fish', 'seafood', 'shrimp', 'salmon']):
+            return 'fresh_seafood'
+        if any(word in item_lower for word in ['milk', 'cheese', 'dairy']):
+            return 'fresh_dairy'
+    
+    # Check exact matches
+    if item_lower in FoodCategories.COMMON_ITEMS:
+        return FoodCategories.COMMON_ITEMS[item_lower]
+    
+    # Check if item name contains any common item keywords
+    for common_item, category in FoodCategories.COMMON_ITEMS.items():
+        if common_item in item_lower:
+            return category
+    
+    # Additional meat keywords
+    meat_keywords = ['meat', 'chicken', 'beef', 'pork', 'lamb', 'steak', 'roast', 'chop', 'ground']
+    if any(keyword in item_lower for keyword in meat_keywords):
+        return 'fresh_meat'
+    
+    # Default to 'other' if no match found
+    return 'other'
+
+def legacy_normalize_item_name(item_name: str) -> str:
+    """Variation lookup as it was before the reverse index."""
+    item_lower = item_name.lower().strip()
+    for base_item, variations in FoodCategories.ITEM_VARIATIONS.items():
+        if item_lower == base_item or item_lower in variations:
+            return base_item
+    if item_lower.endswith('s') and item_lower[:-1] in FoodCategories.COMMON_ITEMS:
+        return item_lower[:-1]
+    return item_lower
+
+def legacy_get_similar_items(item_name: str) -> set:
+    """Similar-item lookup as it was before the reverse index."""
+    normalized_name = legacy_normalize_item_name(item_name)
+    similar_items = []
+    for base_item, variations in FoodCategories.ITEM_VARIATIONS.items():
+        if normalized_name == base_item or normalized_name in variations:
+            similar_items.extend([base_item] + variations)
+    if normalized_name.endswith('s'):
+        similar_items.append(normalized_name[:-1])
+    else:
+        similar_items.append(normalized_name + 's')
+    return set(similar_items)
+
+def generate_names(count: int, seed: int = 1234) -> list:
+    """Generate item names mixing rule keywords, common items and noise."""
+    rng = random.Random(seed)
+    words = set(FoodCategories.COMMON_ITEMS)
+    for groups, excluded, _ in FoodCategories.KEYWORD_RULES + FoodCategories.FALLBACK_RULES:
+        words.update(excluded)
+        for group in groups:
+            words.update(group)
+    for base, variations in FoodCategories.ITEM_VARIATIONS.items():
+        words.add(base)
+        words.update(variations)
+    words = sorted(words)
+    noise = ['organic', 'box', 'of', 'large', 'mixed', 'x', 'bag', 'powdered',
+             'sliced', 'pack', 'ground', 'dinner', 'meal', 'spiced', 'pea', 'ice']
+    
+    names = []
+    for _ in range(count):
+        parts = [rng.choice(words if rng.random() < 0.6 else noise)
+                 for _ in range(rng.randint(1, 4))]
+        separator = rng.choice([' ', ' ', '', '-'])
+        name = separator.join(parts)
+        if rng.random() < 0.3:
+            # Cut words apart to produce partial and overlapping keywords
+            start = rng.randint(0, len(name) // 2)
+            name = name[start:start + rng.randint(3, 20)]
+        if rng.random() < 0.3:
+            name = name.title()
+        if rng.random() < 0.2:
+            name += 's'
+        names.append(name)
+    return names
+
+class TestFoodCategories(unittest.TestCase):
+    def setUp(self):
+        """Start every test without learned categories."""
+        self.saved_learning = FoodCategories.CATEGORY_LEARNING
+        self.saved_model = FoodCategories._model
+        FoodCategories.CATEGORY_LEARNING = {}
+        FoodCategories._model = NgramClassifier()
+    
+    def tearDown(self):
+        """Restore learned categories."""
+        FoodCategories.CATEGORY_LEARNING = self.saved_learning
+        FoodCategories._model = self.saved_model
+    
+    def test_compiled_classifier_matches_legacy_rules(self):
+        """Test the compiled classifier against the original keyword scans."""
+        names = generate_names(50000)
+        names += list(FoodCategories.COMMON_ITEMS)
+        
+        def expected(name):
+            legacy = legacy_suggest_category(name)
+            if legacy == 'other':
+                # Names no rule matches may be classified as a close spelling
+                return FoodCategories._fallback_suggestion(FoodCategories.normalize_item_name(name))[0]
+            return legacy
+        
+        mismatches = [
+            (name, FoodCategories.suggest_category(name), expected(name))
+            for name in names
+            if FoodCategories.suggest_category(name) != expected(name)
+        ]
+        self.assertEqual(mismatches[:10], [])
+    
+    def test_variation_index_matches_legacy_lookup(self):
+        """Test normalization and similar items against the linear scans."""
+        names = generate_names(5000)
+        for variations in FoodCategories.ITEM_VARIATIONS.values():
+            names += [v.upper() for v in variations]
+        
+        for name in names:
+            exact = FoodCategories.normalize_item_name(name, fuzzy=False)
+            self.assertEqual(exact, legacy_normalize_item_name(name))
+            if FoodCategories.normalize_item_name(name, fuzzy=True) == exact:
+                self.assertEqual(set(FoodCategories.get_similar_items(name)), legacy_get_similar_items(name))
+    
+    def test_indexes_follow_table_changes(self):
+        """Test that lookups are rebuilt when the item tables change."""
+        saved_variations = FoodCategories.ITEM_VARIATIONS
+        saved_items = FoodCategories.COMMON_ITEMS
+        try:
+            FoodCategories.ITEM_VARIATIONS = {k: list(v) for k, v in saved_variations.items()}
+            FoodCategories.COMMON_ITEMS = dict(saved_items)
+            
+            self.assertEqual(FoodCategories.normalize_item_name("Sweet Basil"), "basil")
+            FoodCategories.add_item_variations("basil", ["genovese basil"])
+            self.assertEqual(FoodCategories.normalize_item_name("Genovese Basil"), "basil")
+            self.assertIn("genovese basil", FoodCategories.get_similar_items("thai basil"))
+            
+            FoodCategories.ITEM_VARIATIONS['leek'] = ['leeks', 'baby leek']
+            self.assertEqual(FoodCategories.normalize_item_name("baby leek"), "leek")
+            
+            self.assertEqual(FoodCategories.suggest_category("Quinoa"), "other")
+            FoodCategories.add_common_item("quinoa", "grain")
+            self.assertEqual(FoodCategories.suggest_category("Quinoa"), "grain")
+            self.assertEqual(FoodCategories.suggest_category("red quinoa"), "grain")
+        finally:
+            FoodCategories.ITEM_VARIATIONS = saved_variations
+            FoodCategories.COMMON_ITEMS = saved_items
+        
+        self.assertEqual(FoodCategories.suggest_category("Quinoa"), "other")
+    
+    def test_learned_category_wins(self):
+        """Test that learned categories take priority over rules."""
+        self.assertEqual(FoodCategories.suggest_category("Widget"), "other")
+        FoodCategories.learn_category("Widget", "snack")
+        FoodCategories.learn_category("Widget", "snack")
+        FoodCategories.learn_category("Widget", "sweets")
+        
+        category, confidence = FoodCategories.suggest_category_with_confidence("widget")
+        self.assertEqual(category, "snack")
+        self.assertAlmostEqual(confidence, 2 / 3)
+    
+    def test_suggestion_cache_invalidates_learned_items_only(self):
+        """Test that learning drops only the cached suggestion it changes."""
+        FoodCategories.suggest_category("Widget")
+        FoodCategories.suggest_category("Gadget")
+        self.assertIn("widget", FoodCategories._suggestion_cache)
+        
+        hits = FoodCategories.suggestion_cache_stats()['hits']
+        FoodCategories.suggest_category("  WIDGET ")
+        self.assertEqual(FoodCategories.suggestion_cache_stats()['hits'], hits + 1)
+        
+        FoodCategories.learn_category("widget", "snack")
+        self.assertNotIn("widget", FoodCategories._suggestion_cache)
+        self.assertIn("gadget", FoodCategories._suggestion_cache)
+        self.assertEqual(FoodCategories.suggest_category("Widget"), "snack")
+    
+    def test_categorize_many_matches_single_suggestions(self):
+        """Test that batch categorization keeps input order and results."""
+        FoodCategories.learn_category("Widget", "snack")
+        names = generate_names(3000) + ["Widget", "  WIDGET ", "Milk", "milk"]
+        names += names[:500]
+        
+        expected = [FoodCategories.suggest_category_with_confidence(name) for name in names]
+        self.assertEqual(FoodCategories.categorize_many(names, with_confidence=True), expected)
+        self.assertEqual(FoodCategories.categorize_many(names), [c for c, _ in expected])
+        self.assertEqual(FoodCategories.categorize_many([]), [])
+    
+    def test_categorize_many_with_processes(self):
+        """Test that normalizing and classifying in worker processes gives the same results."""
+        names = generate_names(2000, seed=99)
+        for variations in FoodCategories.ITEM_VARIATIONS.values():
+            names += [v.upper() for v in variations]
+        names += [name + 's' for name in FoodCategories.COMMON_ITEMS]
+        FoodCategories.learn_category("Gadget Widget", "snack")
+        names.append("gadget widget ")
+        
+        saved_chunk_size = FoodCategories.CATEGORIZE_CHUNK_SIZE
+        try:
+            FoodCategories.CATEGORIZE_CHUNK_SIZE = 500
+            parallel = FoodCategories.categorize_many(names, with_confidence=True, processes=2)
+        finally:
+            FoodCategories.CATEGORIZE_CHUNK_SIZE = saved_chunk_size
+        self.assertEqual(parallel, FoodCategories.categorize_many(names, with_confidence=True))
+        self.assertEqual(parallel[-1], ('snack', 1.0))
+    
+    def test_normalize_resolves_typos(self):
+        """Test that misspelled names resolve to known names."""
+        self.assertEqual(FoodCategories.normalize_item_name("Tomatos"), "tomato")
+        self.assertEqual(FoodCategories.normalize_item_name("brocoli", fuzzy=True), "broccoli")
+        self.assertEqual(FoodCategories.normalize_item_name("brocoli"), "brocoli")
+        
+        # A new misspelling is classified as its closest name, less confidently
+        category, confidence = FoodCategories.suggest_category_with_confidence("brocoli")
+        self.assertEqual(category, "fresh_vegetables")
+        self.assertLess(confidence, FoodCategories.suggest_category_with_confidence("broccoli")[1])
+        self.assertEqual(FoodCategories.categorize_many(["brocoli"], with_confidence=True),
+                         [(category, confidence)])
+        
+        saved_known = FoodCategories.KNOWN_ITEMS
+        try:
+            FoodCategories.KNOWN_ITEMS = set()
+            self.assertEqual(FoodCategories.normalize_item_name("Gochujnag", fuzzy=True), "gochujnag")
+            FoodCategories.add_known_items(["Gochujang"])
+            self.assertEqual(FoodCategories.normalize_item_name("Gochujnag", fuzzy=True), "gochujang")
+        finally:
+            FoodCategories.KNOWN_ITEMS = saved_known
+            FoodCategories._tables_version += 1
+    
+    def test_learning_a_near_miss_word_keeps_its_neighbour(self):
+        """Test that learning "paste" is not stored under, or read back for, "pasta"."""
+        pasta = FoodCategories.suggest_category("pasta")
+        FoodCategories.learn_category("paste", "condiment")
+        
+        self.assertEqual(FoodCategories.suggest_category("paste"), "condiment")
+        self.assertEqual(FoodCategories.suggest_category("pasta"), pasta)
+        self.assertNotIn("pasta", FoodCategories.CATEGORY_LEARNING)
+    
+    def test_model_covers_names_rules_miss(self):
+        """Test that the local model answers when no rule matches."""
+        self.assertEqual(FoodCategories.suggest_category_with_confidence("gochujang"), ('other', 0.0))
+        
+        used = FoodCategories.train_model([
+            ("doenjang", "condiment"), ("ssamjang", "condiment"), ("gochugaru", "condiment"),
+            ("mochi", "sweets"), ("daifuku", "sweets"), ("taiyaki", "sweets"),
+            ("unknown thing", "other"), ("bad", "not_a_category")
+        ])
+        self.assertEqual(used, 6)
+        
+        category, confidence = FoodCategories.suggest_category_with_confidence("gochujang")
+        self.assertEqual(category, "condiment")
+        self.assertGreaterEqual(confidence, FoodCategories.MODEL_MIN_CONFIDENCE)
+        self.assertEqual(FoodCategories.categorize_many(["gochujang", "milk"]), ["condiment", "fresh_dairy"])
+        
+        # Learning retrains the model incrementally
+        FoodCategories.learn_category("mochi ice cream", "frozen_dessert")
+        FoodCategories.learn_category("mochi ice cream", "frozen_dessert")
+        self.assertEqual(FoodCategories._model.stats()['examples'], 8)
+    
+    def test_concurrent_learning_loses_no_counts(self):
+        """Test learning and suggesting from many threads at once."""
+        names = [f"test gadget {i}" for i in range(20)]
+        threads = 8
+        rounds = 10
+        barrier = threading.Barrier(threads)
+        errors = []
+        
+        def worker(seed):
+            try:
+                rng = random.Random(seed)
+                # Everyone learns 'snack' first, then outvotes it with
+                # 'beverage', so stale cached suggestions would show
+                for category, repeats in (('snack', 1), ('beverage', 2)):
+                    for _ in range(rounds * repeats):
+                        for name in rng.sample(names, len(names)):
+                            FoodCategories.learn_category(name, category)
+                            FoodCategories.suggest_category(rng.choice(names))
+                    barrier.wait()
+            except Exception as e:
+                errors.append(e)
+        
+        saved_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+        try:
+            workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+        finally:
+            sys.setswitchinterval(saved_interval)
+        
+        self.assertEqual(errors, [])
+        for name in names:
+            self.assertEqual(FoodCategories.CATEGORY_LEARNING[name],
+                             {'snack': threads * rounds, 'beverage': 2 * threads * rounds})
+            self.assertEqual(FoodCategories.suggest_category(name), 'beverage')
+        
+        async def learn_async():
+            await asyncio.gather(*(
+                FoodCategories.learn_category_async("test gadget async", "snack") for _ in range(10)
+            ))
+            return await FoodCategories.suggest_category_async("test gadget async")
+        
+        self.assertEqual(asyncio.run(learn_async()), ('snack', 1.0))
+        self.assertEqual(FoodCategories.CATEGORY_LEARNING["test gadget async"], {'snack': 10})
+
+class TestTaxonomy(unittest.TestCase):
+    def setUp(self):
+        """Load taxonomies from a scratch directory."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.saved_cache_dir = FoodCategories.TAXONOMY_CACHE_DIR
+        FoodCategories.TAXONOMY_CACHE_DIR = os.path.join(self.tmp_dir, 'cache')
+        self.path = os.path.join(self.tmp_dir, 'taxonomy.json')
+        with open(FoodCategories.TAXONOMY_FILE) as f:
+            self.data = json.load(f)
+    
+    def tearDown(self):
+        """Restore the shipped taxonomy."""
+        FoodCategories.TAXONOMY_CACHE_DIR = self.saved_cache_dir
+        FoodCategories.load_taxonomy()
+        shutil.rmtree(self.tmp_dir)
+    
+    def write_taxonomy(self):
+        """Save the test taxonomy data."""
+        with open(self.path, 'w') as f:
+            json.dump(self.data, f)
+    
+    def test_compiled_taxonomy_is_cached(self):
+        """Test that a second load reuses the pickled lookups."""
+        self.data['common_items']['yuzu'] = 'fresh_fruits'
+        self.write_taxonomy()
+        self.assertTrue(FoodCategories.load_taxonomy(self.path))
+        self.assertEqual(len(os.listdir(FoodCategories.TAXONOMY_CACHE_DIR)), 1)
+        self.assertEqual(FoodCategories.suggest_category("yuzu"), "fresh_fruits")
+        
+        classifier = FoodCategories._classifier
+        self.assertTrue(FoodCategories.load_taxonomy(self.path))
+        self.assertIsNot(FoodCategories._classifier, classifier)
+        self.assertEqual(FoodCategories.suggest_category("yuzu"), "fresh_fruits")
+        self.assertEqual(FoodCategories.normalize_item_name("yuzzu", fuzzy=True), "yuzu")
+    
+    def test_taxonomy_reloads_when_file_changes(self):
+        """Test that an edited data file is picked up and the cache replaced."""
+        self.write_taxonomy()
+        FoodCategories.load_taxonomy(self.path)
+        self.assertEqual(FoodCategories.suggest_category("yuzu"), "other")
+        
+        self.data['common_items']['yuzu'] = 'fresh_fruits'
+        self.write_taxonomy()
+        FoodCategories._taxonomy_checked = 0.0
+        self.assertEqual(FoodCategories.suggest_category("yuzu"), "fresh_fruits")
+        self.assertEqual(len(os.listdir(FoodCategories.TAXONOMY_CACHE_DIR)), 1)
+    
+    def test_unreadable_taxonomy_keeps_current_tables(self):
+        """Test that a broken data file is reported and ignored."""
+        with open(self.path, 'w') as f:
+            f.write('{"categories": ')
+        self.assertFalse(FoodCategories.load_taxonomy(self.path))
+        self.assertFalse(FoodCategories.load_taxonomy(os.path.join(self.tmp_dir, 'missing.json')))
+        self.assertEqual(FoodCategories.suggest_category("milk"), "fresh_dairy")
+
+    def test_failed_cache_write_leaves_no_temp_file(self):
+        """Test that a cache that can't be written is reported and cleaned up."""
+        self.write_taxonomy()
+        output = io.StringIO()
+        with mock.patch('food_app.categories.pickle.dump', side_effect=OSError("No space left on device")), \
+                contextlib.redirect_stdout(output):
+            self.assertTrue(FoodCategories.load_taxonomy(self.path))
+        self.assertIn("Could not cache compiled taxonomy", output.getvalue())
+        self.assertEqual(os.listdir(FoodCategories.TAXONOMY_CACHE_DIR), [])
+        self.assertEqual(FoodCategories.suggest_category("milk"), "fresh_dairy")
+
+    def test_cache_is_optional_and_outside_the_package(self):
+        """Test that the cache lives in the user cache directory and can be turned off."""
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': self.tmp_dir}):
+            if os.name != 'nt':
+                self.assertEqual(_user_cache_dir(), os.path.join(self.tmp_dir, 'food_app'))
+        package_dir = os.path.dirname(os.path.dirname(FoodCategories.TAXONOMY_FILE))
+        self.assertFalse(self.saved_cache_dir.startswith(package_dir + os.sep))
+        
+        FoodCategories.TAXONOMY_CACHE_DIR = None
+        self.write_taxonomy()
+        self.assertTrue(FoodCategories.load_taxonomy(self.path))
+        self.assertEqual(os.listdir(self.tmp_dir), ['taxonomy.json'])
+        self.assertEqual(FoodCategories.suggest_category("milk"), "fresh_dairy")
+
+if __name__ == '__main__':
+    unittest.main()
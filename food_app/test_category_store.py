@@ -0,0 +1,72 @@
+import unittest
+import os
+import time
+from food_app.database import FoodDatabase
+from food_app.categories import FoodCategories
+from food_app.category_store import CategoryLearningStore
+from food_app.ngram_classifier import NgramClassifier
+
+class TestCategoryLearningStore(unittest.TestCase):
+    def setUp(self):
+        """Set up a test database and a clean learning table."""
+        self.test_db = "test_category_store.db"
+        self.db = FoodDatabase(self.test_db)
+        self.learning = FoodCategories.CATEGORY_LEARNING
+        self.model = FoodCategories._model
+        FoodCategories.CATEGORY_LEARNING = {}
+        FoodCategories._model = NgramClassifier()
+        
+    def tearDown(self):
+        """Detach the store, restore learned categories and clean up the test database."""
+        FoodCategories.attach_learning_store(None)
+        FoodCategories.CATEGORY_LEARNING = self.learning
+        FoodCategories._model = self.model
+        self.db.close()
+        for path in (self.test_db, self.test_db + "-wal", self.test_db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def test_record_is_buffered_until_flush(self):
+        """Test that recording does not write until the store flushes."""
+        store = CategoryLearningStore(self.db, flush_interval=60)
+        store.record("basil", "fresh_herbs")
+        store.record("basil", "fresh_herbs")
+        
+        self.assertEqual(store.pending_count(), 1)
+        self.assertEqual(self.db.get_category_learning(), {})
+        
+        store.close()
+        self.assertEqual(store.pending_count(), 0)
+        self.assertEqual(self.db.get_category_learning(), {"basil": {"fresh_herbs": 2}})
+    
+    def test_max_pending_triggers_background_flush(self):
+        """Test that a full buffer is flushed without waiting for the interval."""
+        store = CategoryLearningStore(self.db, flush_interval=60, max_pending=3)
+        self.addCleanup(store.close)
+        for name in ("basil", "mint", "sage"):
+            store.record(name, "fresh_herbs")
+        
+        deadline = time.monotonic() + 5
+        while len(self.db.get_category_learning()) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.db.get_category_learning()), 3)
+    
+    def test_learned_categories_survive_restart(self):
+        """Test that learned categories are reloaded from the database."""
+        store = CategoryLearningStore(self.db, flush_interval=60)
+        FoodCategories.attach_learning_store(store)
+        FoodCategories.learn_category("Oat Milk", "beverage")
+        FoodCategories.learn_category("Oat Milk", "beverage")
+        FoodCategories.attach_learning_store(None)
+        store.close()
+        
+        # A fresh process starts with an empty table and a new store
+        FoodCategories.CATEGORY_LEARNING = {}
+        store = CategoryLearningStore(self.db, flush_interval=60)
+        FoodCategories.attach_learning_store(store)
+        self.assertEqual(FoodCategories.suggest_category("oat milk"), "beverage")
+        self.assertEqual(FoodCategories.CATEGORY_LEARNING["oat milk"], {"beverage": 2})
+        store.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+from food_app.disk_cache import DiskCache
+from food_app.completion_cache import CompletionCache, has_json_object
+
+class TestCompletionCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a completion cache in a temporary file."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.disk_cache = DiskCache(os.path.join(self.tmp_dir, "cache.db"), namespace="completions")
+        self.cache = CompletionCache(self.disk_cache, max_temperature=0.3)
+        self.calls = 0
+
+    def tearDown(self):
+        """Remove the cache file."""
+        self.disk_cache.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def create(self) -> str:
+        self.calls += 1
+        return f"reply {self.calls}"
+
+    def test_policy_follows_temperature_unless_overridden(self):
+        """Test that only low-temperature or opted-in calls are cached."""
+        messages = [{"role": "user", "content": "What can I cook?"}]
+        self.assertEqual(self.cache.complete(self.create, "grok-beta", messages, 0.0), "reply 1")
+        self.assertEqual(self.cache.complete(self.create, "grok-beta", messages, 0.0), "reply 1")
+        
+        self.assertEqual(self.cache.complete(self.create, "grok-beta", messages, 0.7), "reply 2")
+        self.assertEqual(self.cache.complete(self.create, "grok-beta", messages, 0.7), "reply 3")
+        self.assertEqual(self.cache.complete(self.create, "grok-beta", messages, 0.7, cache=True), "reply 4")
+        self.assertEqual(self.cache.complete(self.create, "grok-beta", messages, 0.7, cache=True), "reply 4")
+        self.assertEqual(self.cache.complete(self.create, "grok-beta", messages, 0.0, cache=False), "reply 5")
+        
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['bypassed']), (2, 2, 3))
+
+    def test_key_covers_model_messages_and_temperature(self):
+        """Test that any change to the request misses the cache."""
+        messages = [{"role": "user", "content": "Add milk"}]
+        key = CompletionCache.key("grok-beta", messages, 0.0)
+        self.assertEqual(key, CompletionCache.key("grok-beta", [{"content": "Add milk", "role": "user"}], 0.0))
+        self.assertNotEqual(key, CompletionCache.key("grok-2", messages, 0.0))
+        self.assertNotEqual(key, CompletionCache.key("grok-beta", messages, 0.1))
+        self.assertNotEqual(key, CompletionCache.key("grok-beta", [{"role": "user", "content": "Add eggs"}], 0.0))
+
+    def test_invalid_completions_are_not_cached(self):
+        """Test that a completion failing validation is asked for again."""
+        messages = [{"role": "user", "content": "Recipe ideas?"}]
+        replies = iter(["not json", '{"recipes": []}'])
+        is_json = lambda text: text.startswith('{')
+        for expected in ("not json", '{"recipes": []}', '{"recipes": []}'):
+            text = self.cache.complete(lambda: next(replies), "grok-beta", messages, 0.0, validate=is_json)
+            self.assertEqual(text, expected)
+
+    def test_async_completions_share_the_cache(self):
+        """Test the coroutine path caches and bypasses like the blocking one."""
+        messages = [{"role": "user", "content": "Add milk"}]
+        
+        async def create():
+            await asyncio.sleep(0)
+            return self.create()
+        
+        async def run():
+            first = await self.cache.complete_async(create, "grok-beta", messages, 0.7, cache=True,
+                                                    validate=has_json_object)
+            second = await self.cache.complete_async(create, "grok-beta", messages, 0.7)
+            return first, second
+        
+        self.assertEqual(asyncio.run(run()), ("reply 1", "reply 2"))
+        self.create = lambda: '{"intent": "add"} Right!'
+        self.assertEqual(asyncio.run(run()), ('{"intent": "add"} Right!', '{"intent": "add"} Right!'))
+        self.assertEqual(self.cache.complete(self.create, "grok-beta", messages, 0.7, cache=True),
+                         '{"intent": "add"} Right!')
+        self.assertEqual(self.cache.stats()['bypassed'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
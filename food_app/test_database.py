@@ -1,6 +1,8 @@
 import unittest
-from database import FoodDatabase
+from database import FoodDatabase, ConnectionPool
 import os
+import sqlite3
+import threading
 
 class TestFoodDatabase(unittest.TestCase):
     def setUp(self):
@@ -10,8 +12,10 @@ class TestFoodDatabase(unittest.TestCase):
         
     def tearDown(self):
         """Clean up test database."""
-        if os.path.exists(self.test_db):
-            os.remove(self.test_db)
+        self.db.close()
+        for path in (self.test_db, self.test_db + "-wal", self.test_db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
     
     def test_add_inventory_items(self):
         """Test adding items to inventory."""
@@ -48,6 +52,40 @@ class TestFoodDatabase(unittest.TestCase):
         self.assertEqual(first_item['quantity_number'], 2)
         self.assertEqual(first_item['unit'], "cans")
     
+    def test_import_inventory_items(self):
+        """Test bulk import with per-row error reporting."""
+        items = [{"name": f"Item {i}", "type": "other", "quantity": f"{i} kg"} for i in range(10)]
+        items[3] = {"type": "other"}
+        items[6] = "not an item"
+        items[8] = {"name": "Bad Quantity", "quantity": {"amount": 1}}
+        
+        result = self.db.import_inventory_items(items, chunk_size=4)
+        self.assertEqual(result['added'], 7)
+        self.assertEqual(sorted(error['index'] for error in result['errors']), [3, 6, 8])
+        
+        inventory = self.db.get_inventory()
+        self.assertEqual(len(inventory), 7)
+        item = next(item for item in inventory if item['name'] == "Item 5")
+        self.assertEqual(item['quantity_number'], 5)
+        self.assertEqual(item['unit'], "kg")
+        
+        # Imported rows are searchable even though the trigger was paused
+        self.assertEqual(len(self.db.search_inventory("item")), 7)
+        self.assertEqual(len(self.db.search_inventory("bad")), 0)
+    
+    def test_get_inventory_items_by_id(self):
+        """Test single and batched primary-key lookups."""
+        self.db.add_inventory_items([{"name": f"Item {i}", "type": "other"} for i in range(3)])
+        ids = [item['id'] for item in self.db.get_inventory()]
+        
+        item = self.db.get_inventory_item(ids[1])
+        self.assertEqual(item['name'], "Item 1")
+        self.assertIsNone(self.db.get_inventory_item(9999))
+        
+        items = self.db.get_inventory_items([ids[2], ids[0], 9999, ids[0]])
+        self.assertEqual(set(items), {ids[0], ids[2]})
+        self.assertEqual(items[ids[2]]['name'], "Item 2")
+    
     def test_search_inventory(self):
         """Test searching inventory items."""
         # Add test items
@@ -66,6 +104,49 @@ class TestFoodDatabase(unittest.TestCase):
         results = self.db.search_inventory("Test Brand")
         self.assertEqual(len(results), 3)
     
+    def test_search_inventory_ranking(self):
+        """Test prefix, multi-term and ranked inventory search."""
+        items = [
+            {"name": "Dairy Milk", "type": "sweets", "brand": "Cadbury"},
+            {"name": "Milk", "type": "fresh_dairy", "brand": "Arla"},
+            {"name": "Chocolate Digestives", "type": "sweets", "brand": "McVitie's"}
+        ]
+        self.db.add_inventory_items(items)
+        
+        # Prefix and multi-term queries
+        results = self.db.search_inventory("choc dig")
+        self.assertEqual([r['name'] for r in results], ["Chocolate Digestives"])
+        
+        # Category matches rank below name matches
+        results = self.db.search_inventory("dairy")
+        self.assertEqual([r['name'] for r in results], ["Dairy Milk", "Milk"])
+        
+        results = self.db.search_inventory("sweets", limit=1)
+        self.assertEqual(len(results), 1)
+        
+        # The search index follows updates and deletes
+        milk = self.db.search_inventory("arla")[0]
+        self.db.update_inventory_item(milk['id'], {"name": "Oat Drink"})
+        self.assertEqual([r['name'] for r in self.db.search_inventory("oat")], ["Oat Drink"])
+        self.db.delete_inventory_item(milk['id'])
+        self.assertEqual(self.db.search_inventory("oat"), [])
+    
+    def test_limited_search_ranks_bounded_candidates(self):
+        """Test that a limited search ranks only the first matches, and short terms match whole words."""
+        self.db.add_inventory_items([
+            {"name": "Milk", "type": "fresh_dairy"},
+            {"name": "Dairy Milk", "type": "sweets"},
+            {"name": "7 Up", "type": "beverage"}
+        ])
+        self.assertEqual(self.db.search_inventory("dairy", limit=1)[0]['name'], "Dairy Milk")
+        
+        self.db.SEARCH_CANDIDATES = 1
+        self.assertEqual(self.db.search_inventory("dairy", limit=1)[0]['name'], "Milk")
+        self.assertEqual(len(self.db.search_inventory("dairy")), 2)
+        
+        self.assertEqual([r['name'] for r in self.db.search_inventory("7")], ["7 Up"])
+        self.assertEqual(self.db.search_inventory("d"), [])
+    
     def test_update_inventory_item(self):
         """Test updating inventory items."""
         # Add test item
@@ -90,6 +171,17 @@ class TestFoodDatabase(unittest.TestCase):
         self.assertEqual(updated_item['name'], "Updated Item")
         self.assertEqual(updated_item['quantity'], "2 pieces")
     
+    def test_update_inventory_categories(self):
+        """Test updating several categories in one call."""
+        self.db.add_inventory_items([{"name": f"Item {i}", "type": "other"} for i in range(3)])
+        ids = [item['id'] for item in self.db.get_inventory()]
+        
+        updated = self.db.update_inventory_categories({ids[0]: "snack", ids[2]: "sweets", 9999: "nuts"})
+        self.assertEqual(updated, 2)
+        
+        types = [item['type'] for item in self.db.get_inventory()]
+        self.assertEqual(types, ["snack", "other", "sweets"])
+    
     def test_delete_inventory_item(self):
         """Test deleting inventory items."""
         # Add test item
@@ -108,5 +200,159 @@ class TestFoodDatabase(unittest.TestCase):
         inventory = self.db.get_inventory()
         self.assertEqual(len(inventory), 0)
 
+    def test_get_saved_recipes(self):
+        """Test loading saved recipes with and without details."""
+        for name in ("Pasta Bake", "Apple Pie"):
+            self.db.save_recipe({
+                "name": name,
+                "difficulty": "Easy",
+                "have_ingredients": [f"{name} base"],
+                "need_ingredients": ["salt", "pepper"],
+                "instructions": ["Cook it"],
+                "chef_tips": ["Season it properly!"]
+            })
+        
+        recipes = self.db.get_saved_recipes()
+        self.assertEqual([r['name'] for r in recipes], ["Apple Pie", "Pasta Bake"])
+        self.assertEqual(
+            [i['name'] for i in recipes[0]['ingredients']],
+            ["Apple Pie base", "salt", "pepper"]
+        )
+        self.assertEqual(recipes[1]['instructions'], ["Cook it"])
+        
+        summaries = self.db.get_saved_recipes(summary_only=True)
+        self.assertEqual([r['name'] for r in summaries], ["Apple Pie", "Pasta Bake"])
+        self.assertNotIn('ingredients', summaries[0])
+        self.assertNotIn('instructions', summaries[0])
+        
+        recipe = self.db.get_saved_recipe(summaries[1]['id'])
+        self.assertEqual(recipe['chef_tips'], ["Season it properly!"])
+        self.assertEqual(len(recipe['ingredients']), 3)
+        self.assertIsNone(self.db.get_saved_recipe(9999))
+
+    def test_migrations_skip_current_schema(self):
+        """Test that reopening an up-to-date database runs no DDL."""
+        self.assertEqual(self.db.schema_version(), len(FoodDatabase.MIGRATIONS))
+        self.db.close()
+        
+        statements = []
+        original_connect = ConnectionPool._connect
+        
+        def traced_connect(pool):
+            conn = original_connect(pool)
+            conn.set_trace_callback(statements.append)
+            return conn
+        
+        ConnectionPool._connect = traced_connect
+        try:
+            self.db = FoodDatabase(self.test_db)
+        finally:
+            ConnectionPool._connect = original_connect
+        
+        self.assertEqual(statements, ['PRAGMA user_version'])
+    
+    def test_migrations_upgrade_unversioned_database(self):
+        """Test upgrading a database created before versioned migrations."""
+        self.db.close()
+        os.remove(self.test_db)
+        
+        conn = sqlite3.connect(self.test_db)
+        conn.execute('''
+            CREATE TABLE inventory (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                type TEXT,
+                brand TEXT,
+                quantity TEXT,
+                quantity_number REAL,
+                unit TEXT,
+                expiry_date TEXT,
+                added_date TEXT NOT NULL,
+                last_updated TEXT NOT NULL
+            )
+        ''')
+        conn.execute('''
+            INSERT INTO inventory (name, type, brand, added_date, last_updated)
+            VALUES ('Basmati Rice', 'grain', 'Tilda', '2024-01-01', '2024-01-01')
+        ''')
+        conn.commit()
+        conn.close()
+        
+        self.db = FoodDatabase(self.test_db)
+        self.assertEqual(self.db.schema_version(), len(FoodDatabase.MIGRATIONS))
+        
+        # Existing rows are kept and indexed for search
+        results = self.db.search_inventory("basmati")
+        self.assertEqual([r['name'] for r in results], ["Basmati Rice"])
+
+    def test_connection_pool_reuses_connections(self):
+        """Test that repeated calls share one connection per thread."""
+        self.db.add_inventory_items([{"name": "Milk", "type": "fresh_dairy"}])
+        self.db.get_inventory()
+        self.db.get_inventory()
+        
+        stats = self.db.pool_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['open_connections'], 1)
+        self.assertGreaterEqual(stats['hits'], 3)
+        
+        # Another thread gets its own connection, closed when the thread exits
+        results = []
+        
+        def read_inventory():
+            results.append(self.db.get_inventory())
+            results.append(self.db.pool_stats()['open_connections'])
+        
+        worker = threading.Thread(target=read_inventory)
+        worker.start()
+        worker.join()
+        self.assertEqual(len(results[0]), 1)
+        self.assertEqual(results[1], 2)
+        self.assertEqual(self.db.pool_stats()['open_connections'], 1)
+        
+        # WAL journaling is enabled on file databases
+        mode = self.db.get_connection().execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(mode, 'wal')
+    
+    def test_exited_threads_release_connections(self):
+        """Test that a thread per request doesn't leave a connection per thread open."""
+        self.db.get_inventory()
+        for _ in range(20):
+            worker = threading.Thread(target=self.db.get_inventory)
+            worker.start()
+            worker.join()
+        
+        stats = self.db.pool_stats()
+        self.assertEqual(stats['misses'], 21)
+        self.assertEqual(stats['open_connections'], 1)
+        
+        # close_all() and a thread exiting afterwards don't close a connection twice
+        self.db.close()
+        self.assertEqual(self.db.pool_stats()['open_connections'], 0)
+        self.assertEqual(self.db.get_inventory(), [])
+    
+    def test_close_releases_connections(self):
+        """Test that closing the database closes pooled connections."""
+        self.db.get_inventory()
+        self.db.close()
+        self.assertEqual(self.db.pool_stats()['open_connections'], 0)
+        
+        # The database is still usable after close and reconnects lazily
+        self.assertEqual(self.db.get_inventory(), [])
+    
+    def test_category_counts_accumulate(self):
+        """Test that stored category counts add up across writes."""
+        self.assertEqual(self.db.get_category_learning(), {})
+        
+        self.assertTrue(self.db.add_category_counts({
+            ("basil", "fresh_herbs"): 2,
+            ("basil", "dried_herbs"): 1,
+        }))
+        self.assertTrue(self.db.add_category_counts({("basil", "fresh_herbs"): 3}))
+        
+        self.assertEqual(self.db.get_category_learning(), {
+            "basil": {"fresh_herbs": 5, "dried_herbs": 1}
+        })
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
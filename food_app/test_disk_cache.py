@@ -0,0 +1,81 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from food_app.disk_cache import DiskCache
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        """Use a fresh cache file for every test."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "cache.db")
+        self.caches = []
+
+    def tearDown(self):
+        """Close the caches and remove the cache file."""
+        for cache in self.caches:
+            cache.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def open_cache(self, **kwargs) -> DiskCache:
+        cache = DiskCache(self.path, **kwargs)
+        self.caches.append(cache)
+        return cache
+
+    def test_values_persist_per_namespace(self):
+        """Test that entries survive reopening and namespaces don't mix."""
+        cache = self.open_cache(namespace="vision")
+        self.assertTrue(cache.put("photo", [True, [{"name": "milk"}], "a carton"]))
+        cache.close()
+        
+        reopened = self.open_cache(namespace="vision")
+        other = self.open_cache(namespace="completions")
+        self.assertEqual(reopened.get("photo"), [True, [{"name": "milk"}], "a carton"])
+        self.assertIsNone(other.get("photo"))
+        
+        self.assertTrue(reopened.pop("photo"))
+        self.assertFalse(reopened.pop("photo"))
+        self.assertEqual(reopened.get("photo", "missing"), "missing")
+
+    def test_entries_expire(self):
+        """Test the default and per-entry time to live."""
+        cache = self.open_cache(ttl=0.05)
+        cache.put("short", 1)
+        cache.put("forever", 2, ttl=None)
+        time.sleep(0.1)
+        
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get("forever"), 2)
+        stats = cache.stats()
+        self.assertEqual(stats['expirations'], 1)
+        self.assertEqual(stats['size'], 1)
+
+    def test_evicts_least_recently_used_over_max_bytes(self):
+        """Test that reading an entry protects it from size-based eviction."""
+        value = "x" * 98  # 100 bytes of JSON
+        cache = self.open_cache(max_bytes=250)
+        cache.put("milk", value)
+        time.sleep(0.01)
+        cache.put("eggs", value)
+        time.sleep(0.01)
+        self.assertEqual(cache.get("milk"), value)
+        time.sleep(0.01)
+        cache.put("onion", value)
+        
+        self.assertEqual(cache.get("milk"), value)
+        self.assertIsNone(cache.get("eggs"))
+        self.assertFalse(cache.put("huge", "x" * 300))
+        self.assertEqual(cache.stats(), {
+            'hits': 2,
+            'misses': 1,
+            'evictions': 1,
+            'expirations': 0,
+            'size': 2,
+            'size_bytes': 200,
+            'max_bytes': 250,
+            'hit_rate': 2 / 3
+        })
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from food_app.fuzzy_index import FuzzyIndex, edit_distance
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self):
+        """Index a few item names."""
+        self.index = FuzzyIndex()
+        for name in ["tomato", "tomatoes", "broccoli", "cucumber", "milk"]:
+            self.index.add(name, "tomato" if name.startswith("tomato") else name)
+    
+    def test_edit_distance(self):
+        """Test edits, adjacent swaps and the early cut-off."""
+        self.assertEqual(edit_distance("brocoli", "broccoli", 2), 1)
+        self.assertEqual(edit_distance("cucmuber", "cucumber", 2), 1)
+        self.assertEqual(edit_distance("kitten", "sitting", 5), 3)
+        self.assertEqual(edit_distance("kitten", "sitting", 1), 2)
+        self.assertEqual(edit_distance("", "milk", 9), 4)
+    
+    def test_lookup_tolerates_one_typo(self):
+        """Test that single typos resolve and everything else does not."""
+        self.assertEqual(self.index.lookup("tomatos"), "tomato")
+        self.assertEqual(self.index.lookup("brocoli"), "broccoli")
+        self.assertEqual(self.index.lookup("cucmuber"), "cucumber")
+        self.assertEqual(self.index.lookup("milkk"), "milk")
+        
+        self.assertIsNone(self.index.lookup("brocolli"))
+        self.assertIsNone(self.index.lookup("mlk"))
+        self.assertIsNone(self.index.lookup("onion"))
+        self.assertEqual(self.index.get("milk"), "milk")
+        self.assertEqual(len(self.index), 5)
+
+if __name__ == '__main__':
+    unittest.main()
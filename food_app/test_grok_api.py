@@ -0,0 +1,54 @@
+import unittest
+import base64
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+from food_app.grok_api import GrokAPI
+
+class TestLocalImageUrl(unittest.TestCase):
+    def setUp(self):
+        """Write a file Pillow can't decode, so it is sent as it is."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "photo.heic")
+        self.data = b"\x00\x00\x00\x18ftypheic" + os.urandom(4000)
+        with open(self.path, "wb") as f:
+            f.write(self.data)
+        self.grok = GrokAPI(api_key="test", cache_path=None)
+        self.grok.imgbb_api_key = None
+        self.uploads = []
+        self.grok.upload_image = self.upload_image
+
+    def tearDown(self):
+        """Remove the test file."""
+        self.grok.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def upload_image(self, image_path: str, image_bytes=None) -> str:
+        """Record an upload instead of sending it."""
+        self.uploads.append((image_path, image_bytes))
+        return "https://i.ibb.co/x.heic"
+
+    def local_image_url(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.grok.local_image_url(self.path)
+
+    def test_small_image_is_inlined(self):
+        """Test that an image under the cap is sent as a data URL."""
+        url, detail = self.local_image_url()
+        self.assertEqual(url, "data:image/heic;base64," + base64.b64encode(self.data).decode())
+        self.assertEqual(detail, "high")
+
+    def test_large_image_needs_imgbb(self):
+        """Test that the inline cap holds without an ImgBB key, and the file is streamed with one."""
+        self.grok.INLINE_IMAGE_MAX_BYTES = 1024
+        with self.assertRaises(ValueError):
+            self.local_image_url()
+        
+        self.grok.imgbb_api_key = "key"
+        self.assertEqual(self.local_image_url(), ("https://i.ibb.co/x.heic", "high"))
+        self.assertEqual(self.uploads, [(self.path, None)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from food_app.http_session import PooledSession
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    failures = 0
+    failure_status = 503
+
+    def do_GET(self):
+        self.respond(b"ok")
+
+    def do_POST(self):
+        self.respond(self.rfile.read(int(self.headers["Content-Length"])))
+
+    def respond(self, body: bytes):
+        if FlakyHandler.failures:
+            FlakyHandler.failures -= 1
+            self.reply(FlakyHandler.failure_status, b"busy")
+        else:
+            self.reply(200, body)
+
+    def reply(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestPooledSession(unittest.TestCase):
+    def setUp(self):
+        """Start a local keep-alive HTTP server."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.session = PooledSession(pool_size=2, timeout=(1, 5), backoff_factor=0)
+
+    def tearDown(self):
+        """Stop the server and close the session."""
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+        FlakyHandler.failures = 0
+        FlakyHandler.failure_status = 503
+
+    def test_batch_reuses_connections(self):
+        """Test that 100 requests share one kept-alive connection."""
+        for _ in range(100):
+            self.assertEqual(self.session.get(self.url).text, "ok")
+        
+        stats = self.session.stats()
+        self.assertEqual(stats['requests'], 100)
+        self.assertEqual(stats['connections'], 1)
+        self.assertAlmostEqual(stats['reuse_rate'], 0.99)
+
+    def test_retries_transient_errors(self):
+        """Test that a busy server is retried."""
+        FlakyHandler.failures = 2
+        self.assertEqual(self.session.get(self.url).text, "ok")
+        self.assertEqual(self.session.stats()['requests'], 3)
+
+    def test_uploads_are_only_retried_when_refused(self):
+        """Test that a POST the server may have processed is not sent twice."""
+        FlakyHandler.failures = 1
+        self.assertEqual(self.session.post(self.url, data=b"photo").status_code, 503)
+        self.assertEqual(self.session.stats()['requests'], 1)
+        
+        # 429 means the server turned the upload away, so retry it with the same body
+        FlakyHandler.failures, FlakyHandler.failure_status = 2, 429
+        response = self.session.post(self.url, data=b"photo")
+        self.assertEqual((response.status_code, response.content), (200, b"photo"))
+        self.assertEqual(self.session.stats()['requests'], 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+from food_app import image_prep
+from food_app.image_prep import choose_detail, prepare_image
+
+class TestImagePrep(unittest.TestCase):
+    def setUp(self):
+        """Create a scratch directory for test images."""
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the test images."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_choose_detail(self):
+        """Test that only images seen whole at low detail get it."""
+        self.assertEqual(choose_detail(512, 384), "low")
+        self.assertEqual(choose_detail(1536, 1152), "high")
+        self.assertEqual(choose_detail(None, None), "high")
+
+    def test_without_pillow_sends_file_unchanged(self):
+        """Test the fallback when Pillow is not installed."""
+        path = os.path.join(self.tmp_dir, "photo.png")
+        with open(path, "wb") as f:
+            f.write(b"not really a png")
+        
+        saved_image = image_prep.Image
+        image_prep.Image = None
+        try:
+            image = prepare_image(path)
+        finally:
+            image_prep.Image = saved_image
+        
+        self.assertEqual(image, (None, "image/png", None, None, "high", len(b"not really a png")))
+
+    def test_undecodable_file_is_sent_unchanged(self):
+        """Test that a format Pillow can't read, like HEIC, doesn't fail the scan."""
+        path = os.path.join(self.tmp_dir, "photo.heic")
+        with open(path, "wb") as f:
+            f.write(b"\x00\x00\x00\x18ftypheic" + os.urandom(100))
+        
+        image = prepare_image(path)
+        self.assertIsNone(image.data)
+        self.assertEqual((image.mime_type, image.detail, image.size), ("image/heic", "high", 112))
+
+    @unittest.skipIf(image_prep.Image is None, "Pillow is not installed")
+    def test_photo_is_downscaled_upright_without_exif(self):
+        """Test resizing, EXIF orientation and stripping, and detail choice."""
+        Image = image_prep.Image
+        path = os.path.join(self.tmp_dir, "photo.jpg")
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotated 90 degrees
+        exif[0x010F] = "Phone maker"
+        Image.new("RGB", (4000, 3000), (200, 120, 40)).save(path, quality=95, exif=exif)
+        
+        image = prepare_image(path, max_edge=1536, quality=80)
+        self.assertEqual((image.width, image.height), (1152, 1536))
+        self.assertEqual((image.mime_type, image.detail), ("image/jpeg", "high"))
+        self.assertLess(len(image.data), os.path.getsize(path))
+        with Image.open(io.BytesIO(image.data)) as decoded:
+            self.assertEqual(decoded.size, (1152, 1536))
+            self.assertEqual(len(decoded.getexif()), 0)
+        
+        small = prepare_image(path, max_edge=400)
+        self.assertEqual((small.width, small.height), (300, 400))
+        self.assertEqual(small.detail, "low")
+
+if __name__ == '__main__':
+    unittest.main()
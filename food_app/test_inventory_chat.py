@@ -0,0 +1,46 @@
+import unittest
+import contextlib
+import io
+import os
+from unittest import mock
+from food_app.database import FoodDatabase
+from food_app.categories import FoodCategories
+from food_app.inventory_chat import InventoryChat
+
+class TestInventoryChat(unittest.TestCase):
+    def setUp(self):
+        """Set up a chat over a test database, without a Grok client."""
+        self.saved_known = FoodCategories.KNOWN_ITEMS
+        FoodCategories.KNOWN_ITEMS = set()
+        self.test_db = "test_inventory_chat.db"
+        self.db = FoodDatabase(self.test_db)
+        self.db.add_inventory_items([{"name": "Gochujang", "type": "condiment"}])
+        self.chat = InventoryChat(self.db, grok=None)
+
+    def tearDown(self):
+        """Clean up test database and known names."""
+        FoodCategories.KNOWN_ITEMS = self.saved_known
+        FoodCategories._tables_version += 1
+        self.db.close()
+        for path in (self.test_db, self.test_db + "-wal", self.test_db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def add(self, name: str):
+        """Add an item through the chat, accepting any suggested spelling."""
+        with mock.patch('builtins.input', return_value='y'), contextlib.redirect_stdout(io.StringIO()):
+            self.chat._handle_add_items([{"name": name, "type": "condiment"}])
+
+    def test_typos_match_names_without_reloading_inventory(self):
+        """Test that adds keep the known spellings current instead of rereading the inventory."""
+        with mock.patch.object(self.db, 'get_inventory', wraps=self.db.get_inventory) as get_inventory:
+            self.add("Gochujnag")
+            self.add("Doenjang")
+            self.add("Doenjnag")
+            self.assertEqual(get_inventory.call_count, 1)
+        
+        names = sorted(item['name'] for item in self.db.get_inventory())
+        self.assertEqual(names, ["Doenjang", "Doenjang", "Gochujang", "Gochujang"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import contextlib
+import io
+import os
+from food_app.database import FoodDatabase
+from food_app.inventory_manager import InventoryManager
+from food_app.categories import FoodCategories
+from food_app.ngram_classifier import NgramClassifier
+
+# Categories set by hand for names no rule recognises
+HAND_SET = {"Doritos": "snack", "Gochujang": "condiment"}
+
+class TestInventoryManager(unittest.TestCase):
+    def setUp(self):
+        """Set up a test database with miscategorized and hand-categorized items."""
+        self.saved_learning = FoodCategories.CATEGORY_LEARNING
+        self.saved_model = FoodCategories._model
+        FoodCategories.CATEGORY_LEARNING = {}
+        FoodCategories._model = NgramClassifier()
+        
+        self.test_db = "test_inventory_manager.db"
+        self.db = FoodDatabase(self.test_db)
+        self.db.add_inventory_items([
+            {"name": "Milk", "type": "other", "quantity": "1 l"},
+            {"name": "Basil", "type": "other", "quantity": "1 bunch"},
+            {"name": "Chicken Breast", "type": "other", "quantity": "500 g"}
+        ] + [{"name": name, "type": category} for name, category in HAND_SET.items()])
+        self.items = {item['name']: item['id'] for item in self.db.get_inventory()}
+        self.manager = InventoryManager(self.db)
+
+    def tearDown(self):
+        """Clean up test database and restore learned categories."""
+        FoodCategories.CATEGORY_LEARNING = self.saved_learning
+        FoodCategories._model = self.saved_model
+        self.db.close()
+        for path in (self.test_db, self.test_db + "-wal", self.test_db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def categories(self) -> dict:
+        """Get every item's category by name."""
+        return {item['name']: item['type'] for item in self.db.get_inventory()}
+
+    def test_recategorize_keeps_categories_set_by_hand(self):
+        """Test that unrecognised names are not reset to 'other'."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(self.manager.recategorize_inventory(), 3)
+        self.assertEqual(self.categories(), {
+            "Milk": "fresh_dairy", "Basil": "fresh_herbs", "Chicken Breast": "fresh_meat", **HAND_SET
+        })
+        self.assertEqual(self.manager.get_category_suggestions(), [])
+
+    def test_accept_all_keeps_categories_set_by_hand(self):
+        """Test that accepting every suggestion leaves unrecognised names alone."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.manager.print_category_suggestions(accept_all=True)
+        self.assertEqual(self.categories(), {
+            "Milk": "fresh_dairy", "Basil": "fresh_herbs", "Chicken Breast": "fresh_meat", **HAND_SET
+        })
+
+    def test_threshold_only_applies_confident_suggestions(self):
+        """Test that suggestions below min_confidence are skipped."""
+        basil = FoodCategories.suggest_category_with_confidence("Basil")[1]
+        milk = FoodCategories.suggest_category_with_confidence("Milk")[1]
+        self.assertLess(basil, milk)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.manager.print_category_suggestions(min_confidence=milk)
+        self.assertEqual(self.categories(), {
+            "Milk": "fresh_dairy", "Basil": "other", "Chicken Breast": "fresh_meat", **HAND_SET
+        })
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(self.manager.recategorize_inventory(min_confidence=0.0), 1)
+        self.assertEqual(self.categories()["Basil"], "fresh_herbs")
+
+    def test_rejected_category_changes_are_reported(self):
+        """Test that changes to unknown categories are listed, not silently dropped."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            updated = self.manager.apply_category_changes({
+                self.items["Milk"]: "fresh_dairy",
+                self.items["Basil"]: "herbz"
+            })
+        
+        self.assertEqual(updated, 1)
+        self.assertIn("Skipped 1 changes to unknown categories", output.getvalue())
+        self.assertIn(f"Basil (ID: {self.items['Basil']}): 'herbz'", output.getvalue())
+        self.assertEqual(self.categories()["Milk"], "fresh_dairy")
+        self.assertEqual(self.categories()["Basil"], "other")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from food_app.lru_cache import LRUCache
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        """Test that reading an entry protects it from eviction."""
+        cache = LRUCache(max_size=2)
+        cache.put("milk", "dairy")
+        cache.put("eggs", "dairy")
+        self.assertEqual(cache.get("milk"), "dairy")
+        cache.put("onion", "vegetables")
+        
+        self.assertIn("milk", cache)
+        self.assertNotIn("eggs", cache)
+        self.assertEqual(len(cache), 2)
+    
+    def test_stats_and_pop(self):
+        """Test hit/miss counters and single-entry invalidation."""
+        cache = LRUCache(max_size=1)
+        self.assertIsNone(cache.get("milk"))
+        cache.put("milk", "dairy")
+        cache.get("milk")
+        cache.put("eggs", "dairy")
+        
+        self.assertTrue(cache.pop("eggs"))
+        self.assertFalse(cache.pop("eggs"))
+        self.assertEqual(cache.stats(), {
+            'hits': 1,
+            'misses': 1,
+            'evictions': 1,
+            'size': 0,
+            'max_size': 1,
+            'hit_rate': 0.5
+        })
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import os
+import shutil
+import tempfile
+from email.parser import BytesParser
+from email.policy import HTTP
+from food_app.multipart import MultipartBody
+
+class TestMultipartBody(unittest.TestCase):
+    def setUp(self):
+        """Write a test file larger than a few read blocks."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "photo.jpg")
+        self.data = os.urandom(200 * 1024)
+        with open(self.path, "wb") as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        """Remove the test file."""
+        shutil.rmtree(self.tmp_dir)
+
+    def parse(self, body: MultipartBody, block_size: int) -> dict:
+        """Read a body in blocks and split it into its form parts."""
+        blocks = []
+        while True:
+            block = body.read(block_size)
+            if not block:
+                break
+            self.assertLessEqual(len(block), block_size)
+            blocks.append(block)
+        raw = b''.join(blocks)
+        self.assertEqual(len(raw), len(body))
+        
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {body.content_type}\r\n\r\n".encode() + raw
+        )
+        return {
+            part.get_param("name", header="content-disposition"): part
+            for part in message.iter_parts()
+        }
+
+    def test_streams_file_in_blocks(self):
+        """Test that the body is a valid form with the file's bytes."""
+        with MultipartBody({"key": "secret", "name": "photo"}, "image", self.path) as body:
+            parts = self.parse(body, 8192)
+        
+        self.assertEqual(parts["key"].get_content(), "secret")
+        self.assertEqual(parts["name"].get_content(), "photo")
+        self.assertEqual(parts["image"].get_filename(), "photo.jpg")
+        self.assertEqual(parts["image"].get_payload(decode=True), self.data)
+
+    def test_sends_given_bytes_instead_of_file(self):
+        """Test sending a re-encoded image under the original file name."""
+        body = MultipartBody({}, "image", self.path, b"smaller", "image/jpeg")
+        parts = self.parse(body, 3)
+        body.close()
+        
+        self.assertEqual(parts["image"].get_content_type(), "image/jpeg")
+        self.assertEqual(parts["image"].get_payload(decode=True), b"smaller")
+
+    def test_seek_rewinds_for_retries(self):
+        """Test that a partly sent body can be read again from any offset."""
+        with MultipartBody({"key": "secret"}, "image", self.path) as body:
+            whole = body.read()
+            self.assertEqual(body.tell(), len(body))
+            
+            body.seek(0)
+            self.assertEqual(body.read(100), whole[:100])
+            body.seek(len(whole) - 5000)
+            self.assertEqual(body.read(), whole[-5000:])
+            body.seek(0)
+            self.assertEqual(body.read(), whole)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from food_app.page_meta import find_meta_content, read_head
+
+class FakeStreamedResponse:
+    encoding = 'utf-8'
+
+    def __init__(self, page: bytes):
+        self.page = page
+        self.bytes_read = 0
+
+    def iter_content(self, chunk_size: int):
+        for start in range(0, len(self.page), chunk_size):
+            chunk = self.page[start:start + chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+SHARE_PAGE = (
+    b'<!DOCTYPE html><html><head><meta charset="utf-8">'
+    b'<meta name="description" content="Image hosted">'
+    b"<meta content='https://i.ibb.co/abc/fridge.jpg?a=1&amp;b=2' property=og:image >"
+    b'<title>fridge</title></HEAD>\n<body>' + b'<p>comments</p>' * 10000 + b'</body></html>'
+)
+
+class TestPageMeta(unittest.TestCase):
+    def test_finds_og_image_in_any_attribute_order(self):
+        """Test extracting og:image whatever the quoting and attribute order."""
+        page = SHARE_PAGE.decode()
+        self.assertEqual(find_meta_content(page, "og:image"), "https://i.ibb.co/abc/fridge.jpg?a=1&b=2")
+        self.assertEqual(find_meta_content(page, "description"), "Image hosted")
+        self.assertIsNone(find_meta_content(page, "og:title"))
+        self.assertIsNone(find_meta_content('<META PROPERTY="og:image">', "og:image"))
+
+    def test_read_stops_after_head(self):
+        """Test that the page body is not downloaded."""
+        response = FakeStreamedResponse(SHARE_PAGE)
+        head = read_head(response, chunk_size=64)
+        
+        self.assertIn("og:image", head)
+        self.assertLess(response.bytes_read, 400)
+        self.assertEqual(find_meta_content(head, "og:image"), "https://i.ibb.co/abc/fridge.jpg?a=1&b=2")
+        
+        # Pages without a </head> are cut off at max_bytes
+        response = FakeStreamedResponse(b'<p>x</p>' * 10000)
+        self.assertEqual(len(read_head(response, max_bytes=1000, chunk_size=100)), 1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from database import FoodDatabase
+import os
+import re
+
+# Tables that grow with use and must never be scanned without an index
+LARGE_TABLES = {
+    'inventory', 'saved_recipes', 'recipe_ingredients',
+    'shopping_lists', 'shopping_list_items'
+}
+
+class TestQueryPlans(unittest.TestCase):
+    def setUp(self):
+        """Set up test database and record every statement it runs."""
+        self.test_db = "test_query_plans.db"
+        self.db = FoodDatabase(self.test_db)
+        self.statements = []
+        self.db.get_connection().set_trace_callback(self.statements.append)
+        
+    def tearDown(self):
+        """Clean up test database."""
+        self.db.close()
+        for path in (self.test_db, self.test_db + "-wal", self.test_db + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def exercise_database(self):
+        """Call every query-issuing FoodDatabase method at least once."""
+        db = self.db
+        db.add_inventory_items([
+            {"name": "Milk", "type": "fresh_dairy", "brand": "Arla", "quantity": "1 l"},
+            {"name": "Basil", "type": "fresh_herbs", "quantity": "1 bunch"}
+        ])
+        db.import_inventory_items([
+            {"name": "Flour", "type": "baking", "quantity": "1 kg"},
+            {"name": "Eggs", "type": "fresh_dairy", "quantity": "6"}
+        ])
+        inventory = db.get_inventory()
+        db.get_inventory_item(inventory[0]['id'])
+        db.get_inventory_items([item['id'] for item in inventory])
+        db.search_inventory("milk")
+        db.search_inventory("bas fresh", limit=5)
+        db.update_inventory_item(inventory[0]['id'], {"quantity": "2 l"})
+        db.update_inventory_categories({inventory[1]['id']: "fresh_herbs"})
+        db.add_category_counts({("basil", "fresh_herbs"): 2})
+        db.get_category_learning()
+        
+        recipe_id = db.save_recipe({
+            "name": "Pesto",
+            "difficulty": "Easy",
+            "have_ingredients": ["basil"],
+            "need_ingredients": ["pine nuts"],
+            "instructions": ["Blend"],
+            "chef_tips": ["Fresh basil!"]
+        })
+        db.get_saved_recipes()
+        db.get_saved_recipes(summary_only=True)
+        db.get_saved_recipe(recipe_id)
+        
+        list_id = db.create_shopping_list("Weekly", [recipe_id])
+        db.add_shopping_list_item(list_id, {"name": "bread"})
+        db.get_shopping_lists()
+        items = db.get_shopping_list(list_id)['items']
+        db.toggle_shopping_list_item(items[0]['id'])
+        db.update_shopping_list_item(items[0]['id'], {"quantity": "2"})
+        db.update_shopping_list_status(list_id, 'completed')
+        db.delete_shopping_list_item(items[1]['id'])
+        db.delete_shopping_list(list_id)
+        db.delete_inventory_item(inventory[0]['id'])
+    
+    def query_plan(self, sql: str):
+        """Get the EXPLAIN QUERY PLAN details for a statement."""
+        conn = self.db.get_connection()
+        conn.set_trace_callback(None)
+        return [row['detail'] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
+    
+    def test_no_full_scans_of_large_tables(self):
+        """Test that no shipped query scans or sorts a large table."""
+        self.exercise_database()
+        
+        queries = {
+            ' '.join(sql.split()) for sql in self.statements
+            if re.match(r'\s*(SELECT|UPDATE|DELETE|INSERT\b[^;]*\bSELECT)\b', sql, re.IGNORECASE)
+        }
+        self.assertTrue(queries)
+        
+        for sql in sorted(queries):
+            # Listing a whole table in index order is fine, filtering by
+            # walking the whole table is not
+            filtered = re.search(r'\bWHERE\b', sql, re.IGNORECASE)
+            for detail in self.query_plan(sql):
+                with self.subTest(sql=sql, detail=detail):
+                    match = re.match(r'SCAN (\w+)( USING (COVERING )?INDEX \w+)?$', detail)
+                    if match and match.group(1) in LARGE_TABLES:
+                        self.assertTrue(match.group(2), f"Full table scan: {detail}")
+                        self.assertFalse(filtered, f"Filtering by scan: {detail}")
+                    self.assertNotIn('USE TEMP B-TREE', detail)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ from openai import OpenAI
 from dotenv import load_dotenv
 from typing import Union, List, Dict, Optional, Tuple
 from urllib.parse import urlparse
+from food_app.page_meta import find_meta_content, read_head
 
 # Load environment variables from .env file
 load_dotenv()
@@ -68,17 +69,15 @@ class GrokAPI:
         # Handle ImgBB sharing URLs
         if "ibb.co" in url:
             try:
-                # Get the page content
-                response = requests.get(url)
-                response.raise_for_status()
+                # Get the page up to the end of its <head>
+                with requests.get(url, stream=True, timeout=(5, 30)) as response:
+                    response.raise_for_status()
+                    
+                    # Look for the direct image URL in meta tags
+                    image_url = find_meta_content(read_head(response), 'og:image')
                 
-                # Look for the direct image URL in meta tags
-                from bs4 import BeautifulSoup # type: ignore
-                soup = BeautifulSoup(response.text, 'html.parser')
-                meta_tag = soup.find('meta', property='og:image')
-                
-                if meta_tag and meta_tag.get('content'):
-                    return meta_tag['content']
+                if image_url:
+                    return image_url
             except Exception as e:
                 print(f"Warning: Could not convert ImgBB URL: {str(e)}")
         
@@ -1,6 +1,7 @@
 from food_app.database import FoodDatabase
 from food_app.inventory_manager import InventoryManager
 from food_app.categories import FoodCategories
+from food_app.category_store import CategoryLearningStore
 
 def print_menu():
     """Print the main menu."""
@@ -12,6 +13,7 @@ def print_menu():
     print("4. Delete item")
     print("5. Check category suggestions")
     print("6. View categories")
+    print("7. Auto-apply category suggestions")
     print("0. Exit")
 
 def get_item_id() -> int:
@@ -182,6 +184,9 @@ def view_and_edit_inventory(db: FoodDatabase, manager: InventoryManager):
 def main():
     """Main function for inventory management."""
     db = FoodDatabase()
+    learning_store = CategoryLearningStore(db)
+    FoodCategories.attach_learning_store(learning_store)
+    FoodCategories.train_model((item['name'], item['type']) for item in db.get_inventory())
     manager = InventoryManager(db)
     
     while True:
@@ -213,8 +218,22 @@ def main():
             # View categories
             view_categories()
         
+        elif choice == "7":
+            # Apply confident category suggestions without prompting
+            threshold = input("Minimum confidence (0-1, Enter for 0.8): ").strip()
+            try:
+                min_confidence = float(threshold) if threshold else 0.8
+            except ValueError:
+                print("Please enter a number between 0 and 1.")
+                continue
+            updated = manager.recategorize_inventory(min_confidence)
+            print(f"\nUpdated categories for {updated} items.")
+        
         elif choice == "0":
             print("\nGoodbye!")
+            FoodCategories.attach_learning_store(None)
+            learning_store.close()
+            db.close()
             break
         
         else:
@@ -4,6 +4,7 @@ from food_app.recipe_assistant import RecipeAssistant
 from food_app.grok_api import GrokAPI
 from food_app.inventory_chat import InventoryChat
 from food_app.categories import FoodCategories
+from food_app.category_store import CategoryLearningStore
 from typing import List, Dict
 
 def print_menu():
@@ -26,6 +27,7 @@ def handle_recipe_suggestion(grok: GrokAPI, assistant: RecipeAssistant, db: Food
     print("\nRight then, let's see what we've got...")
     print("Give me a moment to work my magic...")
     
+    first_suggestion = True
     while True:
         # Generate the prompt
         prompt = assistant.generate_recipe_prompt(inventory)
@@ -39,15 +41,13 @@ def handle_recipe_suggestion(grok: GrokAPI, assistant: RecipeAssistant, db: Food
                 }
             ]
             
-            response = grok.client.chat.completions.create(
-                model="grok-beta",
-                messages=messages,
-                temperature=0.7,
-                stream=False
+            # The same inventory gets the same first suggestion; asking for
+            # another one always goes to the model
+            response_text = grok.complete(
+                messages, temperature=0.7, cache=first_suggestion,
+                validate=lambda text: "error" not in assistant.suggest_recipes(text)
             )
-            
-            # Parse the response
-            response_text = response.choices[0].message.content
+            first_suggestion = False
             recipes_data = assistant.suggest_recipes(response_text)
             
             if "error" in recipes_data:
@@ -104,7 +104,7 @@ def handle_recipe_suggestion(grok: GrokAPI, assistant: RecipeAssistant, db: Food
 def handle_saved_recipes(db: FoodDatabase):
     """Handle viewing saved recipes and creating shopping lists."""
     while True:
-        recipes = db.get_saved_recipes()
+        recipes = db.get_saved_recipes(summary_only=True)
         if not recipes:
             print("\nNo saved recipes yet! Let's find some recipes first, yeah?")
             return
@@ -132,7 +132,10 @@ def handle_saved_recipes(db: FoodDatabase):
             try:
                 recipe_idx = int(recipe_num) - 1
                 if 0 <= recipe_idx < len(recipes):
-                    recipe = recipes[recipe_idx]
+                    recipe = db.get_saved_recipe(recipes[recipe_idx]['id'])
+                    if not recipe:
+                        print("\nThat recipe has gone missing!")
+                        continue
                     print(f"\n{recipe['name'].upper()}")
                     print("=" * 50)
                     print(f"Difficulty: {recipe['difficulty']}")
@@ -244,14 +247,18 @@ def handle_shopping_list(db: FoodDatabase, list_id: int):
         print(f"\nShopping List: {shopping_list['name']}")
         print("=" * 50)
         
+        recipe_names = {
+            recipe['id']: recipe['name']
+            for recipe in db.get_saved_recipes(summary_only=True)
+        }
+        
         # Group items by recipe
         items_by_recipe = {}
         for item in shopping_list['items']:
             recipe_id = item['recipe_id']
             if recipe_id not in items_by_recipe:
-                recipe = next((r for r in db.get_saved_recipes() if r['id'] == recipe_id), None)
                 items_by_recipe[recipe_id] = {
-                    'name': recipe['name'] if recipe else 'Custom Items',
+                    'name': recipe_names.get(recipe_id, 'Custom Items'),
                     'items': []
                 }
             items_by_recipe[recipe_id]['items'].append(item)
@@ -409,8 +416,8 @@ def handle_shopping_list(db: FoodDatabase, list_id: int):
                     print("\nMultiple items found:")
                     for i, item in enumerate(matching_items, 1):
                         quantity = f" - {item['quantity']}" if item['quantity'] else ""
-                        recipe = next((r for r in db.get_saved_recipes() if r['id'] == item['recipe_id']), None)
-                        recipe_name = f" (from {recipe['name']})" if recipe else ""
+                        recipe_name = recipe_names.get(item['recipe_id'])
+                        recipe_name = f" (from {recipe_name})" if recipe_name else ""
                         print(f"{i}. {item['name']}{quantity}{recipe_name}")
                     
                     try:
@@ -438,6 +445,9 @@ def handle_shopping_list(db: FoodDatabase, list_id: int):
 def main():
     """Main function for recipe suggestions."""
     db = FoodDatabase()
+    learning_store = CategoryLearningStore(db)
+    FoodCategories.attach_learning_store(learning_store)
+    FoodCategories.train_model((item['name'], item['type']) for item in db.get_inventory())
     assistant = RecipeAssistant(db)
     grok = GrokAPI()
     chat = InventoryChat(db, grok)
@@ -485,6 +495,9 @@ def main():
         
         elif choice == "0":
             print("\nTake care, and keep cooking with passion!")
+            FoodCategories.attach_learning_store(None)
+            learning_store.close()
+            db.close()
             break
         
         else: